@@ -16,15 +16,28 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.utils.screen_capture import ScreenCapture
 from src.utils.input_controller import InputController
+from src.utils.input_scheduler import InputScheduler
 from src.reflex.safety_monitor import SafetyMonitor
 from src.mapping.coordinate_reader import CoordinateReader
 from src.core.state_manager import StateManager
 from src.interface.command_center import CommandCenter
+from src.interface.control_server import ControlServer
 from src.reflex.vision_processor import VisionProcessor
 from src.reflex.behaviors import ReflexBehaviors
-from src.core.arbitrator import ActionArbitrator
+from src.reflex.hud_reader import HudReader
+from src.reflex.screen_state import ScreenStateClassifier, WORLD
+from src.core.arbitrator import ActionArbitrator, MOVEMENT, LOOK, TRIGGERS, ALL_RESOURCES
 from src.skills.combat import CombatSkills
 from src.skills.fishing import FishingSkills
+from src.skills.executor import SkillExecutor
+from src.skills.plan_runtime import PlanRuntime
+from src.utils.metrics_store import MetricsStore
+from src.utils.session_recorder import SessionRecorder
+from src.core.multi_agent import run_multi_agent
+from src.utils.perf_profile import load_profile, apply_profile
+
+# Debug window keys -> actions (the control server sends the same actions)
+KEY_ACTIONS = {ord('q'): "quit", ord('c'): "combat", ord('f'): "fishing", ord('r'): "retrack"}
 
 def resize_with_pad(image, target_width, target_height):
     """
@@ -45,22 +58,75 @@ def resize_with_pad(image, target_width, target_height):
     return canvas
 
 def main():
+    # Multi-instance mode: several windows / frame sources, one shared batched detector
+    agent_sources = os.getenv("AGENT_SOURCES")
+    if agent_sources:
+        run_multi_agent(agent_sources)
+        return
+
     print("Initializing MainkurafutoAI...")
     
     # Initialize Components
     try:
-        cap = ScreenCapture()
+        # Tuned perf knobs for this hardware class (tools/autotune.py); PERF_PROFILE=off = built-in defaults
+        profile = None
+        if os.getenv("PERF_PROFILE", "auto") != "off":
+            profile = load_profile(os.getenv("PERF_PROFILE_PATH", "perf_profiles.json"),
+                                   None if os.getenv("PERF_PROFILE", "auto") == "auto" else os.getenv("PERF_PROFILE"))
+        # Window moves/resizes are followed by a background tracker thread
+        cap = ScreenCapture(track_interval=float(os.getenv("WINDOW_TRACK_INTERVAL", "0.5")))
+        apply_profile(profile, capture=cap) # Before start(): sets the capture rate
         cap.start() # Start background thread for FPS
         controller = InputController()
+        # Fixed-rate stick output, decoupled from the vision loop (0 = direct mode)
+        input_rate = float(os.getenv("INPUT_RATE_HZ", "250"))
+        scheduler = None
+        if input_rate > 0:
+            scheduler = InputScheduler(controller, rate_hz=input_rate)
+            controller.attach_scheduler(scheduler)
+            scheduler.start()
         safety = SafetyMonitor(controller)
         coord_reader = CoordinateReader()
         state_mgr = StateManager()
-        cmd_center = CommandCenter(state_mgr, controller)
+        executor = SkillExecutor() # Timed skill actions, resumed by the main loop
+        plan_runtime = PlanRuntime() # Cancellable LLM plan steps (own asyncio thread)
+        cmd_center = CommandCenter(state_mgr, controller, plan_runtime)
         vision_proc = VisionProcessor()
+        hud_reader = HudReader()
+        screen_state = ScreenStateClassifier()
         reflex_action = ReflexBehaviors(controller)
         arbitrator = ActionArbitrator()
-        combat_skills = CombatSkills(controller)
-        fishing_skills = FishingSkills(controller)
+        arbitrator.attach_plan_runtime(plan_runtime)
+        # Session outcome/timing metrics (query with tools/metrics_report.py)
+        metrics = None
+        metrics_path = os.getenv("METRICS_PATH", "metrics.sqlite")
+        if metrics_path:
+            try:
+                metrics = MetricsStore(metrics_path)
+            except Exception as e:
+                print(f"[Metrics] Disabled: {e}")
+        # Optional session recording (frames, inputs, vision, decisions)
+        recorder = None
+        record_dir = os.getenv("RECORD_SESSION_DIR")
+        if record_dir:
+            recorder = SessionRecorder(
+                os.path.join(record_dir, time.strftime("%Y%m%d-%H%M%S")),
+                width=int(os.getenv("RECORD_WIDTH", "320")),
+                max_fps=float(os.getenv("RECORD_FPS", "30")),
+                jpeg_quality=int(os.getenv("RECORD_JPEG_QUALITY", "0")) or None,
+            )
+            controller.add_report_listener(recorder.record_input)
+        combat_skills = CombatSkills(controller, metrics)
+        fishing_skills = FishingSkills(controller, executor, metrics)
+        apply_profile(profile, vision=vision_proc, coords=coord_reader, fishing=fishing_skills)
+        # Local control/telemetry server (replaces console + key toggles for headless instances)
+        control = None
+        control_port = int(os.getenv("CONTROL_PORT", "8765"))
+        if control_port > 0:
+            try:
+                control = ControlServer(port=control_port, token=os.getenv("CONTROL_TOKEN"))
+            except OSError as e:
+                print(f"[Control] Server disabled: {e}")
     except Exception as e:
         print(f"Initialization Failed: {e}")
         return
@@ -69,14 +135,15 @@ def main():
     safety_thread = threading.Thread(target=safety.start_monitoring, daemon=True)
     safety_thread.start()
 
-    # Start Command Center Input
-    cmd_center.start_input_thread()
+    # Start Command Center Input (console; optional when the control server is used)
+    if os.getenv("CONSOLE_INPUT", "1") == "1":
+        cmd_center.start_input_thread()
 
     print("AI Agent Initialized.")
     print("Press 'F12' to PAUSE bot.")
     print("Press 'C' to Toggle COMBAT MODE.")
     print("Press 'F' to Toggle FISHING MODE.")
-    print("Press 'R' to Re-track Minecraft Window.")
+    print("Press 'R' to force a Minecraft window re-search (moves/resizes are tracked automatically).")
     print("Press 'END' to QUIT bot.")
     print("Focus Minecraft window to see results (though this loop essentially just watches for now).")
     
@@ -86,15 +153,58 @@ def main():
     cv2.resizeWindow("Bot View", 1280, 720) # Default convenient size
 
     last_time = time.time()
-    was_retreating = False
     combat_mode = False
     fishing_mode = False
+
+    def handle_input(key: int) -> bool:
+        """
+        Debug-window key + queued control-server commands. Runs every frame, also while a
+        menu/chat/death screen is up, so toggles and 'quit' never pile up. False = quit.
+        """
+        nonlocal combat_mode, fishing_mode
+        actions = [KEY_ACTIONS[key]] if key in KEY_ACTIONS else []
+        if control:
+            for msg in control.poll_commands():
+                if "goal" in msg:
+                    cmd_center.process_command(f"goal: {msg['goal']}")
+                elif "cmd" in msg:
+                    cmd_center.process_command(msg["cmd"])
+                else:
+                    actions.append(msg["action"]) # Same as the key toggles
+
+        if "quit" in actions:
+            return False
+        for action in actions:
+            if action == "combat":
+                combat_mode = not combat_mode
+                if fishing_mode: # Mutual exclusive
+                    fishing_mode = False
+                    fishing_skills.stop_fishing()
+                    arbitrator.release("FISHING")
+                print(f"Combat Mode: {combat_mode}")
+                if not combat_mode:
+                    arbitrator.release("COMBAT")
+            elif action == "fishing":
+                fishing_mode = not fishing_mode
+                combat_mode = False # Mutual exclusive
+                arbitrator.release("COMBAT")
+                if fishing_mode:
+                    fishing_skills.start_fishing()
+                else:
+                    fishing_skills.stop_fishing()
+                    arbitrator.release("FISHING")
+                print(f"Fishing Mode: {fishing_mode}")
+            elif action == "retrack":
+                print("Re-tracking window...")
+                cap.request_retrack() # Full re-search on the tracker thread
+        return True
     
     try:
         while safety.active:
             # 1. Perception
             t0 = time.time()
             frame = cap.capture_frame()
+            frame_time = cap.last_frame_time
             t1 = time.time()
             
             t1 = time.time()
@@ -109,6 +219,9 @@ def main():
                 time.sleep(0.1)
                 continue
 
+            if recorder:
+                recorder.record_frame(frame, frame_time) # Before the debug overlay is drawn on it
+
             # 2. Safety Check
             if not safety.is_safe_to_operate():
                 cv2.putText(frame, "PAUSED - F12 to Resume", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
@@ -118,6 +231,33 @@ def main():
                 time.sleep(0.1)
                 continue
 
+            # HUD bars (cheap, every frame; published before the screen gate so death reads as 0 HP)
+            hud = hud_reader.read(frame)
+            if hud:
+                state_mgr.update_health(hud["health"])
+                state_mgr.update_hunger(hud["hunger"])
+
+            # Menus, chat, death and loading screens: no inference, no inputs into the UI
+            screen = screen_state.update(frame, hud_alive=bool(hud and hud["health"] > 0))
+            if screen_state.changed:
+                print(f"[Screen] {screen}")
+                if metrics:
+                    metrics.event("screen_state", state=screen)
+                if control:
+                    control.publish("screen", {"state": screen})
+                if screen != WORLD:
+                    controller.emergency_stop()
+                    arbitrator.suspend_plan() # Resumed by the arbitrator once back in the world
+            if not screen_state.in_world:
+                cv2.putText(frame, f"{screen} - bot idle", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+                cv2.imshow("Bot View", frame)
+                if not handle_input(cv2.waitKey(1) & 0xFF):
+                    break
+                continue
+
+            # Resume timed skills that are due (never blocks)
+            executor.tick()
+
             # 3. Perception & Mapping
             t2 = time.time()
             coords = coord_reader.process_frame(frame)
@@ -129,25 +269,36 @@ def main():
             t4 = time.time()
             vision_result = vision_proc.process_frame(frame)
             t5 = time.time()
+            if recorder:
+                recorder.record_vision(vision_result)
             
             lava_danger = vision_result.get("lava_detected", False)
             danger_level = vision_result.get("danger_level", 0.0)
+            state_mgr.update_hazards(("lava",) if lava_danger else ())
 
-            # Determine Reflex Proposal
-            reflex_proposal = "RETREAT" if lava_danger else None
-            
-            # Arbitrate (Planning is None for now)
-            action = arbitrator.determine_action(reflex_proposal, None, None)
+            # --- ARBITRATION ---
+            # Layers submit leases on the resources they need; non-conflicting ones run together
+            if lava_danger:
+                arbitrator.submit("REFLEX", "RETREAT", {MOVEMENT}, ttl=0.3)
+            if combat_mode:
+                arbitrator.submit("COMBAT", "ATTACK", {LOOK, TRIGGERS})
+            if fishing_mode:
+                arbitrator.submit("FISHING", "FISH", ALL_RESOURCES) # Stand still while fishing
+            decision = arbitrator.tick()
+            if recorder:
+                recorder.record_decision(decision, arbitrator.active_layer)
+
+            if metrics:
+                metrics.timing("capture", (t1 - t0) * 1000)
+                metrics.timing("coords", (t3 - t2) * 1000)
+                metrics.timing("vision", (t5 - t4) * 1000)
+                if "REFLEX" in decision.started:
+                    metrics.event("retreat", danger_level)
 
-            if action == "RETREAT":
-                reflex_action.retreat_from_danger()
-                was_retreating = True
+            if "REFLEX" in decision.granted:
                 status_color = (0, 0, 255) # Red
                 status_text = f"DANGER: LAVA ({danger_level:.1%})"
             else:
-                if was_retreating:
-                    reflex_action.stop_retreat() # Only stop if we were retreating
-                    was_retreating = False
                 status_color = (0, 255, 0) # Green
                 status_text = "ACTIVE - SAFE"
             
@@ -155,8 +306,11 @@ def main():
             # cap_ms = (t1 - t0) * 1000
             # coord_ms = (t3 - t2) * 1000
             # vis_ms = (t5 - t4) * 1000
-            fps = 1.0 / (time.time() - last_time)
+            loop_dt = time.time() - last_time
+            fps = 1.0 / loop_dt
             last_time = time.time()
+            if metrics:
+                metrics.timing("loop", loop_dt * 1000)
             
             # if fps < 30:
             #     print(f"[Lag] FPS:{fps:.1f} | Cap:{cap_ms:.1f}ms Coord:{coord_ms:.1f}ms Vis:{vis_ms:.1f}ms | Frame:{frame.shape}")
@@ -169,6 +323,10 @@ def main():
             cap_fps = getattr(cap, 'capture_rate', 0.0)
             cv2.putText(frame, f"Cap: {cap_fps:.1f}", (200, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 2)
 
+            # HUD Bars
+            if hud:
+                cv2.putText(frame, f"HP: {hud['health']:.0f} Food: {hud['hunger']:.0f}", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+
             # 2. Draw YOLO Detections (ALL)
             detects = vision_result.get("detections", [])
             for det in detects:
@@ -194,16 +352,43 @@ def main():
             dev_color = (0, 255, 0) if "cpu" not in device_name.lower() else (0, 0, 255)
             cv2.putText(frame, f"Device: {device_name}", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.7, dev_color, 2)
 
-            # --- COMBAT LAYER ---
-            if combat_mode and not was_retreating and not fishing_mode:
-                h, w, _ = frame.shape
-                combat_skills.update(detects, (w, h))
-                cv2.putText(frame, "COMBAT MODE: ON", (50, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-            
-            # --- FISHING LAYER ---
-            if fishing_mode and not was_retreating:
-                fishing_skills.update(frame)
-                cv2.putText(frame, f"FISHING: {fishing_skills.state}", (50, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            # --- CONTROL (one controller report per frame) ---
+            with controller.transaction():
+                # Reflex
+                if "REFLEX" in decision.granted:
+                    reflex_action.retreat_from_danger()
+                elif "REFLEX" in decision.revoked:
+                    reflex_action.stop_retreat() # Only stop if we were retreating
+
+                # Combat
+                if "COMBAT" in decision.granted:
+                    h, w, _ = frame.shape
+                    had_target = combat_skills.has_target
+                    combat_skills.update(detects, (w, h), frame_time)
+                    if had_target and not combat_skills.has_target:
+                        cmd_center.note_event("combat_cleared")
+                    cv2.putText(frame, "COMBAT MODE: ON", (50, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                elif "COMBAT" in decision.revoked:
+                    controller.set_look(0, 0)
+                    controller.set_attack(False)
+
+                # Fishing
+                if "FISHING" in decision.granted:
+                    fishing_timeouts = fishing_skills.timeouts
+                    fishing_skills.update(frame)
+                    if fishing_skills.timeouts != fishing_timeouts:
+                        cmd_center.note_event("fishing_timeout")
+                    cv2.putText(frame, f"FISHING: {fishing_skills.state}", (50, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                elif "FISHING" in decision.revoked:
+                    fishing_skills.suspend() # Re-casts on the next grant
+
+            # Active task (part of the plan cache fingerprint and of planner prompts)
+            state_mgr.update_task("COMBAT" if combat_mode else "FISHING" if fishing_mode else "IDLE")
+
+            # Speculative planning while no layer holds the controller
+            if hud and hud["health"] <= 6:
+                cmd_center.note_event("low_health")
+            cmd_center.update(idle=arbitrator.active_layer == "IDLE")
 
             # Show resizable window (user controlled)
             # Handle Aspect Ratio
@@ -218,27 +403,26 @@ def main():
             except Exception:
                 cv2.imshow("Bot View", frame) # Fallback
 
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
+            # Telemetry (built only while someone is subscribed)
+            if control and control.has_subscribers:
+                control.publish("frame", {
+                    "fps": round(fps, 1),
+                    "stages_ms": {
+                        "capture": round((t1 - t0) * 1000, 2),
+                        "coords": round((t3 - t2) * 1000, 2),
+                        "vision": round((t5 - t4) * 1000, 2),
+                    },
+                    "layer": arbitrator.active_layer,
+                    "screen": screen,
+                    "modes": {"combat": combat_mode, "fishing": fishing_mode},
+                    "fishing": fishing_skills.state,
+                    "plan_step": plan_runtime.current_step,
+                    "state": state_mgr.get_state().__dict__,
+                    "detections": [[d["label"], round(d["conf"], 2), *d["box"]] for d in detects],
+                })
+
+            if not handle_input(cv2.waitKey(1) & 0xFF):
                 break
-            elif key == ord('c'):
-                combat_mode = not combat_mode
-                fishing_mode = False # Mutual exclusive
-                print(f"Combat Mode: {combat_mode}")
-                if not combat_mode:
-                    controller.set_look(0, 0)
-                    controller.set_attack(False)
-            elif key == ord('f'):
-                fishing_mode = not fishing_mode
-                combat_mode = False # Mutual exclusive
-                if fishing_mode:
-                    fishing_skills.start_fishing()
-                else:
-                    fishing_skills.stop_fishing()
-                print(f"Fishing Mode: {fishing_mode}")
-            elif key == ord('r'):
-                print("Re-tracking window...")
-                cap.find_target_window()
                 
             # Resize Check (Optional)
             # if cv2.getWindowProperty("Bot View", cv2.WND_PROP_VISIBLE) < 1: break 
@@ -246,6 +430,18 @@ def main():
     except KeyboardInterrupt:
         print("Stopping...")
     finally:
+        if control:
+            control.close()
+        cmd_center.close()
+        plan_runtime.close()
+        combat_skills.aim.save_log()
+        if metrics:
+            metrics.close()
+        if scheduler:
+            scheduler.stop()
+        controller.close()
+        if recorder:
+            recorder.close()
         cap.close()
         cv2.destroyAllWindows()
         print("MainkurafutoAI Shutdown.")
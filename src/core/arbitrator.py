@@ -1,35 +1,169 @@
-from typing import Optional, Dict
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, FrozenSet, Iterable, Set, Callable
+
+# Controller resources a layer can claim
+MOVEMENT = "movement"   # Left stick, jump
+LOOK = "look"           # Right stick
+TRIGGERS = "triggers"   # Attack / use
+ALL_RESOURCES = frozenset({MOVEMENT, LOOK, TRIGGERS})
+
+@dataclass
+class ActionLease:
+    """A time-bounded claim on controller resources by one layer."""
+    layer: str
+    action: str
+    priority: int
+    resources: FrozenSet[str]
+    expires_at: float
+    changed_at: float = 0.0  # Last time `action` changed (for rate limiting)
+
+@dataclass
+class ArbitrationResult:
+    granted: Set[str] = field(default_factory=set)   # Layers allowed to drive their resources this tick
+    started: Set[str] = field(default_factory=set)   # Newly granted this tick
+    revoked: Set[str] = field(default_factory=set)   # Lost their grant this tick (preempted or expired)
+
+    def action(self, arbitrator: "ActionArbitrator", layer: str) -> Optional[str]:
+        lease = arbitrator.leases.get(layer)
+        return lease.action if lease and layer in self.granted else None
 
 class ActionArbitrator:
-    def __init__(self):
+    """
+    Preemptive priority scheduler for controller resources.
+
+    Each layer holds at most one lease (action, priority, resources, expiry). Every tick the
+    highest-priority leases get their resources; a lease runs only if it gets *all* of them.
+    Non-conflicting leases run together (e.g. COMBAT looks/attacks while REFLEX retreats).
+    A preempted lease stays in its slot and is restored automatically once the higher one ends.
+    Cost per tick is bounded by the (small, fixed) number of layers and resources.
+    """
+    # Default priorities per layer
+    PRIORITY = {
+        "REFLEX": 100,
+        "USER": 50,
+        "COMBAT": 30,
+        "FISHING": 20,
+        "PLAN": 10,
+    }
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
         self.current_priority = 0 # 0: Idle, 10: Plan, 50: User, 100: Reflex
         self.active_layer = "IDLE"
+        self.leases: Dict[str, ActionLease] = {}
+        self.holders: Dict[str, str] = {} # resource -> layer
+        self.granted: Set[str] = set()
+        # Min seconds between action *changes* per layer (stops a layer flapping the controller)
+        self.rate_limits: Dict[str, float] = {"PLAN": 0.5, "FISHING": 0.25}
+        self.rejected = 0
+        self.plan_runtime = None
+        # Pause state we asked the runtime for (its own flag changes later, on its loop thread)
+        self._plan_suspended = False
+
+    def attach_plan_runtime(self, runtime):
+        """
+        Let higher-priority layers pause/resume the running plan (PlanRuntime).
+        While the runtime is busy it holds an implicit PLAN lease on the current step's resources,
+        so e.g. a MOVE_FORWARD step keeps walking while COMBAT aims and attacks.
+        """
+        self.plan_runtime = runtime
+
+    def suspend_plan(self):
+        """Pause the plan from outside arbitration (menus, death); tick() resumes it once PLAN is granted."""
+        if self.plan_runtime is not None and not self._plan_suspended:
+            self._plan_suspended = True
+            self.plan_runtime.pause()
+
+    def set_rate_limit(self, layer: str, min_interval: float):
+        self.rate_limits[layer] = min_interval
+
+    def submit(self, layer: str, action: str, resources: Iterable[str], ttl: float = 0.25,
+               priority: Optional[int] = None) -> bool:
+        """
+        Propose (or refresh) a lease. Cheap: call it every frame while the layer wants control.
+        Returns False if the action change was rate-limited (the previous action keeps its lease).
+        """
+        now = self.clock()
+        lease = self.leases.get(layer)
+        if lease is not None and lease.expires_at >= now:
+            if lease.action != action:
+                if now - lease.changed_at < self.rate_limits.get(layer, 0.0):
+                    lease.expires_at = now + ttl
+                    self.rejected += 1
+                    return False
+                lease.action = action
+                lease.changed_at = now
+            lease.expires_at = now + ttl
+            lease.resources = frozenset(resources)
+            return True
+
+        self.leases[layer] = ActionLease(
+            layer=layer, action=action,
+            priority=priority if priority is not None else self.PRIORITY.get(layer, 0),
+            resources=frozenset(resources), expires_at=now + ttl, changed_at=now,
+        )
+        return True
+
+    def release(self, layer: str):
+        """Drop a lease immediately (takes effect on the next tick)."""
+        self.leases.pop(layer, None)
+
+    def tick(self) -> ArbitrationResult:
+        """Resolve leases into grants for this frame."""
+        now = self.clock()
+
+        # Running plan = implicit lowest-priority lease on what its current step drives
+        if self.plan_runtime is not None and self.plan_runtime.busy:
+            self.submit("PLAN", "PLAN", self.plan_runtime.resources, ttl=1.0)
+        elif "PLAN" in self.leases and self.plan_runtime is not None:
+            self.release("PLAN")
+
+        for layer in [l for l, lease in self.leases.items() if lease.expires_at < now]:
+            del self.leases[layer]
+
+        granted = set()
+        holders = {}
+        for lease in sorted(self.leases.values(), key=lambda l: -l.priority):
+            if all(r not in holders for r in lease.resources):
+                for r in lease.resources:
+                    holders[r] = lease.layer
+                granted.add(lease.layer)
+
+        result = ArbitrationResult(
+            granted=granted,
+            started=granted - self.granted,
+            revoked=self.granted - granted,
+        )
+        self.granted = granted
+        self.holders = holders
+
+        top = max((self.leases[l] for l in granted), key=lambda l: l.priority, default=None)
+        self.current_priority = top.priority if top else 0
+        self.active_layer = top.layer if top else "IDLE"
+
+        # Plan loses (part of) the body -> pause; gets it back -> resume where it left off
+        if self.plan_runtime is not None and "PLAN" in self.leases:
+            suspend = "PLAN" not in granted
+            if suspend != self._plan_suspended:
+                self._plan_suspended = suspend
+                if suspend:
+                    self.plan_runtime.pause(taken=holders) # Don't release what the new holder drives
+                else:
+                    self.plan_runtime.resume()
+        return result
 
     def determine_action(self, reflex_proposal: Optional[str], plan_proposal: Optional[str], user_input: Optional[str]) -> str:
         """
-        Decide which action to execute based on priority.
-        Returns the action string.
+        Single-action compatibility wrapper over the lease scheduler.
+        Returns the action string of the highest-priority granted layer.
         """
-        # 1. Reflex has highest priority (Safety)
-        if reflex_proposal:
-            self.current_priority = 100
-            self.active_layer = "REFLEX"
-            return reflex_proposal
-
-        # 2. User Input (Manual override or Command)
-        # Assuming manual input is handled by hardware directly usually, 
-        # but if we had a software override system:
-        if user_input:
-             self.current_priority = 50
-             self.active_layer = "USER"
-             return user_input
-
-        # 3. Planning (AI Goal)
-        if plan_proposal:
-            self.current_priority = 10
-            self.active_layer = "PLAN"
-            return plan_proposal
-
-        self.current_priority = 0
-        self.active_layer = "IDLE"
-        return "IDLE"
+        for layer, proposal in (("REFLEX", reflex_proposal), ("USER", user_input), ("PLAN", plan_proposal)):
+            if proposal:
+                self.submit(layer, proposal, ALL_RESOURCES, ttl=1.0)
+            elif layer != "PLAN" or self.plan_runtime is None:
+                self.release(layer)
+        self.tick()
+        if self.active_layer == "IDLE":
+            return "IDLE"
+        return self.leases[self.active_layer].action
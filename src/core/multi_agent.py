@@ -0,0 +1,404 @@
+import os
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from src.core.state_manager import AgentState
+from src.core.arbitrator import ActionArbitrator, MOVEMENT, LOOK, TRIGGERS, ALL_RESOURCES
+from src.mapping.coordinate_reader import CoordinateReader
+from src.reflex.behaviors import ReflexBehaviors
+from src.reflex.hud_reader import HudReader
+from src.reflex.safety_monitor import SafetyMonitor
+from src.reflex.screen_state import ScreenStateClassifier, WORLD
+from src.reflex.vision_processor import VisionProcessor
+from src.reflex.yolo_detector import YoloDetector
+from src.skills.combat import CombatSkills
+from src.skills.executor import SkillExecutor
+from src.skills.fishing import FishingSkills
+from src.utils.frame_sources import open_source
+from src.utils.gamepad_backends import create_backend, default_record_path
+from src.utils.input_controller import InputController
+from src.utils.input_scheduler import InputScheduler
+from src.utils.metrics_store import MetricsStore
+from src.utils.perf_profile import load_profile, apply_profile
+from src.interface.control_server import ControlServer
+
+MODES = ("combat", "fishing")
+
+class Agent:
+    """
+    One game instance in multi-instance mode: its own frame source (window crop, replay, ...),
+    controller, perception state, arbitration and skills. Detection happens outside, so the
+    runtime can batch it across agents:
+
+        if agent.perceive() is not None:   # capture, HUD, screen gate, lava, detection cache
+            ... detector pass ...
+        agent.act(detections or None)      # finish vision, arbitrate, one controller report
+
+    Runs the reflex, combat and fishing layers of main.py. LLM planning stays single-instance.
+    """
+    def __init__(self, index: int, source, detector: YoloDetector, mode: Optional[str] = None,
+                 metrics: Optional[MetricsStore] = None, input_rate: float = 250.0,
+                 profile: Optional[Dict[str, Any]] = None):
+        self.index = index
+        self.name = f"agent{index}"
+        self.source = source
+        self.metrics = metrics
+
+        # Own virtual gamepad (recordings and aim logs get a per-agent file)
+        self.controller = InputController(create_backend(record_path=self._own_path(default_record_path(), ".mkgp")))
+        self.scheduler = None
+        if input_rate > 0:
+            self.scheduler = InputScheduler(self.controller, rate_hz=input_rate)
+            self.controller.attach_scheduler(self.scheduler)
+            self.scheduler.start()
+
+        self.executor = SkillExecutor()
+        self.vision = VisionProcessor(detector)
+        self.hud = HudReader()
+        self.screen = ScreenStateClassifier()
+        self.coords = CoordinateReader()
+        self.state = AgentState() # Not StateManager: that one is a process-wide singleton
+        self.arbitrator = ActionArbitrator()
+        self.reflex = ReflexBehaviors(self.controller)
+        aim_log = os.getenv("AIM_LOG_PATH")
+        self.combat = CombatSkills(self.controller, metrics, aim_log_path=self._own_path(aim_log, ".npz") if aim_log else None)
+        self.fishing = FishingSkills(self.controller, self.executor, metrics)
+
+        self.mode: Optional[str] = None
+        self.frame: Optional[np.ndarray] = None
+        self.frame_time = 0.0
+        self.needs_detection = False
+        self.vision_result: Dict[str, Any] = {}
+        self.decision = None
+
+        apply_profile(profile, capture=source, vision=self.vision, coords=self.coords, fishing=self.fishing)
+        self.source.start()
+        self.set_mode(mode)
+
+    def _own_path(self, path: str, default_ext: str) -> str:
+        """recordings/input.mkgp -> recordings/input_agent0.mkgp"""
+        root, ext = os.path.splitext(path)
+        return f"{root}_{self.name}{ext or default_ext}"
+
+    def set_mode(self, mode: Optional[str]):
+        """'combat', 'fishing' or None (mutually exclusive, like the C/F keys)."""
+        if mode == self.mode:
+            return
+        if self.mode == "fishing":
+            self.fishing.stop_fishing()
+            self.arbitrator.release("FISHING")
+        elif self.mode == "combat":
+            self.arbitrator.release("COMBAT")
+        self.mode = mode
+        if mode == "fishing":
+            self.fishing.start_fishing()
+        print(f"[{self.name}] Mode: {mode or 'idle'}")
+
+    def toggle(self, mode: str):
+        self.set_mode(None if self.mode == mode else mode)
+
+    def perceive(self) -> Optional[np.ndarray]:
+        """Per-agent half before detection. Returns the frame if it needs a detector pass."""
+        self.needs_detection = False
+        self.frame = frame = self.source.capture_frame()
+        if frame is None:
+            return None
+        self.frame_time = self.source.last_frame_time
+
+        hud = self.hud.read(frame)
+        if hud:
+            self.state.health = hud["health"]
+            self.state.hunger = hud["hunger"]
+            self.state.alive = hud["health"] > 0
+        screen = self.screen.update(frame, hud_alive=bool(hud and hud["health"] > 0))
+        if self.screen.changed:
+            print(f"[{self.name}] Screen: {screen}")
+            if self.metrics:
+                self.metrics.event("screen_state", state=screen, agent=self.index)
+            if screen != WORLD:
+                self.controller.emergency_stop()
+        if not self.screen.in_world:
+            return None
+
+        self.executor.tick()
+        coords = self.coords.process_frame(frame)
+        if coords:
+            self.state.position = coords
+
+        self.needs_detection = self.vision.begin(frame)
+        return frame if self.needs_detection else None
+
+    def act(self, detections: Optional[List[Dict[str, Any]]] = None):
+        """Per-agent half after detection (None = no fresh detections this frame)."""
+        if self.frame is None or not self.screen.in_world:
+            return
+        self.vision_result = result = self.vision.finish(detections)
+        lava_danger = result["lava_detected"]
+        self.state.hazards = ("lava",) if lava_danger else ()
+
+        if lava_danger:
+            self.arbitrator.submit("REFLEX", "RETREAT", {MOVEMENT}, ttl=0.3)
+        if self.mode == "combat":
+            self.arbitrator.submit("COMBAT", "ATTACK", {LOOK, TRIGGERS})
+        elif self.mode == "fishing":
+            self.arbitrator.submit("FISHING", "FISH", ALL_RESOURCES)
+        self.decision = decision = self.arbitrator.tick()
+        if self.metrics and "REFLEX" in decision.started:
+            self.metrics.event("retreat", result["danger_level"], agent=self.index)
+
+        with self.controller.transaction():
+            if "REFLEX" in decision.granted:
+                self.reflex.retreat_from_danger()
+            elif "REFLEX" in decision.revoked:
+                self.reflex.stop_retreat()
+
+            if "COMBAT" in decision.granted:
+                h, w = self.frame.shape[:2]
+                self.combat.update(result["detections"], (w, h), self.frame_time)
+            elif "COMBAT" in decision.revoked:
+                self.controller.set_look(0, 0)
+                self.controller.set_attack(False)
+
+            if "FISHING" in decision.granted:
+                self.fishing.update(self.frame)
+            elif "FISHING" in decision.revoked:
+                self.fishing.suspend()
+
+    def telemetry(self) -> Dict[str, Any]:
+        return {
+            "agent": self.index,
+            "mode": self.mode,
+            "screen": self.screen.state,
+            "layer": self.arbitrator.active_layer,
+            "fishing": self.fishing.state,
+            "capture_fps": round(getattr(self.source, "capture_rate", 0.0), 1),
+            "state": self.state.__dict__,
+            "detections": [[d["label"], round(d["conf"], 2), *d["box"]]
+                           for d in self.vision_result.get("detections", [])],
+        }
+
+    def emergency_stop(self):
+        self.controller.emergency_stop()
+
+    def close(self):
+        self.fishing.stop_fishing()
+        self.combat.aim.save_log()
+        if self.scheduler:
+            self.scheduler.stop()
+        self.controller.close()
+        self.source.close()
+
+class MultiAgentRuntime:
+    """
+    Drives several Agents from one process around one shared detector.
+
+    Each round every agent perceives; the frames that still need detection (not gated by
+    the screen state, not served by the detection cache) go to the detector as one batch
+    (split at max_batch), then every agent acts on its own results. One model copy and one
+    inference call per round instead of one model and one call per game instance.
+    """
+    def __init__(self, agents: List[Agent], detector: YoloDetector, max_batch: int = 8,
+                 metrics: Optional[MetricsStore] = None):
+        self.agents = agents
+        self.detector = detector
+        self.max_batch = max_batch
+        self.metrics = metrics
+        self.rounds = 0
+        self.batches = 0
+        self.batched_frames = 0
+        self.last_batch = 0
+        self.stage_ms: Dict[str, float] = {}
+
+    def step(self) -> int:
+        """One round over all agents. Returns the number of frames sent to the detector."""
+        t0 = time.perf_counter()
+        pending = [a for a in self.agents if a.perceive() is not None]
+        t1 = time.perf_counter()
+
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        for i in range(0, len(pending), self.max_batch):
+            group = pending[i:i + self.max_batch]
+            conf = min(a.vision.conf_threshold for a in group)
+            for agent, dets in zip(group, self.detector.detect_batch([a.frame for a in group], conf)):
+                results[agent.index] = [d for d in dets if d["conf"] >= agent.vision.conf_threshold]
+            self.batches += 1
+        t2 = time.perf_counter()
+
+        for agent in self.agents:
+            agent.act(results.get(agent.index))
+        t3 = time.perf_counter()
+
+        self.rounds += 1
+        self.batched_frames += len(pending)
+        self.last_batch = len(pending)
+        self.stage_ms = {"perceive": (t1 - t0) * 1000, "detect": (t2 - t1) * 1000, "act": (t3 - t2) * 1000}
+        if self.metrics:
+            for stage, ms in self.stage_ms.items():
+                self.metrics.timing(stage, ms)
+        return len(pending)
+
+    def apply(self, action: str, agent: Optional[int] = None):
+        """Key/control-server action for one agent (None = all)."""
+        targets = self.agents if agent is None else [a for a in self.agents if a.index == agent]
+        for a in targets:
+            if action in MODES:
+                a.toggle(action)
+            elif action == "retrack":
+                a.source.request_retrack()
+
+    def emergency_stop(self):
+        """SafetyMonitor target: releases every agent's controller."""
+        for a in self.agents:
+            a.emergency_stop()
+
+    def telemetry(self) -> Dict[str, Any]:
+        return {
+            "rounds": self.rounds,
+            "batch": self.last_batch,
+            "mean_batch": round(self.batched_frames / self.batches, 2) if self.batches else 0.0,
+            "stages_ms": {k: round(v, 2) for k, v in self.stage_ms.items()},
+            "agents": [a.telemetry() for a in self.agents],
+        }
+
+    def render(self, tile_width: int = 480) -> Optional[np.ndarray]:
+        """Debug view: agents side by side (two rows from four agents up)."""
+        tiles = []
+        for a in self.agents:
+            frame = a.frame
+            if frame is None:
+                tile = np.zeros((tile_width * 9 // 16, tile_width, 3), np.uint8)
+            else:
+                h, w = frame.shape[:2]
+                scale = tile_width / w
+                tile = cv2.resize(frame[..., :3], (tile_width, int(h * scale)), interpolation=cv2.INTER_NEAREST)
+                for d in a.vision_result.get("detections", []):
+                    x1, y1, x2, y2 = (int(v * scale) for v in d["box"])
+                    cv2.rectangle(tile, (x1, y1), (x2, y2), (0, 255, 255), 1)
+            color = (0, 255, 0) if a.screen.in_world else (0, 255, 255)
+            cv2.putText(tile, f"{a.name} {a.mode or 'idle'} {a.screen.state} {a.arbitrator.active_layer}",
+                        (8, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+            tiles.append(tile)
+        if not tiles:
+            return None
+        height = max(t.shape[0] for t in tiles)
+        tiles = [cv2.copyMakeBorder(t, 0, height - t.shape[0], 0, 0, cv2.BORDER_CONSTANT) for t in tiles]
+        per_row = len(tiles) if len(tiles) < 4 else (len(tiles) + 1) // 2
+        tiles += [np.zeros_like(tiles[0])] * (-len(tiles) % per_row)
+        rows = [np.hstack(tiles[i:i + per_row]) for i in range(0, len(tiles), per_row)]
+        return np.vstack(rows)
+
+    def close(self):
+        for a in self.agents:
+            a.close()
+
+def parse_agent_specs(specs: str) -> List[tuple]:
+    """
+    "window:Minecraft#0|combat; window:Minecraft#1|fishing; session:recordings/x"
+    -> [(source spec, mode or None), ...]
+    """
+    out = []
+    for part in specs.split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        source, _, mode = part.partition("|")
+        mode = mode.strip().lower() or None
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"Unknown agent mode '{mode}' (expected one of {', '.join(MODES)})")
+        out.append((source.strip(), mode))
+    return out
+
+def run_multi_agent(specs: str):
+    """Multi-instance main loop (AGENT_SOURCES)."""
+    print("Initializing MainkurafutoAI (multi-instance)...")
+    agents: List[Agent] = []
+    control = None
+    metrics = None
+    try:
+        parsed = parse_agent_specs(specs)
+        detector = YoloDetector()
+        metrics_path = os.getenv("METRICS_PATH", "metrics.sqlite")
+        if metrics_path:
+            try:
+                metrics = MetricsStore(metrics_path)
+            except Exception as e:
+                print(f"[Metrics] Disabled: {e}")
+        input_rate = float(os.getenv("INPUT_RATE_HZ", "250"))
+        profile = None
+        if os.getenv("PERF_PROFILE", "auto") != "off":
+            profile = load_profile(os.getenv("PERF_PROFILE_PATH", "perf_profiles.json"),
+                                   None if os.getenv("PERF_PROFILE", "auto") == "auto" else os.getenv("PERF_PROFILE"))
+        for i, (source, mode) in enumerate(parsed):
+            agents.append(Agent(i, open_source(source), detector, mode, metrics, input_rate, profile))
+        runtime = MultiAgentRuntime(agents, detector, max_batch=int(os.getenv("AGENT_MAX_BATCH", "8")),
+                                    metrics=metrics)
+        control_port = int(os.getenv("CONTROL_PORT", "8765"))
+        if control_port > 0:
+            try:
+                control = ControlServer(port=control_port, token=os.getenv("CONTROL_TOKEN"))
+            except OSError as e:
+                print(f"[Control] Server disabled: {e}")
+    except Exception as e:
+        print(f"Initialization Failed: {e}")
+        for a in agents:
+            a.close()
+        return
+
+    safety = SafetyMonitor(runtime) # F12 / END act on every agent
+    threading.Thread(target=safety.start_monitoring, daemon=True).start()
+    print(f"{len(agents)} agents initialized. 'C'/'F' toggle combat/fishing on all agents, 'Q' quits.")
+
+    cv2.namedWindow("Agents", cv2.WINDOW_NORMAL)
+    key_actions = {ord('q'): "quit", ord('c'): "combat", ord('f'): "fishing", ord('r'): "retrack"}
+    last_time = time.perf_counter()
+    try:
+        while safety.active:
+            if not safety.is_safe_to_operate():
+                time.sleep(0.1)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
+
+            runtime.step()
+            now = time.perf_counter()
+            loop_dt = max(now - last_time, 1e-6)
+            fps = 1.0 / loop_dt
+            last_time = now
+            if metrics:
+                metrics.timing("loop", loop_dt * 1000)
+
+            view = runtime.render()
+            if view is not None:
+                cv2.putText(view, f"FPS: {fps:.1f} batch: {runtime.last_batch}", (8, view.shape[0] - 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 1)
+                cv2.imshow("Agents", view)
+
+            if control and control.has_subscribers:
+                control.publish("frame", {"fps": round(fps, 1), **runtime.telemetry()})
+
+            key = cv2.waitKey(1) & 0xFF
+            actions = [(key_actions[key], None)] if key in key_actions else []
+            if control:
+                for msg in control.poll_commands():
+                    if "action" in msg:
+                        actions.append((msg["action"], msg.get("agent")))
+                    else:
+                        print("[Control] Goals/commands are not supported in multi-instance mode")
+            if any(action == "quit" for action, _ in actions):
+                break
+            for action, agent in actions:
+                runtime.apply(action, agent)
+    except KeyboardInterrupt:
+        print("Stopping...")
+    finally:
+        if control:
+            control.close()
+        runtime.close()
+        if metrics:
+            metrics.close()
+        cv2.destroyAllWindows()
+        print("MainkurafutoAI Shutdown.")
@@ -8,6 +8,7 @@ class AgentState:
     hunger: float = 20.0
     alive: bool = True
     active_task: str = "IDLE"
+    hazards: Tuple[str, ...] = ()
 
 class StateManager:
     _instance = None
@@ -23,8 +24,16 @@ class StateManager:
 
     def update_health(self, health: float):
         self.state.health = health
-        if self.state.health <= 0:
-            self.state.alive = False
+        self.state.alive = self.state.health > 0 # Back to True after respawn
+
+    def update_hunger(self, hunger: float):
+        self.state.hunger = hunger
+
+    def update_task(self, task: str):
+        self.state.active_task = task
+
+    def update_hazards(self, hazards: Tuple[str, ...]):
+        self.state.hazards = hazards
 
     def get_state(self) -> AgentState:
         return self.state
@@ -2,17 +2,25 @@ import threading
 import queue
 import time
 from src.planning.llm_interface import LLMInterface
+from src.planning.streaming_planner import StreamingPlanner
+from src.planning.plan_cache import PlanCache, state_fingerprint
+from src.planning.speculative_planner import SpeculativePlanner
 from src.core.state_manager import StateManager
 from src.skills.registry import SkillRegistry
 from src.skills.primitives import PrimitiveSkills
+from src.skills.plan_runtime import PlanRuntime
 from src.utils.input_controller import InputController
 
 class CommandCenter:
-    def __init__(self, state_manager: StateManager, controller: InputController):
+    def __init__(self, state_manager: StateManager, controller: InputController, runtime: PlanRuntime):
         self.state_manager = state_manager
         self.llm = LLMInterface()
-        self.primitives = PrimitiveSkills(controller)
-        self.registry = SkillRegistry(self.primitives)
+        self.planner = StreamingPlanner(self.llm)
+        self.plan_cache = PlanCache()
+        self.speculator = SpeculativePlanner(self.llm)
+        self.primitives = PrimitiveSkills(controller, runtime.may_release)
+        self.runtime = runtime
+        self.registry = SkillRegistry(self.primitives, runtime)
         self.command_queue = queue.Queue()
         self.active = True
         
@@ -22,6 +30,26 @@ class CommandCenter:
         t.start()
         print("Command Center Ready. Type commands (e.g., 'goal: Find diamond' or 'stop').")
 
+    def update(self, idle: bool):
+        """Per-frame hook from the main loop: plan likely next goals while nothing is running."""
+        idle = idle and not self.planner.busy and not self.runtime.busy
+        state = self.state_manager.get_state()
+        self.speculator.update(
+            idle, state_fingerprint(state), lambda: self.llm.prompts.summarize(state, commit=False), list(self.registry.skills.keys()),
+            self.plan_cache.contains, self._is_valid_step
+        )
+
+    def note_event(self, event: str):
+        """Game event that hints at the next goal (e.g. 'fishing_timeout', 'combat_cleared')."""
+        self.speculator.predictor.observe_event(event)
+
+    def close(self):
+        self.active = False
+        self.speculator.cancel()
+        self.planner.cancel()
+        self.plan_cache.close()
+        self.llm.close()
+
     def _input_loop(self):
         while self.active:
             try:
@@ -43,22 +71,79 @@ class CommandCenter:
             self.active = False
             # You might want to signal main.py to stop as well
             
+        elif cmd.lower() == "cache":
+            print(f"[PlanCache] {self.plan_cache.stats()}")
+            print(f"[Speculate] {self.speculator.stats()}")
+            if self.llm.client:
+                print(f"[LLM] {self.llm.client.stats()}")
+            
+        elif cmd.lower() == "cancel":
+            print("[Plan] Cancelled")
+            self.planner.cancel()
+            self.runtime.preempt()
+            
         elif cmd.lower().startswith("goal:"):
             goal = cmd[5:].strip()
             self._handle_goal(goal)
             
         else:
-            print("Unknown command. Try 'goal: <text>' or 'stop'.")
+            print("Unknown command. Try 'goal: <text>', 'cancel', 'cache' or 'stop'.")
 
     def _handle_goal(self, goal: str):
+        """Plan in the background; each step starts executing as soon as it is streamed."""
         print(f"[Planning] Goal: {goal}")
-        state = self.state_manager.get_state().__dict__
-        plan = self.llm.plan_task(goal, state)
+        agent_state = self.state_manager.get_state()
+        fingerprint = state_fingerprint(agent_state)
         
-        if plan:
-            print(f"Executing Plan: {plan}")
-            self.registry.execute_plan(plan)
-        else:
+        # New goal replaces whatever is running (including a plan still streaming in);
+        # speculation must not compete for the LLM
+        self.runtime.preempt()
+        self.planner.cancel()
+        self.speculator.cancel()
+        self.speculator.predictor.observe_goal(goal)
+        
+        # Repeated goal in a similar situation: skip the LLM entirely
+        cached = self.plan_cache.get(goal, fingerprint)
+        if cached and self.registry.execute_plan(cached):
+            print(f"[Plan] Cache hit ({self.plan_cache.hit_rate:.0%} hit rate): {cached}")
+            return
+        
+        # Predicted while idle
+        speculated = self.speculator.take(goal, fingerprint)
+        if speculated and self.registry.execute_plan(speculated):
+            print(f"[Plan] Speculation hit: {speculated}")
+            self.plan_cache.put(goal, fingerprint, speculated)
+            return
+        
+        state = self.llm.prompts.summarize(agent_state)
+        skills = list(self.registry.skills.keys())
+        
+        def on_done(plan: list, complete: bool):
+            self._on_plan_done(plan)
+            # Only whole plans are cached: a stream cut short would replay the prefix for 24h
+            if complete and plan and all(self._is_valid_step(s) for s in plan):
+                self.plan_cache.put(goal, fingerprint, plan)
+        
+        self.planner.plan_async(goal, state, skills, self._on_plan_step, on_done)
+
+    def _is_valid_step(self, text: str) -> bool:
+        try:
+            self.registry.compile_step(text)
+            return True
+        except ValueError:
+            return False
+
+    def _on_plan_step(self, text: str):
+        try:
+            step = self.registry.compile_step(text)
+        except ValueError as e:
+            print(f"[Plan] Skipping step: {e}")
+            return
+        print(f"[Plan] + {text}")
+        self.runtime.append(step)
+
+    def _on_plan_done(self, plan: list):
+        if not plan:
             print("Plan generation failed or empty.")
 
 if __name__ == "__main__":
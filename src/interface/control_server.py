@@ -0,0 +1,310 @@
+import json
+import time
+import queue
+import base64
+import struct
+import asyncio
+import hashlib
+import secrets
+import threading
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit, parse_qs
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BODY = 64 * 1024
+ACTIONS = ("combat", "fishing", "retrack", "quit")
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+class BadRequest(Exception):
+    """Malformed request line/headers (answered with 400 or 413)."""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class ControlServer:
+    """
+    Local control + telemetry endpoint (stdlib asyncio, own daemon thread).
+
+    HTTP:
+        GET  /status            last published telemetry + server stats
+        POST /goal              {"goal": "find a cave"}
+        POST /command           {"cmd": "cancel"}          (same text as the console)
+        POST /action            {"action": "combat" | "fishing" | "retrack" | "quit"}  (= C/F/R/Q keys)
+                                multi-instance mode: optional "agent": <index> (default: all agents)
+    WebSocket:
+        GET  /ws                streams telemetry as compact JSON text frames;
+                                accepts the same JSON bodies as the POST routes
+
+    Commands are queued for the main loop (`poll_commands`); nothing here touches game state.
+    Each subscriber has a bounded queue: when a client falls behind, its oldest frames are
+    dropped so the bot never waits on a slow viewer.
+
+    Every request needs `Authorization: Bearer <token>` (or `?token=` for WebSocket clients).
+    Without a configured token a random one is generated and printed at startup. Requests
+    from web pages (an `Origin` header that is not localhost) are refused, and POST bodies
+    must be `application/json`, so a site open in the browser can't drive the bot.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, token: Optional[str] = None,
+                 max_pending: int = 8):
+        self.host = host
+        self.port = port
+        self.token = token or secrets.token_urlsafe(16)
+        generated = not token
+        self.max_pending = max_pending
+        self.commands: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._latest: Optional[str] = None
+        self.published = 0
+        self.dropped = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        if self._error:
+            raise self._error
+        print(f"[Control] Listening on http://{self.host}:{self.port} (WebSocket: /ws)")
+        if generated:
+            print(f"[Control] No CONTROL_TOKEN set, using generated token: {self.token}")
+
+    # --- Main-loop API (thread-safe) ---
+
+    @property
+    def has_subscribers(self) -> bool:
+        """Check before building telemetry so nobody pays for it when no one is watching."""
+        return bool(self._subscribers)
+
+    def publish(self, kind: str, data: Dict[str, Any]):
+        msg = json.dumps({"kind": kind, "t": round(time.time(), 3), "data": data},
+                         separators=(",", ":"), default=str)
+        self._latest = msg
+        self.published += 1
+        if self._subscribers:
+            self._loop.call_soon_threadsafe(self._fanout, msg)
+
+    def poll_commands(self) -> List[Dict[str, Any]]:
+        """Drain queued commands (never blocks)."""
+        out = []
+        while True:
+            try:
+                out.append(self.commands.get_nowait())
+            except queue.Empty:
+                return out
+
+    def close(self):
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    # --- Loop thread ---
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+
+    def _fanout(self, msg: str):
+        for q in self._subscribers:
+            if q.full():
+                q.get_nowait()
+                self.dropped += 1
+            q.put_nowait(msg)
+
+    def _accept(self, body: Dict[str, Any]) -> Optional[str]:
+        """Validate and queue a command. Returns an error message or None."""
+        if not isinstance(body, dict):
+            return "expected a JSON object"
+        if "goal" in body:
+            if not isinstance(body["goal"], str) or not body["goal"].strip():
+                return "goal must be a non-empty string"
+        elif "cmd" in body:
+            if not isinstance(body["cmd"], str):
+                return "cmd must be a string"
+        elif "action" in body:
+            if body["action"] not in ACTIONS:
+                return f"action must be one of {', '.join(ACTIONS)}"
+        else:
+            return "expected 'goal', 'cmd' or 'action'"
+        if "agent" in body and (not isinstance(body["agent"], int) or body["agent"] < 0):
+            return "agent must be a non-negative integer"
+        self.commands.put(body)
+        return None
+
+    @staticmethod
+    def _local_origin(headers: Dict[str, str]) -> bool:
+        """No Origin (curl, scripts) or a localhost page. Browsers always send it cross-origin."""
+        origin = headers.get("origin")
+        if origin is None:
+            return True
+        return urlsplit(origin).hostname in LOCAL_HOSTS
+
+    def _authorized(self, headers: Dict[str, str], query: Dict[str, List[str]]) -> bool:
+        if headers.get("authorization", "") == f"Bearer {self.token}":
+            return True
+        return query.get("token", [None])[0] == self.token
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(self._read_request(reader), timeout=5.0)
+            if request is None:
+                return
+            method, path, query, headers, body = request
+            if not self._local_origin(headers):
+                await self._respond(writer, 403, {"error": "cross-origin requests are not allowed"})
+            elif not self._authorized(headers, query):
+                await self._respond(writer, 401, {"error": "unauthorized"})
+            elif path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._websocket(reader, writer, headers)
+            elif method == "GET" and path == "/status":
+                latest = json.loads(self._latest) if self._latest else None
+                await self._respond(writer, 200, {
+                    "telemetry": latest, "subscribers": len(self._subscribers),
+                    "published": self.published, "dropped": self.dropped,
+                })
+            elif method == "POST" and path in ("/goal", "/command", "/action"):
+                if headers.get("content-type", "").split(";")[0].strip().lower() != "application/json":
+                    await self._respond(writer, 415, {"error": "Content-Type must be application/json"})
+                    return
+                try:
+                    data = json.loads(body or b"{}")
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "invalid JSON"})
+                    return
+                error = self._accept(data)
+                await self._respond(writer, 400 if error else 202, {"error": error} if error else {"queued": True})
+            else:
+                await self._respond(writer, 404, {"error": "not found"})
+        except BadRequest as e:
+            try:
+                await self._respond(writer, e.status, {"error": str(e)})
+            except ConnectionError:
+                pass
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            return None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise BadRequest(400, "invalid Content-Length")
+        if length < 0:
+            raise BadRequest(400, "invalid Content-Length")
+        if length > MAX_BODY:
+            raise BadRequest(413, "body too large")
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return method.upper(), url.path.rstrip("/") or "/", parse_qs(url.query), headers, body
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, body: Dict[str, Any]):
+        reason = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+                  404: "Not Found", 413: "Payload Too Large", 415: "Unsupported Media Type"}[status]
+        data = json.dumps(body, separators=(",", ":")).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    # --- WebSocket (RFC 6455, text frames only) ---
+
+    async def _websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: Dict[str, str]):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            await self._respond(writer, 400, {"error": "missing Sec-WebSocket-Key"})
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+        await writer.drain()
+
+        q: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        self._subscribers.add(q)
+        sender = asyncio.ensure_future(self._ws_sender(writer, q))
+        try:
+            await self._ws_receiver(reader, writer)
+        finally:
+            self._subscribers.discard(q)
+            sender.cancel()
+
+    async def _ws_sender(self, writer: asyncio.StreamWriter, q: asyncio.Queue):
+        try:
+            while True:
+                msg = await q.get()
+                writer.write(self._ws_frame(0x1, msg.encode()))
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    async def _ws_receiver(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while True:
+            b1, b2 = await reader.readexactly(2)
+            opcode = b1 & 0x0F
+            n = b2 & 0x7F
+            if n == 126:
+                n = struct.unpack(">H", await reader.readexactly(2))[0]
+            elif n == 127:
+                n = struct.unpack(">Q", await reader.readexactly(8))[0]
+            if n > MAX_BODY:
+                return
+            mask = await reader.readexactly(4) if b2 & 0x80 else None
+            payload = await reader.readexactly(n)
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+            if opcode == 0x8: # Close
+                writer.write(self._ws_frame(0x8, payload[:2]))
+                await writer.drain()
+                return
+            if opcode == 0x9: # Ping
+                writer.write(self._ws_frame(0xA, payload))
+                await writer.drain()
+            elif opcode == 0x1: # Text: a command
+                try:
+                    error = self._accept(json.loads(payload))
+                except ValueError:
+                    error = "invalid JSON"
+                if error:
+                    writer.write(self._ws_frame(0x1, json.dumps({"error": error}).encode()))
+                    await writer.drain()
+
+    @staticmethod
+    def _ws_frame(opcode: int, payload: bytes) -> bytes:
+        n = len(payload)
+        if n < 126:
+            header = struct.pack(">BB", 0x80 | opcode, n)
+        elif n < 65536:
+            header = struct.pack(">BBH", 0x80 | opcode, 126, n)
+        else:
+            header = struct.pack(">BBQ", 0x80 | opcode, 127, n)
+        return header + payload
@@ -1,3 +1,4 @@
+import os
 import cv2
 import numpy as np
 import pytesseract
@@ -20,6 +21,8 @@ class CoordinateReader:
         # Only run it every N frames
         self.frame_count = 0
         self.ocr_interval = 30   
+        # User requested to disable OCR for performance (COORD_OCR=1 turns it back on)
+        self.enabled = os.getenv("COORD_OCR", "0") == "1"
         
     def set_region(self, top: int, left: int, width: int, height: int):
         self.region = {"top": top, "left": left, "width": width, "height": height}
@@ -29,9 +32,15 @@ class CoordinateReader:
         Extract coordinates from the frame.
         Expects format similar to "Position: 123, 64, 456"
         """
-        # User requested to disable OCR for performance
-        return self.last_position
+        if not self.enabled:
+            return self.last_position
+        self.frame_count += 1
+        if (self.frame_count - 1) % self.ocr_interval:
+            return self.last_position
+        return self.read_now(frame)
 
+    def read_now(self, frame: np.ndarray) -> Optional[Tuple[int, int, int]]:
+        """Run OCR on this frame regardless of enabled/ocr_interval."""
         # Crop to roi
         x, y, w, h = self.region["left"], self.region["top"], self.region["width"], self.region["height"]
         roi = frame[y:y+h, x:x+w]
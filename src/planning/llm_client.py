@@ -0,0 +1,166 @@
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+from openai import OpenAI, APIConnectionError, APITimeoutError
+
+class LLMTimeoutError(TimeoutError):
+    """The request (or the wait for a free slot) ran past its deadline."""
+
+class _Flight:
+    """One in-flight request that identical callers wait on instead of re-sending."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+class LLMClient:
+    """
+    Shared client for the OpenAI-compatible planner server.
+
+    - One pooled keep-alive httpx connection pool (no TCP/TLS setup per request)
+    - Bounded concurrency: at most `max_concurrency` requests hit the server at once
+    - Per-request deadlines covering the wait for a slot, the request itself and any retries
+    - Single-flight: identical blocking requests already in flight share one response
+    """
+    def __init__(self, base_url: str, api_key: str, max_concurrency: int = 2, max_connections: int = 4,
+                 timeout: float = 30.0, connect_timeout: float = 3.0, max_retries: int = 1):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._http = httpx.Client(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                                keepalive_expiry=60.0),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        )
+        # SDK retries are off: they would ignore our deadline (see _create)
+        self.openai = OpenAI(base_url=base_url, api_key=api_key, http_client=self._http, max_retries=0)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+        # Stats
+        self.requests = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    @staticmethod
+    def request_key(model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        blob = json.dumps([model, messages, params], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+    def _acquire(self, deadline: float):
+        if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            self.timeouts += 1
+            raise LLMTimeoutError("No free LLM slot before deadline")
+
+    def _remaining(self, deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self.timeouts += 1
+            raise LLMTimeoutError("LLM deadline exceeded")
+        return remaining
+
+    def _create(self, deadline: float, **kwargs):
+        """chat.completions.create with deadline-bounded retries on connection failures."""
+        attempt = 0
+        while True:
+            try:
+                return self.openai.chat.completions.create(timeout=self._remaining(deadline), **kwargs)
+            except (APITimeoutError, httpx.TimeoutException) as e:
+                self.timeouts += 1
+                raise LLMTimeoutError(str(e)) from e
+            except APIConnectionError:
+                attempt += 1
+                backoff = 0.2 * attempt
+                if attempt > self.max_retries or time.monotonic() + backoff >= deadline:
+                    raise
+                time.sleep(backoff)
+
+    def complete(self, model: str, messages: List[Dict[str, str]], timeout: Optional[float] = None,
+                 **params) -> str:
+        """Blocking completion; returns the message text. Raises LLMTimeoutError past the deadline."""
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        key = self.request_key(model, messages, params)
+
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            if not flight.done.wait(max(0.0, deadline - time.monotonic())):
+                self.timeouts += 1
+                raise LLMTimeoutError("Coalesced LLM request timed out")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            self._acquire(deadline)
+            try:
+                self.requests += 1
+                response = self._create(deadline, model=model, messages=messages, **params)
+                flight.result = response.choices[0].message.content or ""
+            finally:
+                self._slots.release()
+        except BaseException as e:
+            if not isinstance(e, LLMTimeoutError):
+                self.errors += 1
+            flight.error = e
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def stream(self, model: str, messages: List[Dict[str, str]], timeout: Optional[float] = None,
+               **params) -> Iterator[str]:
+        """
+        Streaming completion; yields content deltas. Holds a concurrency slot until the
+        generator is exhausted or closed. Streams are not coalesced (each caller consumes its own).
+        The deadline bounds connect + time between chunks.
+        """
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        self._acquire(deadline)
+        stream = None
+        try:
+            self.requests += 1
+            try:
+                stream = self._create(deadline, model=model, messages=messages, stream=True, **params)
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            except (APITimeoutError, httpx.TimeoutException) as e:
+                self.timeouts += 1
+                raise LLMTimeoutError(str(e)) from e
+            except LLMTimeoutError:
+                raise
+            except Exception:
+                self.errors += 1
+                raise
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "coalesced": self.coalesced,
+                "timeouts": self.timeouts, "errors": self.errors}
+
+    def close(self):
+        self._http.close()
@@ -1,7 +1,8 @@
 import os
 import json
-from openai import OpenAI
 from dotenv import load_dotenv
+from src.planning.llm_client import LLMClient, LLMTimeoutError
+from src.planning.prompt_builder import PromptBuilder
 
 class LLMInterface:
     def __init__(self):
@@ -9,17 +10,30 @@ class LLMInterface:
         self.api_key = os.getenv("GOOGLE_API_KEY", "local") # Dummy key for local
         self.base_url = os.getenv("LLM_API_BASE", "http://localhost:1234/v1")
         self.model_name = os.getenv("LLM_MODEL", "mistralai/ministral-3-14b-reasoning")
+        self.timeout = float(os.getenv("LLM_TIMEOUT", "30"))
+        self.prompts = PromptBuilder(state_budget=int(os.getenv("LLM_STATE_TOKENS", "96")))
         
         print(f"[LLM] Connecting to {self.base_url} (Model: {self.model_name})...")
         
         try:
-            self.client = OpenAI(base_url=self.base_url, api_key=self.api_key)
+            self.client = LLMClient(
+                base_url=self.base_url, api_key=self.api_key,
+                max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "2")),
+                timeout=self.timeout
+            )
             # Test connection?
             # self.client.models.list()
         except Exception as e:
             print(f"[LLM] Connection Error: {e}")
             self.client = None
 
+    def build_messages(self, goal: str, state_summary: str, available_skills: list) -> list:
+        """Chat messages for a planning request (shared by blocking and streaming planners)."""
+        messages = self.prompts.build_messages(goal, state_summary, available_skills)
+        stats = self.prompts.message_stats(messages)
+        print(f"[LLM] Prompt: {stats['prompt_tokens']} tokens ({stats['prefix_tokens']} cached prefix)")
+        return messages
+
     def get_plan(self, goal: str, state_summary: str, available_skills: list) -> list:
         """
         Generate a plan using Local LLM (OpenAI Compatible).
@@ -28,28 +42,13 @@ class LLMInterface:
             print("[LLM] Mocking plan (No Client)")
             return ["LOOK_AROUND", "WAIT 1"]
 
-        prompt = f"""
-        You are a Minecraft Agent.
-        GOAL: {goal}
-        STATE: {state_summary}
-        SKILLS: {', '.join(available_skills)}
-        
-        Task: Break down the GOAL into a list of skill actions.
-        Format: Return ONLY a JSON list of strings. Example: ["MOVE_FORWARD 2", "JUMP"]
-        """
-
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a helpful Minecraft AI assistant. Reply only in JSON."},
-                    {"role": "user", "content": prompt}
-                ],
+            content = self.client.complete(
+                self.model_name,
+                self.build_messages(goal, state_summary, available_skills),
                 temperature=0.7,
                 max_tokens=200
-            )
-            
-            content = response.choices[0].message.content.strip()
+            ).strip()
             print(f"[LLM] Raw Response: {content}")
             
             # Simple parsing (try to find JSON list)
@@ -62,6 +61,13 @@ class LLMInterface:
                 print(f"[LLM] Could not find JSON in response.")
                 return []
                 
+        except LLMTimeoutError as e:
+            print(f"[LLM] Timed out after {self.timeout:.0f}s: {e}")
+            return []
         except Exception as e:
             print(f"[LLM] Inference Error: {e}")
             return []
+
+    def close(self):
+        if self.client:
+            self.client.close()
@@ -0,0 +1,152 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_PUNCT = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+def normalize_goal(goal: str) -> str:
+    """'Go fishing!!' / 'go  fishing' -> 'go fishing'"""
+    return _SPACES.sub(" ", _PUNCT.sub(" ", goal.lower())).strip()
+
+def state_fingerprint(state: Any, hazards: Iterable[str] = ()) -> str:
+    """
+    Coarse, plan-relevant view of the state: health bucket, active task and hazard flags.
+    Position is deliberately left out so plans are reused across the world.
+    `state` is an AgentState or its __dict__.
+    """
+    s = state if isinstance(state, dict) else state.__dict__
+    health_bucket = int(max(0.0, min(20.0, float(s.get("health", 20.0)))) // 5)  # 0..4
+    task = str(s.get("active_task", "IDLE")).upper()
+    flags = sorted(set(hazards) | set(s.get("hazards", ())))
+    return f"h{health_bucket}|{task}|{','.join(flags)}"
+
+class PlanCache:
+    """
+    LRU + TTL cache of LLM plans keyed by (normalized goal, state fingerprint).
+    Backed by SQLite so it survives restarts. Thread-safe.
+    """
+    def __init__(self, path: Optional[str] = "plan_cache.sqlite", capacity: int = 256, ttl: float = 24 * 3600.0):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._mem: "OrderedDict[str, Tuple[List[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._db = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS plans ("
+                    " key TEXT PRIMARY KEY, plan TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+                )
+                self._db.commit()
+                self._load()
+            except sqlite3.Error as e:
+                print(f"[PlanCache] Disk store disabled: {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(goal: str, fingerprint: str) -> str:
+        return f"{normalize_goal(goal)}#{fingerprint}"
+
+    def _load(self):
+        """Warm the LRU from disk (most recently used first), dropping expired rows."""
+        cutoff = time.time() - self.ttl
+        self._db.execute("DELETE FROM plans WHERE created < ?", (cutoff,))
+        rows = self._db.execute(
+            "SELECT key, plan, created FROM plans ORDER BY last_used DESC LIMIT ?", (self.capacity,)
+        ).fetchall()
+        for key, plan, created in reversed(rows):
+            self._mem[key] = (json.loads(plan), created)
+        self._db.commit()
+        if rows:
+            print(f"[PlanCache] Loaded {len(rows)} cached plans")
+
+    def get(self, goal: str, fingerprint: str) -> Optional[List[str]]:
+        key = self.make_key(goal, fingerprint)
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            plan, created = entry
+            if now - created > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._mem.move_to_end(key)
+            self.hits += 1
+            if self._db:
+                self._db.execute("UPDATE plans SET last_used = ? WHERE key = ?", (now, key))
+                self._db.commit()
+            return list(plan)
+
+    def contains(self, goal: str, fingerprint: str) -> bool:
+        """Peek without touching LRU order or hit/miss stats."""
+        entry = self._mem.get(self.make_key(goal, fingerprint))
+        return entry is not None and time.time() - entry[1] <= self.ttl
+
+    def put(self, goal: str, fingerprint: str, plan: List[str]):
+        if not plan:
+            return
+        key = self.make_key(goal, fingerprint)
+        now = time.time()
+        with self._lock:
+            self._mem[key] = (list(plan), now)
+            self._mem.move_to_end(key)
+            if self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO plans (key, plan, created, last_used) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(plan), now, now)
+                )
+            while len(self._mem) > self.capacity:
+                old_key, _ = self._mem.popitem(last=False)
+                if self._db:
+                    self._db.execute("DELETE FROM plans WHERE key = ?", (old_key,))
+                self.evictions += 1
+            if self._db:
+                self._db.commit()
+
+    def invalidate(self, goal: str, fingerprint: str):
+        with self._lock:
+            self._remove(self.make_key(goal, fingerprint))
+
+    def _remove(self, key: str):
+        self._mem.pop(key, None)
+        if self._db:
+            self._db.execute("DELETE FROM plans WHERE key = ?", (key,))
+            self._db.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._mem),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._db:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,130 @@
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+@dataclass
+class Fact:
+    """One line of state for the planner. Higher salience survives the token budget first."""
+    key: str
+    text: str
+    salience: float
+
+def facts_from_state(state: Any) -> List[Fact]:
+    """Rank AgentState fields by how much they should influence a plan."""
+    s = state if isinstance(state, dict) else state.__dict__
+    facts = []
+    if not s.get("alive", True):
+        facts.append(Fact("alive", "DEAD", 1.0))
+    for hazard in s.get("hazards", ()):
+        facts.append(Fact(f"hazard:{hazard}", f"DANGER {hazard} nearby", 1.0))
+    health = float(s.get("health", 20.0))
+    facts.append(Fact("health", f"health {health:.0f}/20", 0.3 + 0.6 * (1.0 - health / 20.0)))
+    hunger = float(s.get("hunger", 20.0))
+    facts.append(Fact("hunger", f"food {hunger:.0f}/20", 0.2 + 0.5 * (1.0 - hunger / 20.0)))
+    task = s.get("active_task", "IDLE")
+    if task and task != "IDLE":
+        facts.append(Fact("task", f"doing {task}", 0.6))
+    pos = s.get("position")
+    if pos:
+        facts.append(Fact("pos", "pos " + ",".join(f"{v:.0f}" for v in pos), 0.4)) # Block precision is enough
+    return facts
+
+class PromptBuilder:
+    """
+    Builds planner prompts with a bounded, predictable size.
+
+    - Stable prefix: the system message (role, output format, skill list) is byte-identical
+      for a given skill set, so llama.cpp / vLLM / LM Studio can reuse its KV prefix cache.
+    - State: ranked facts packed into `state_budget` tokens. Facts that changed since the
+      last prompt are boosted and marked with '*'; unchanged low-salience facts go first.
+    - Token counts via tiktoken when installed, otherwise a chars/4 estimate.
+    """
+    def __init__(self, state_budget: int = 96, changed_boost: float = 0.5):
+        self.state_budget = state_budget
+        self.changed_boost = changed_boost
+        self._prefix: Dict[Tuple[str, ...], List[Dict[str, str]]] = {}
+        self._last: Dict[str, str] = {} # key -> text of the last committed prompt
+        self._enc = None
+        if tiktoken is not None:
+            try:
+                self._enc = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"[Prompt] tiktoken unavailable ({e}), estimating token counts")
+        # Stats of the last committed summary (display only; callers get their own from
+        # summarize_with_stats / message_stats, since the planner threads build prompts too)
+        self.last_stats: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def count_tokens(self, text: str) -> int:
+        if self._enc is not None:
+            return len(self._enc.encode(text))
+        return (len(text) + 3) // 4
+
+    def prefix(self, skills: Sequence[str]) -> List[Dict[str, str]]:
+        """Cached system message for this skill set."""
+        key = tuple(skills)
+        msgs = self._prefix.get(key)
+        if msgs is None:
+            msgs = [{
+                "role": "system",
+                "content": (
+                    "You are a Minecraft agent planner. Break the GOAL into skill actions.\n"
+                    f"SKILLS: {', '.join(key)}\n"
+                    'Reply ONLY with a JSON list of strings, e.g. ["MOVE_FORWARD 2", "JUMP"]. '
+                    "Lines marked * changed since the last request."
+                ),
+            }]
+            self._prefix[key] = msgs
+        return msgs
+
+    def summarize(self, state: Any, extra: Optional[List[Fact]] = None, commit: bool = True) -> str:
+        return self.summarize_with_stats(state, extra, commit)[0]
+
+    def summarize_with_stats(self, state: Any, extra: Optional[List[Fact]] = None,
+                             commit: bool = True) -> Tuple[str, Dict[str, int]]:
+        """
+        Compress the state into at most `state_budget` tokens. Returns (summary, stats).
+        commit=False leaves the delta baseline untouched (speculative prompts).
+        Thread-safe (called from the main loop and the planner threads).
+        """
+        facts = facts_from_state(state) + list(extra or [])
+        with self._lock:
+            last = self._last
+            if commit:
+                self._last = {f.key: f.text for f in facts}
+
+        ranked = []
+        for f in facts:
+            changed = last.get(f.key) != f.text
+            ranked.append((f.salience + (self.changed_boost if changed else 0.0), changed, f))
+        ranked.sort(key=lambda r: -r[0])
+
+        lines, used, dropped = [], 0, 0
+        for _, changed, f in ranked:
+            line = ("*" if changed and last else "") + f.text
+            cost = self.count_tokens(line) + 1 # Separator
+            if used + cost > self.state_budget:
+                dropped += 1
+                continue
+            lines.append(line)
+            used += cost
+
+        stats = {"state_tokens": used, "facts": len(lines), "dropped": dropped}
+        if commit:
+            with self._lock:
+                self.last_stats = stats
+        return "; ".join(lines), stats
+
+    def build_messages(self, goal: str, state_summary: str, skills: Sequence[str]) -> List[Dict[str, str]]:
+        return self.prefix(skills) + [{"role": "user", "content": f"GOAL: {goal}\nSTATE: {state_summary}"}]
+
+    def message_stats(self, messages: List[Dict[str, str]]) -> Dict[str, int]:
+        """Token counts of a build_messages() result (prefix = the cacheable system message)."""
+        prefix_tokens = self.count_tokens(messages[0]["content"])
+        return {"prefix_tokens": prefix_tokens,
+                "prompt_tokens": prefix_tokens + sum(self.count_tokens(m["content"]) for m in messages[1:])}
@@ -0,0 +1,205 @@
+import time
+import threading
+from collections import Counter, defaultdict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from src.planning.llm_interface import LLMInterface
+from src.planning.plan_cache import normalize_goal
+from src.planning.streaming_planner import IncrementalPlanParser
+
+class GoalPredictor:
+    """
+    Guesses the next goal from the command history (first-order Markov chain over
+    normalized goals) plus recent game events (fishing timed out, combat cleared, ...).
+    """
+    # Event -> goals that usually follow it
+    EVENT_GOALS: Dict[str, List[str]] = {
+        "fishing_timeout": ["find a new fishing spot", "go fishing"],
+        "combat_cleared": ["collect dropped items", "look around"],
+        "low_health": ["retreat and eat food"],
+    }
+
+    def __init__(self, max_history: int = 100, event_ttl: float = 60.0):
+        self.history: Deque[str] = deque(maxlen=max_history)
+        self.transitions: Dict[str, Counter] = defaultdict(Counter)
+        self.frequency: Counter = Counter()
+        self.event_ttl = event_ttl
+        self._events: Dict[str, float] = {} # event -> time seen
+        self._lock = threading.Lock() # Goals arrive on the command thread, events on the main loop
+
+    def observe_goal(self, goal: str):
+        goal = normalize_goal(goal)
+        with self._lock:
+            if self.history:
+                self.transitions[self.history[-1]][goal] += 1
+            self.history.append(goal)
+            self.frequency[goal] += 1
+            self._events.clear() # Events are answered by the goal that followed them
+
+    def observe_event(self, event: str, now: Optional[float] = None):
+        with self._lock:
+            self._events[event] = time.monotonic() if now is None else now
+
+    def predict(self, k: int = 2, now: Optional[float] = None) -> List[str]:
+        """Top-k likely next goals (normalized), best first."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._predict(k, now)
+
+    def _predict(self, k: int, now: float) -> List[str]:
+        scores: Counter = Counter()
+
+        if self.history:
+            following = self.transitions.get(self.history[-1])
+            if following:
+                total = sum(following.values())
+                for goal, n in following.items():
+                    scores[goal] += n / total
+
+        for event, seen in list(self._events.items()):
+            if now - seen > self.event_ttl:
+                del self._events[event]
+                continue
+            for rank, goal in enumerate(self.EVENT_GOALS.get(event, [])):
+                scores[normalize_goal(goal)] += 1.0 / (rank + 1)
+
+        # Weak prior: goals we ask for often
+        total = sum(self.frequency.values())
+        for goal, n in self.frequency.items():
+            scores[goal] += 0.1 * n / total
+
+        return [goal for goal, _ in scores.most_common(k)]
+
+class SpeculativePlanner:
+    """
+    Plans predicted goals in the background while the agent is idle, so an accepted goal
+    can start without waiting for the LLM.
+
+    Speculations are tied to the state fingerprint they were planned for and are dropped
+    as soon as it changes. They run one at a time and are cancelled whenever a real
+    request needs the LLM. Results stay in memory only (unconfirmed plans never reach
+    the persistent PlanCache).
+    """
+    def __init__(self, llm: LLMInterface, predictor: Optional[GoalPredictor] = None,
+                 idle_delay: float = 2.0, cooldown: float = 5.0, max_ready: int = 4):
+        self.llm = llm
+        self.predictor = predictor or GoalPredictor()
+        self.idle_delay = idle_delay   # Idle this long before speculating
+        self.cooldown = cooldown       # Min seconds between speculative requests
+        self.max_ready = max_ready
+        self._ready: Dict[str, Tuple[str, List[str]]] = {} # goal -> (fingerprint, plan)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        self._fingerprint: Optional[str] = None
+        self._idle_since: Optional[float] = None
+        self._last_run = 0.0
+        # Stats
+        self.runs = 0
+        self.hits = 0
+        self.discarded = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def update(self, idle: bool, fingerprint: str, state_summary: Callable[[], str], skills: List[str],
+               is_known: Callable[[str, str], bool], validate: Callable[[str], bool]):
+        """
+        Call every frame (cheap). Drops stale speculations and, after `idle_delay` seconds
+        of idleness, starts planning the most likely goal that has no plan yet.
+        state_summary(): prompt state text, only built when a request is started.
+        is_known(goal, fingerprint): True if a plan is already available (e.g. PlanCache).
+        """
+        now = time.monotonic()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self.invalidate(fingerprint)
+
+        if not idle:
+            self._idle_since = None
+            return
+        if self._idle_since is None:
+            self._idle_since = now
+        if (not self.llm.client or self.busy or now - self._idle_since < self.idle_delay
+                or now - self._last_run < self.cooldown):
+            return
+
+        with self._lock:
+            ready = {g for g, (fp, _) in self._ready.items() if fp == fingerprint}
+        for goal in self.predictor.predict():
+            if goal not in ready and not is_known(goal, fingerprint):
+                self._start(goal, fingerprint, state_summary(), skills, validate)
+                return
+
+    def _start(self, goal, fingerprint, state_summary, skills, validate):
+        self._last_run = time.monotonic()
+        self.runs += 1
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(goal, fingerprint, state_summary, skills, validate, self._cancel),
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, goal, fingerprint, state_summary, skills, validate, cancel: threading.Event):
+        parser = IncrementalPlanParser()
+        plan: List[str] = []
+        stream = self.llm.client.stream(
+            self.llm.model_name,
+            self.llm.build_messages(goal, state_summary, skills),
+            temperature=0.7,
+            max_tokens=200
+        )
+        try:
+            for delta in stream:
+                if cancel.is_set():
+                    return
+                plan.extend(parser.feed(delta))
+                if parser.done:
+                    break
+        except Exception as e:
+            print(f"[Speculate] '{goal}' failed: {e}")
+            return
+        finally:
+            stream.close()
+
+        # A cut-off stream (no closing ']') would be cached as a truncated plan on a hit
+        if cancel.is_set() or not parser.done or not plan or fingerprint != self._fingerprint or not all(validate(s) for s in plan):
+            self.discarded += 1
+            return
+        with self._lock:
+            self._ready[goal] = (fingerprint, plan)
+            while len(self._ready) > self.max_ready:
+                self._ready.pop(next(iter(self._ready)))
+                self.discarded += 1
+        print(f"[Speculate] Ready: '{goal}' -> {plan}")
+
+    def take(self, goal: str, fingerprint: str) -> Optional[List[str]]:
+        """Plan speculated for this goal in this state, if any (consumed)."""
+        with self._lock:
+            entry = self._ready.pop(normalize_goal(goal), None)
+        if entry is None:
+            return None
+        if entry[0] != fingerprint:
+            self.discarded += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def invalidate(self, fingerprint: Optional[str] = None):
+        """Drop speculations not made for `fingerprint` (all if None); cancel a stale run."""
+        self._cancel.set()
+        with self._lock:
+            stale = [g for g, (fp, _) in self._ready.items() if fp != fingerprint]
+            for g in stale:
+                del self._ready[g]
+        self.discarded += len(stale)
+
+    def cancel(self):
+        """Stop the running speculation (a real request needs the LLM)."""
+        self._cancel.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            ready = len(self._ready)
+        return {"runs": self.runs, "hits": self.hits, "discarded": self.discarded, "ready": ready}
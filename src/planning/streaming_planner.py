@@ -0,0 +1,157 @@
+import json
+import time
+import threading
+from typing import Callable, List, Optional
+from src.planning.llm_interface import LLMInterface
+
+class IncrementalPlanParser:
+    """
+    Incremental parser for a streamed JSON array of strings.
+
+    Feed raw completion chunks; every string element of the plan array is returned as soon
+    as its closing quote arrives. The plan array is the first `[` outside a string, so text
+    before it (```json fences, chatter, a {"plan": ...} wrapper) is skipped. Strings in nested
+    arrays are flattened into the plan; objects inside the plan are ignored.
+    """
+    def __init__(self):
+        self.depth = 0          # Array depth: 0 = before the plan, 1 = inside it, >1 = nested
+        self.obj_depth = 0      # Object depth, tracked separately so braces never open the plan
+        self._plan_obj_depth = 0  # Object depth the plan array opened at (e.g. 1 in {"plan": [...]})
+        self.in_string = False
+        self.escape = False
+        self.done = False
+        self._buf: List[str] = []
+
+    def feed(self, chunk: str) -> List[str]:
+        steps = []
+        if self.done:
+            return steps
+        for ch in chunk:
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                    self._buf.append(ch)
+                elif ch == "\\":
+                    self.escape = True
+                    self._buf.append(ch)
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth >= 1 and self.obj_depth == self._plan_obj_depth:
+                        try:
+                            steps.append(json.loads('"' + "".join(self._buf) + '"'))
+                        except ValueError:
+                            pass # Malformed escape - drop the element
+                    self._buf.clear()
+                else:
+                    self._buf.append(ch)
+            elif ch == '"' and (self.depth >= 1 or self.obj_depth > 0):
+                # Quotes in free text before the plan may be unbalanced - only JSON strings count
+                self.in_string = True
+            elif ch == "[":
+                if self.depth == 0:
+                    self._plan_obj_depth = self.obj_depth
+                self.depth += 1
+            elif ch == "]" and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.done = True
+                    break
+            elif ch == "{":
+                self.obj_depth += 1
+            elif ch == "}" and self.obj_depth > 0:
+                self.obj_depth -= 1
+        return steps
+
+class StreamingPlanner:
+    """
+    Non-blocking planner: streams the completion and hands every plan step to `on_step`
+    as soon as it is parsed, so the first action starts at first-step latency instead of
+    full-completion latency. Runs on a background thread; only one request at a time.
+    """
+    def __init__(self, llm: LLMInterface):
+        self.llm = llm
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        # Stats of the last request
+        self.time_to_first_step: Optional[float] = None
+        self.total_time: Optional[float] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def plan_async(self, goal: str, state_summary: str, available_skills: list,
+                   on_step: Callable[[str], None],
+                   on_done: Optional[Callable[[List[str], bool], None]] = None):
+        """
+        Start planning in the background. Cancels a request that is still streaming.
+        on_done(steps, complete): complete is False if the stream failed, timed out or was cut
+        off (e.g. max_tokens) before the JSON array closed - steps is then only a prefix.
+        """
+        if self.busy:
+            self.cancel()
+            self._thread.join(timeout=1.0)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(goal, state_summary, available_skills, on_step, on_done, self._cancel),
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, goal, state_summary, available_skills, on_step, on_done, cancel: threading.Event):
+        t0 = time.perf_counter()
+        self.time_to_first_step = None
+        steps: List[str] = []
+        complete = False
+
+        def emit(step: str):
+            if cancel.is_set():
+                return # Superseded: never append to the plan that replaced this one
+            if self.time_to_first_step is None:
+                self.time_to_first_step = time.perf_counter() - t0
+            steps.append(step)
+            on_step(step)
+
+        if not self.llm.client:
+            print("[LLM] Mocking plan (No Client)")
+            for step in ["LOOK_AROUND", "WAIT 1"]:
+                emit(step)
+            complete = True
+        else:
+            try:
+                complete = self._stream(goal, state_summary, available_skills, emit, cancel)
+            except Exception as e:
+                print(f"[LLM] Streaming Error: {e}")
+            if not complete and not cancel.is_set():
+                print(f"[LLM] Plan stream ended early ({len(steps)} steps parsed)")
+
+        self.total_time = time.perf_counter() - t0
+        if self.time_to_first_step is not None:
+            print(f"[LLM] Plan streamed: {len(steps)} steps | first step {self.time_to_first_step * 1000:.0f}ms | total {self.total_time * 1000:.0f}ms")
+        if on_done and not cancel.is_set():
+            on_done(steps, complete)
+
+    def _stream(self, goal, state_summary, available_skills, emit, cancel: threading.Event) -> bool:
+        """Returns True if the plan array was closed (the whole plan arrived)."""
+        parser = IncrementalPlanParser()
+        stream = self.llm.client.stream(
+            self.llm.model_name,
+            self.llm.build_messages(goal, state_summary, available_skills),
+            temperature=0.7,
+            max_tokens=200
+        )
+        try:
+            for delta in stream:
+                if cancel.is_set():
+                    print("[LLM] Plan stream cancelled")
+                    break
+                for step in parser.feed(delta):
+                    emit(step)
+                if parser.done:
+                    break # Ignore trailing text, free the server early
+        finally:
+            stream.close() # Releases the connection and the concurrency slot
+        return parser.done and not cancel.is_set()
@@ -0,0 +1,74 @@
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from src.utils.frame_hash import dhash_bits, hamming_packed
+
+class DetectionCache:
+    """
+    Reuses detector output for near-identical frames (standing still, menus, fishing).
+
+    Key: 256-bit dHash of a 17x16 thumbnail (~50us on 1280x720). A lookup matches the
+    closest cached hash within `max_distance` bits, vectorized over the whole LRU.
+    A global hash cannot tell a small distant mob from sensor/compression noise (both flip
+    a few bits), so entries also expire after `max_age` seconds: a mob walking into an
+    otherwise static scene is picked up within that time at worst. max_distance=0 only
+    reuses exact hash matches.
+    """
+    def __init__(self, capacity: int = 64, max_distance: int = 2, max_age: float = 0.5, hash_size: int = 16):
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self.max_age = max_age
+        self.hash_size = hash_size
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict() # key -> (detections, created, shape)
+        self._keys = np.zeros((0, hash_size * hash_size // 8), dtype=np.uint8) # Rows follow _entries order
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, frame: np.ndarray) -> np.ndarray:
+        return dhash_bits(frame, self.hash_size)
+
+    def get(self, key: np.ndarray, shape: tuple, now: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        now = time.monotonic() if now is None else now
+        if len(self._entries):
+            exact = self._entries.get(key.tobytes())
+            if exact is not None:
+                best = key.tobytes()
+            else:
+                dist = hamming_packed(key, self._keys)
+                i = int(dist.argmin())
+                best = list(self._entries)[i] if dist[i] <= self.max_distance else None
+            if best is not None:
+                detections, created, cached_shape = self._entries[best]
+                if now - created <= self.max_age and cached_shape == shape:
+                    self._entries.move_to_end(best)
+                    self._rebuild()
+                    self.hits += 1
+                    return detections
+        self.misses += 1
+        return None
+
+    def put(self, key: np.ndarray, shape: tuple, detections: List[Dict[str, Any]], now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        k = key.tobytes()
+        self._entries[k] = (detections, now, shape)
+        self._entries.move_to_end(k)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        self._rebuild()
+
+    def _rebuild(self):
+        nbytes = self.hash_size * self.hash_size // 8
+        self._keys = np.frombuffer(b"".join(self._entries.keys()), dtype=np.uint8).reshape(len(self._entries), nbytes)
+
+    def clear(self):
+        self._entries.clear()
+        self._rebuild()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
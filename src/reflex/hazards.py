@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+from typing import Tuple
+
+class LavaDetector:
+    """
+    HSV color check for lava at the player's feet.
+    Kept separate from VisionProcessor so it can run without loading YOLO (simulator, tools).
+    """
+    def __init__(self):
+        # Define Lava Color Range (HSV)
+        # Lava is generally bright orange/red -> yellow
+        # Note: OpenCV HSV ranges are H: 0-179, S: 0-255, V: 0-255
+        
+        # Lower bound for orange/red
+        # Lower bound (Tightened to exclude red blocks, focus on glowing orange)
+        self.lava_lower = np.array([5, 180, 180]) 
+        # Upper bound 
+        self.lava_upper = np.array([35, 255, 255])
+        
+        # Area threshold to trigger warning (percentage of ROI)
+        self.danger_threshold = 0.05 
+
+    def detect(self, frame: np.ndarray) -> Tuple[bool, float, np.ndarray]:
+        """
+        Returns (lava_detected, coverage, mask).
+        """
+        height, width, _ = frame.shape
+        
+        # 1. Underside / Footer ROI (Detecting lava at feet)
+        # Check bottom 40% of the screen
+        roi_h = int(height * 0.4)
+        roi_top = height - roi_h
+        roi = frame[roi_top:height, 0:width]
+        
+        # Convert to HSV
+        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+        
+        # Threshold
+        mask = cv2.inRange(hsv, self.lava_lower, self.lava_upper)
+        
+        # Calculate coverage
+        pixel_count = cv2.countNonZero(mask)
+        total_pixels = roi_h * width
+        coverage = pixel_count / total_pixels
+        
+        return coverage > self.danger_threshold, coverage, mask
@@ -0,0 +1,130 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+class HudReader:
+    """
+    Reads the health (hearts) and hunger (drumsticks) bars from the HUD.
+    All sample coordinates are precomputed per frame size, so a read is a single
+    NumPy gather plus a few vectorized comparisons (microseconds per frame).
+    """
+    # HUD layout in GUI pixels (same as vanilla): hotbar is 182x22 at the bottom center,
+    # both icon rows sit 39px above the bottom edge, icons are 9px wide on an 8px pitch.
+    HOTBAR_WIDTH = 182
+    ICON_ROW_OFFSET = 39
+    ICON_SIZE = 9
+    ICON_STEP = 8
+    ICON_COUNT = 10
+
+    # Sample points inside one 9x9 icon (x, y). Left half / right half of the icon.
+    # Each half is worth 1 point (a full heart = 2 HP).
+    LEFT_SAMPLES = ((2, 2), (2, 4), (3, 5))
+    RIGHT_SAMPLES = ((6, 2), (6, 4), (5, 5))
+    # Outline probe on the black border of each half (left edge / right edge of the icon)
+    OUTLINE_SAMPLES = ((0, 3), (8, 3))
+    # Fraction of half-icons that must read as filled or empty container for a bar to count
+    MIN_CONFIDENCE = 0.9
+
+    def __init__(self, gui_scale: int = 0):
+        """
+        gui_scale: Minecraft GUI scale in screen pixels per GUI pixel.
+                   0 = Auto (largest scale that still fits 320x240 GUI pixels).
+        """
+        self.gui_scale = gui_scale
+        self._layout_shape: Optional[Tuple[int, int]] = None
+        self._ys: Optional[np.ndarray] = None
+        self._xs: Optional[np.ndarray] = None
+        self.last_reading: Optional[Dict[str, float]] = None
+        self.last_confidence = 0.0
+
+    def _resolve_scale(self, width: int, height: int) -> int:
+        if self.gui_scale > 0:
+            return self.gui_scale
+        return max(1, min(width // 320, height // 240))
+
+    def _build_layout(self, width: int, height: int):
+        """Precompute the (y, x) gather indices for every sample of every icon."""
+        s = self._resolve_scale(width, height)
+        hotbar_left = (width - self.HOTBAR_WIDTH * s) // 2
+        hotbar_right = hotbar_left + self.HOTBAR_WIDTH * s
+        row_top = height - self.ICON_ROW_OFFSET * s
+
+        i = np.arange(self.ICON_COUNT)
+        # Hearts grow left -> right from the hotbar's left edge,
+        # drumsticks grow right -> left from the hotbar's right edge.
+        heart_x = hotbar_left + i * self.ICON_STEP * s
+        hunger_x = hotbar_right - (self.ICON_SIZE + i * self.ICON_STEP) * s
+        icon_x = np.stack([heart_x, hunger_x])  # (2 bars, 10 icons)
+
+        offsets = np.array([self.LEFT_SAMPLES, self.RIGHT_SAMPLES])  # (2 halves, K, 2)
+        # Sample at the center of each GUI pixel
+        off_x = offsets[..., 0] * s + s // 2
+        off_y = offsets[..., 1] * s + s // 2
+
+        xs = icon_x[:, :, None, None] + off_x[None, None, :, :]  # (2, 10, 2, K)
+        ys = row_top + np.broadcast_to(off_y[None, None, :, :], xs.shape)
+
+        outline = np.array(self.OUTLINE_SAMPLES)  # (2 halves, 2)
+        line_x = icon_x[:, :, None] + outline[None, None, :, 0] * s + s // 2  # (2, 10, 2)
+        line_y = row_top + np.broadcast_to(outline[None, None, :, 1] * s + s // 2, line_x.shape)
+
+        xs = np.concatenate([xs.ravel(), line_x.ravel()])
+        ys = np.concatenate([ys.ravel(), line_y.ravel()])
+        self._xs = np.clip(xs, 0, width - 1).astype(np.intp)
+        self._ys = np.clip(ys, 0, height - 1).astype(np.intp)
+        self._layout_shape = (height, width)
+
+    def read(self, frame: np.ndarray) -> Optional[Dict[str, float]]:
+        """
+        Returns {"health": 0..20, "hunger": 0..20}, or None if no bar is visible
+        (menus, creative mode, HUD hidden). Zero is a valid reading (death): presence is
+        decided by how many half-icons look like a bar (filled, or a dark empty container
+        with its black outline), not by the values.
+        """
+        if frame is None:
+            return None
+
+        h, w = frame.shape[:2]
+        if self._layout_shape != (h, w):
+            self._build_layout(w, h)
+
+        # Single fancy-indexing gather: (N, 3) BGR samples
+        k = len(self.LEFT_SAMPLES)
+        n = 2 * self.ICON_COUNT * 2 * k
+        gathered = frame[self._ys, self._xs, :3].astype(np.int16)
+        px, line = gathered[:n], gathered[n:].reshape(2, self.ICON_COUNT, 2, 3)
+        b, g, r = px[:, 0], px[:, 1], px[:, 2]
+
+        # Heart fill: saturated red
+        heart_fill = (r > 150) & (g < 90) & (b < 90)
+        # Drumstick fill: brown/orange meat (R > G > B)
+        hunger_fill = (r > 120) & (r > g + 20) & (g > b + 10) & (b < 110)
+
+        fill = np.where(
+            np.arange(n) < n // 2, heart_fill, hunger_fill
+        ).reshape(2, self.ICON_COUNT, 2, k)
+
+        # A half-icon counts as filled if the majority of its samples are
+        halves = fill.sum(axis=3) * 2 > k  # (2, 10, 2)
+        points = halves.sum(axis=(1, 2))
+
+        # Empty container: dark interior framed by a near-black outline that is darker still.
+        # Judged on the icon itself, so it holds on any background (a flat frame has no outline).
+        gray = px.sum(axis=1).reshape(2, self.ICON_COUNT, 2, k)
+        dark = (px.max(axis=1) < 90).reshape(gray.shape).all(axis=3)
+        line_gray = line.sum(axis=3)
+        outlined = (line.max(axis=3) < 40) & (line_gray + 30 < gray.min(axis=3))
+        empty = dark & outlined
+        # Presence is judged on the health bar (the hunger bar is replaced while riding)
+        self.last_confidence = float((halves[0] | empty[0]).mean())
+        if self.last_confidence < self.MIN_CONFIDENCE:
+            return None
+
+        health, hunger = float(points[0]), float(points[1])
+
+        self.last_reading = {"health": health, "hunger": hunger}
+        return self.last_reading
+
+if __name__ == "__main__":
+    # Test stub
+    reader = HudReader()
+    print(reader.read(np.zeros((720, 1280, 3), dtype=np.uint8)))
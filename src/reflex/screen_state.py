@@ -0,0 +1,155 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+# Screen states
+WORLD = "WORLD"          # Normal in-game view (the only state the bot acts in)
+PAUSE = "PAUSE"          # Pause/options menu over a dimmed world
+INVENTORY = "INVENTORY"  # Inventory / container / crafting panel
+CHAT = "CHAT"            # Chat input box open
+DEATH = "DEATH"          # Red-tinted death screen
+LOADING = "LOADING"      # Flat loading / splash screen (black or Mojang red)
+
+class ScreenStateClassifier:
+    """
+    Tells the in-world view apart from menus, chat, death and loading screens so the
+    expensive pipeline (YOLO, lava check) and all control can be skipped outside the world.
+
+    Like HudReader, every probe position is precomputed per frame size and a frame costs a
+    single fancy-indexing gather of ~750 pixels plus a few vectorized reductions (~0.15ms on
+    1280x720). Probes:
+      grid   - uniform 32x18 grid over the whole frame (brightness, tint, flatness)
+      panel  - 10x10 grid inside the centered 176x166 GUI-pixel container panel (#C6C6C6)
+      chat   - the row through the chat input box (bottom edge, full width minus the hotbar)
+               and the row just above it
+    Dim overlays (pause, death) are recognized relative to the last in-world frame, so a
+    dark cave or the Nether is not mistaken for a menu. A readable HUD with health > 0
+    overrides them (overlays hide the bars), which also recovers from a stale reference
+    (respawn at night, portal into the Nether). Vanilla (classic) UI layout; flat screens
+    are only treated as loading screens if they are black or Mojang red.
+    """
+    GRID = (32, 18)
+    PANEL_SIZE = (176, 166)   # Container panel in GUI pixels
+    PANEL_PROBES = 10
+    CHAT_PROBES = 48
+    HOTBAR_WIDTH = 182
+
+    def __init__(self, gui_scale: int = 0, confirm_frames: int = 2):
+        """
+        gui_scale: Minecraft GUI scale (0 = auto, same rule as HudReader).
+        confirm_frames: consecutive frames a new state must be seen before it is reported.
+        """
+        self.gui_scale = gui_scale
+        self.confirm_frames = confirm_frames
+        self._layout_shape: Optional[Tuple[int, int]] = None
+        self._ys: Optional[np.ndarray] = None
+        self._xs: Optional[np.ndarray] = None
+        self._splits: Tuple[int, int, int] = (0, 0, 0)
+        self._ref: Optional[np.ndarray] = None # Grid of the last in-world frame, (N, 3) int16
+
+        self.state = WORLD
+        self.changed = False
+        self._candidate = WORLD
+        self._candidate_frames = 0
+        self.last_features: Dict[str, float] = {}
+
+    @property
+    def in_world(self) -> bool:
+        return self.state == WORLD
+
+    def _build_layout(self, width: int, height: int):
+        s = self.gui_scale if self.gui_scale > 0 else max(1, min(width // 320, height // 240))
+        gw, gh = self.GRID
+        grid_x, grid_y = np.meshgrid((np.arange(gw) + 0.5) * width / gw, (np.arange(gh) + 0.5) * height / gh)
+
+        # Inner 60% of the container panel (skips slot borders near the edge)
+        pw, ph = self.PANEL_SIZE[0] * s * 0.6, self.PANEL_SIZE[1] * s * 0.6
+        p = (np.arange(self.PANEL_PROBES) + 0.5) / self.PANEL_PROBES - 0.5
+        panel_x, panel_y = np.meshgrid(width / 2 + p * pw, height / 2 + p * ph)
+
+        # Chat input box spans y = height-14..height-2 GUI px, x = 2..width-2.
+        # Columns over the hotbar are skipped (it has its own dark background).
+        cols = np.linspace(4 * s, width - 4 * s, self.CHAT_PROBES)
+        cols = cols[np.abs(cols - width / 2) > (self.HOTBAR_WIDTH / 2 + 4) * s]
+        chat_x = np.concatenate([cols, cols])
+        chat_y = np.concatenate([np.full(len(cols), height - 8 * s), np.full(len(cols), height - 18 * s)])
+
+        xs = np.concatenate([grid_x.ravel(), panel_x.ravel(), chat_x])
+        ys = np.concatenate([grid_y.ravel(), panel_y.ravel(), chat_y])
+        self._xs = np.clip(xs, 0, width - 1).astype(np.intp)
+        self._ys = np.clip(ys, 0, height - 1).astype(np.intp)
+        n_grid, n_panel = gw * gh, self.PANEL_PROBES ** 2
+        self._splits = (n_grid, n_grid + n_panel, n_grid + n_panel + len(cols))
+        self._layout_shape = (height, width)
+        self._ref = None
+
+    def classify(self, frame: np.ndarray, hud_alive: bool = False) -> str:
+        """
+        Raw (undebounced) state of one BGR frame.
+        hud_alive: HudReader found the bars with health > 0 (rules out pause/death overlays).
+        """
+        h, w = frame.shape[:2]
+        if self._layout_shape != (h, w):
+            self._build_layout(w, h)
+
+        px = frame[self._ys, self._xs, :3].astype(np.int16)
+        a, b, c = self._splits
+        grid, panel, chat, above = px[:a], px[a:b], px[b:c], px[c:]
+
+        gray = grid.sum(axis=1)
+        mean = grid.mean(axis=0) # B, G, R
+        flatness = float(gray.std()) / 3
+        brightness = float(mean.max())
+
+        # Container panel: light neutral gray (198,198,198)
+        pc = panel.max(axis=1) - panel.min(axis=1)
+        panel_frac = float(((pc < 12) & (np.abs(panel[:, 1] - 198) < 14)).mean())
+
+        # Chat box: ~50% black over the world, compared to the row right above it
+        chat_gray, above_gray = chat.sum(axis=1), above.sum(axis=1)
+        lit = above_gray > 90
+        chat_frac = float((chat_gray[lit] * 10 < above_gray[lit] * 7).mean()) if lit.sum() >= 8 else 0.0
+
+        # Dimming / red shift relative to the last world frame
+        dim_frac, red_shift = 0.0, 0.0
+        if self._ref is not None:
+            ref_gray = self._ref.sum(axis=1)
+            lit = ref_gray > 144
+            if lit.sum() >= 0.2 * len(ref_gray):
+                dim_frac = float((gray[lit] * 20 < ref_gray[lit] * 9).mean())
+            ref_mean = self._ref.mean(axis=0)
+            red_shift = float((mean[2] - mean[1]) - (ref_mean[2] - ref_mean[1]))
+
+        self.last_features = {"flatness": flatness, "brightness": brightness, "panel": panel_frac,
+                              "chat": chat_frac, "dim": dim_frac, "red_shift": red_shift}
+
+        if flatness < 6 and (brightness < 40 or (mean[2] > 180 and mean[1] < 90 and mean[0] < 100)):
+            self._ref = None # The next world may look nothing like the last one
+            return LOADING
+        if panel_frac > 0.4:
+            return INVENTORY
+        if not hud_alive and red_shift > 15 and mean[2] > 1.4 * mean[1] and mean[2] > 1.4 * mean[0] and mean[2] < 160:
+            return DEATH
+        if not hud_alive and dim_frac > 0.85:
+            return PAUSE
+        if chat_frac > 0.8:
+            return CHAT
+
+        self._ref = grid
+        return WORLD
+
+    def update(self, frame: np.ndarray, hud_alive: bool = False) -> str:
+        """Debounced state. `changed` is True on the frame the reported state switches."""
+        raw = self.classify(frame, hud_alive)
+        if raw == self._candidate:
+            self._candidate_frames += 1
+        else:
+            self._candidate, self._candidate_frames = raw, 1
+        self.changed = raw != self.state and self._candidate_frames >= self.confirm_frames
+        if self.changed:
+            self.state = raw
+        return self.state
+
+if __name__ == "__main__":
+    # Test stub
+    clf = ScreenStateClassifier()
+    print(clf.update(np.zeros((720, 1280, 3), dtype=np.uint8)))
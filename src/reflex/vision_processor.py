@@ -1,29 +1,33 @@
-import cv2
+import os
 import numpy as np
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 from src.reflex.yolo_detector import YoloDetector
+from src.reflex.hazards import LavaDetector
+from src.reflex.detection_cache import DetectionCache
 
 class VisionProcessor:
-    def __init__(self):
-        # Define Lava Color Range (HSV)
-        # Lava is generally bright orange/red -> yellow
-        # Note: OpenCV HSV ranges are H: 0-179, S: 0-255, V: 0-255
-        
-        # Lower bound for orange/red
-        # Lower bound (Tightened to exclude red blocks, focus on glowing orange)
-        self.lava_lower = np.array([5, 180, 180]) 
-        # Upper bound 
-        self.lava_upper = np.array([35, 255, 255])
-        
-        # Area threshold to trigger warning (percentage of ROI)
-        self.danger_threshold = 0.05 
+    def __init__(self, yolo: Optional[YoloDetector] = None):
+        """
+        yolo: Detector to use. None = load one; several processors (multi-instance mode)
+              can share one detector and feed it batches (see begin/finish).
+        """
+        # Lava (HSV color check)
+        self.lava = LavaDetector()
 
         # YOLO Detector
-        self.yolo = YoloDetector() # Will load detection model
+        self.yolo = yolo if yolo is not None else YoloDetector() # Will load detection model
         self.frame_count = 0
         # RTX 5090 can handle every frame. No skipping needed for 60FPS.
         self.skip_frames = 1 
+        # Lower confidence to catch stationary/partial objects
+        self.conf_threshold = 0.15
         self.last_detections = [] 
+        # Near-duplicate frames reuse the previous detections (DETECTION_CACHE=0 disables)
+        self.det_cache = None
+        if os.getenv("DETECTION_CACHE", "1") != "0":
+            self.det_cache = DetectionCache(max_distance=int(os.getenv("DETECTION_CACHE_BITS", "2")))
+        self._lava_result = (False, 0.0, None)
+        self._pending_key = None
         
         # Filter for Minecraft relevance (COCO classes)
         # 0: person (Player/Villager)
@@ -38,38 +42,46 @@ class VisionProcessor:
         if frame is None:
             return {"lava_detected": False, "danger_level": 0.0}
 
-        height, width, _ = frame.shape
-        
-        # 1. Underside / Footer ROI (Detecting lava at feet)
-        # Check bottom 40% of the screen
-        roi_h = int(height * 0.4)
-        roi_top = height - roi_h
-        roi = frame[roi_top:height, 0:width]
-        
-        # Convert to HSV
-        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
-        
-        # Threshold
-        mask = cv2.inRange(hsv, self.lava_lower, self.lava_upper)
-        
-        # Calculate coverage
-        pixel_count = cv2.countNonZero(mask)
-        total_pixels = roi_h * width
-        coverage = pixel_count / total_pixels
-        
-        lava_detected = coverage > self.danger_threshold
+        if self.begin(frame):
+            return self.finish(self.yolo.detect(frame, conf_threshold=self.conf_threshold))
+        return self.finish()
+
+    def begin(self, frame: np.ndarray) -> bool:
+        """
+        Cheap half of process_frame: lava check, frame skipping and the detection cache.
+        Returns True if the frame still needs a YOLO pass (run it, then call finish()).
+        """
+        # 1. Lava at feet
+        self._lava_result = self.lava.detect(frame)
         
         # 2. Object Detection (YOLO)
         self.frame_count += 1
-        if self.frame_count % self.skip_frames == 0:
-            # Lower confidence to catch stationary/partial objects
-            raw_detections = self.yolo.detect(frame, conf_threshold=0.15)
+        self._pending_key = None
+        if self.frame_count % self.skip_frames != 0:
+            return False
+        if self.det_cache:
+            key = self.det_cache.key(frame)
+            cached = self.det_cache.get(key, frame.shape)
+            if cached is not None:
+                self.last_detections = cached
+                return False
+            self._pending_key = (key, frame.shape)
+        return True
+
+    def finish(self, raw_detections: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Second half: take fresh detections (None = keep the last ones) and build the result."""
+        if raw_detections is not None:
             # Filter garbage (chairs, dining tables, etc.)
             self.last_detections = [
                 d for d in raw_detections 
                 if d['cls_id'] in self.allowed_classes
             ]
-            
+            if self._pending_key is not None:
+                key, shape = self._pending_key
+                self.det_cache.put(key, shape, self.last_detections)
+                self._pending_key = None
+
+        lava_detected, coverage, mask = self._lava_result
         return {
             "lava_detected": lava_detected,
             "danger_level": coverage,
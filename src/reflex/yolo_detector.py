@@ -20,48 +20,66 @@ class YoloDetector:
             print(f"[YOLO] Error loading model: {e}")
             self.model = None
 
-    def detect(self, frame: np.ndarray, conf_threshold: float = 0.5) -> List[Dict[str, Any]]:
-        """
-        Run inference on the frame.
-        Returns a list of detections: [{"box": [x1,y1,x2,y2], "conf": 0.9, "cls": "person", "label": "Steve"}]
-        """
-        if self.model is None:
-            return []
-
+    def _predict(self, source, conf_threshold: float):
         try:
-            results = self.model.predict(frame, conf=conf_threshold, verbose=False, device=self.device)
+            return self.model.predict(source, conf=conf_threshold, verbose=False, device=self.device)
         except RuntimeError as e:
             if "CUDA" in str(e) and self.device != 'cpu':
                 print(f"[YOLO] CUDA Error detected ({e}). Falling back to CPU for stability.")
                 self.device = 'cpu'
-                results = self.model.predict(frame, conf=conf_threshold, verbose=False, device='cpu')
+                return self.model.predict(source, conf=conf_threshold, verbose=False, device='cpu')
             else:
                 print(f"[YOLO] Critical Inference Error: {e}")
-                return []
+                return None
         except Exception as e:
             print(f"[YOLO] Unexpected Error: {e}")
-            return []
+            return None
 
+    def _parse(self, result) -> List[Dict[str, Any]]:
         detections = []
         
-        for r in results:
-            boxes = r.boxes
-            for box in boxes:
-                # Bounding Box
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                
-                # Confidence
-                conf = float(box.conf[0])
-                
-                # Class Name
-                cls_id = int(box.cls[0])
-                label = self.model.names[cls_id]
-                
-                detections.append({
-                    "box": [int(x1), int(y1), int(x2), int(y2)],
-                    "conf": conf,
-                    "cls_id": cls_id,
-                    "label": label
-                })
+        for box in result.boxes:
+            # Bounding Box
+            x1, y1, x2, y2 = box.xyxy[0].tolist()
+            
+            # Confidence
+            conf = float(box.conf[0])
+            
+            # Class Name
+            cls_id = int(box.cls[0])
+            label = self.model.names[cls_id]
+            
+            detections.append({
+                "box": [int(x1), int(y1), int(x2), int(y2)],
+                "conf": conf,
+                "cls_id": cls_id,
+                "label": label
+            })
         
         return detections
+
+    def detect(self, frame: np.ndarray, conf_threshold: float = 0.5) -> List[Dict[str, Any]]:
+        """
+        Run inference on the frame.
+        Returns a list of detections: [{"box": [x1,y1,x2,y2], "conf": 0.9, "cls": "person", "label": "Steve"}]
+        """
+        if self.model is None:
+            return []
+
+        results = self._predict(frame, conf_threshold)
+        if results is None:
+            return []
+        return [d for r in results for d in self._parse(r)]
+
+    def detect_batch(self, frames: List[np.ndarray], conf_threshold: float = 0.5) -> List[List[Dict[str, Any]]]:
+        """
+        One inference call for several frames (e.g. one per game instance).
+        Returns one detection list per frame, in order. Frames may differ in size.
+        """
+        if self.model is None or not frames:
+            return [[] for _ in frames]
+
+        results = self._predict(list(frames), conf_threshold)
+        if results is None:
+            return [[] for _ in frames]
+        return [self._parse(r) for r in results]
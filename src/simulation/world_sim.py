@@ -0,0 +1,253 @@
+import math
+import numpy as np
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils.gamepad_backends import GamepadBackend
+
+@dataclass
+class SimEntity:
+    """A mob or dropped item in the synthetic world (ground plane coordinates, meters)."""
+    x: float
+    z: float
+    label: str = "zombie"
+    cls_id: int = 0
+    health: float = 20.0
+    height: float = 1.9        # Meters (item ~0.3)
+    width: float = 0.6
+    speed: float = 0.0         # Approach speed toward the player (m/s)
+    pickup: bool = False       # Item: collected when the player walks over it
+
+class SimBackend(GamepadBackend):
+    """
+    Gamepad backend that feeds InputController reports into the simulator
+    through an input-latency queue.
+    """
+    name = "sim"
+
+    def __init__(self, world: "SimWorld"):
+        self.world = world
+        self.reports = 0
+
+    def send(self, report: tuple, prev: Optional[tuple]):
+        self.reports += 1
+        self.world.push_input(report)
+
+class SimWorld:
+    """
+    Lightweight closed-loop world for testing skills without Minecraft.
+
+    - Responds to InputController state (attach `world.backend`) with a turn-rate model
+      (deg/s at full stick) and a fixed input latency.
+    - `detections()` projects entities to YOLO-style boxes analytically (no rendering).
+    - `render()` draws a small synthetic camera view (sky, ground, lava patches, entity boxes)
+      for pixel-based code like LavaDetector.
+    Time is virtual, so thousands of steps per second run on a CPU-only box.
+    """
+    def __init__(self, width: int = 1280, height: int = 720, fov: float = 70.0,
+                 turn_rate: Tuple[float, float] = (180.0, 120.0),
+                 input_latency: float = 0.05, move_speed: float = 4.3,
+                 reach: float = 3.0, attack_cooldown: float = 0.6, damage: float = 4.0,
+                 seed: Optional[int] = None):
+        self.width, self.height = width, height
+        # Minecraft's FOV setting is vertical
+        self.vfov = fov
+        self._tan_v = math.tan(math.radians(fov / 2))
+        self._tan_h = self._tan_v * width / height
+        self.fov = math.degrees(2 * math.atan(self._tan_h))
+        self.turn_rate = turn_rate
+        self.input_latency = input_latency
+        self.move_speed = move_speed
+        self.reach = reach
+        self.attack_cooldown = attack_cooldown
+        self.damage = damage
+        self.pickup_radius = 1.5    # Player hitbox expanded by ~1 block
+        self.rng = np.random.default_rng(seed)
+        self.backend = SimBackend(self)
+        self._ground = None
+        self.reset()
+
+    # --- Setup ---
+
+    def reset(self):
+        self.time = 0.0
+        self.yaw = 0.0      # Degrees, 0 = +z
+        self.pitch = 0.0    # Degrees, + = up
+        self.px = 0.0
+        self.pz = 0.0
+        self.entities: List[SimEntity] = []
+        self.lava: List[Tuple[float, float, float]] = []  # (x, z, radius)
+        self._inputs = deque()  # (apply_time, report)
+        self.report = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0)
+        self._last_attack = -1e9
+        self.kills = 0
+        self.collected = 0
+        self.in_lava_time = 0.0
+
+    def clock(self) -> float:
+        """Virtual time source (pass to skills that need one)."""
+        return self.time
+
+    def spawn(self, entity: SimEntity):
+        self.entities.append(entity)
+
+    def spawn_relative(self, yaw_offset: float, distance: float, **kwargs) -> SimEntity:
+        """Spawn an entity at an angle (deg) and distance from the player's current view."""
+        a = math.radians(self.yaw + yaw_offset)
+        e = SimEntity(x=self.px + math.sin(a) * distance, z=self.pz + math.cos(a) * distance, **kwargs)
+        self.entities.append(e)
+        return e
+
+    def add_lava(self, forward: float, lateral: float = 0.0, radius: float = 1.5):
+        """Add a lava patch relative to the player's current position/heading."""
+        a = math.radians(self.yaw)
+        fx, fz = math.sin(a), math.cos(a)
+        x = self.px + fx * forward + fz * lateral
+        z = self.pz + fz * forward - fx * lateral
+        self.lava.append((x, z, radius))
+
+    # --- Input ---
+
+    def push_input(self, report: tuple):
+        self._inputs.append((self.time + self.input_latency, report))
+
+    # --- Simulation ---
+
+    def step(self, dt: float):
+        """Advance the world by dt seconds."""
+        self.time += dt
+        while self._inputs and self._inputs[0][0] <= self.time:
+            self.report = self._inputs.popleft()[1]
+        lx, ly, rx, ry, lt, rt, buttons = self.report
+
+        # View
+        self.yaw = (self.yaw + rx * self.turn_rate[0] * dt) % 360.0
+        self.pitch = max(-89.0, min(89.0, self.pitch + ry * self.turn_rate[1] * dt))
+
+        # Movement (left stick: y forward, x strafe right)
+        a = math.radians(self.yaw)
+        fx, fz = math.sin(a), math.cos(a)
+        step = self.move_speed * dt
+        self.px += (fx * ly + fz * lx) * step
+        self.pz += (fz * ly - fx * lx) * step
+
+        if self.standing_in_lava():
+            self.in_lava_time += dt
+
+        # Entities
+        for e in self.entities:
+            if e.speed > 0:
+                dx, dz = self.px - e.x, self.pz - e.z
+                d = math.hypot(dx, dz)
+                if d > 1.5:
+                    e.x += dx / d * e.speed * dt
+                    e.z += dz / d * e.speed * dt
+            if e.pickup and math.hypot(self.px - e.x, self.pz - e.z) < self.pickup_radius:
+                e.health = 0
+                self.collected += 1
+
+        # Attack (right trigger), with the vanilla-ish attack cooldown
+        if rt > 0.5 and self.time - self._last_attack >= self.attack_cooldown:
+            self._last_attack = self.time
+            target = self.entity_under_crosshair()
+            if target is not None:
+                target.health -= self.damage
+                if target.health <= 0:
+                    self.kills += 1
+
+        self.entities = [e for e in self.entities if e.health > 0]
+
+    # --- Geometry ---
+
+    def _relative(self, e: SimEntity) -> Tuple[float, float, float, float]:
+        """(yaw offset deg, pitch offset deg of center, distance, angular half-width deg)"""
+        dx, dz = e.x - self.px, e.z - self.pz
+        dist = max(0.1, math.hypot(dx, dz))
+        rel_yaw = (math.degrees(math.atan2(dx, dz)) - self.yaw + 180.0) % 360.0 - 180.0
+        # Eye height 1.62m, entity center at height/2
+        rel_pitch = math.degrees(math.atan2(e.height / 2 - 1.62, dist)) - self.pitch
+        half_w = math.degrees(math.atan2(e.width / 2, dist))
+        return rel_yaw, rel_pitch, dist, half_w
+
+    def entity_under_crosshair(self) -> Optional[SimEntity]:
+        best = None
+        for e in self.entities:
+            if e.pickup:
+                continue
+            rel_yaw, rel_pitch, dist, half_w = self._relative(e)
+            half_h = math.degrees(math.atan2(e.height / 2, dist))
+            if dist <= self.reach and abs(rel_yaw) <= half_w and abs(rel_pitch) <= half_h:
+                if best is None or dist < best[0]:
+                    best = (dist, e)
+        return best[1] if best else None
+
+    def standing_in_lava(self) -> bool:
+        return any(math.hypot(self.px - x, self.pz - z) < r for x, z, r in self.lava)
+
+    def lava_ahead(self, distance: float = 2.0) -> bool:
+        """Ground truth: lava within `distance` meters straight ahead."""
+        a = math.radians(self.yaw)
+        for k in np.linspace(0.0, distance, 5):
+            x, z = self.px + math.sin(a) * k, self.pz + math.cos(a) * k
+            if any(math.hypot(x - lx, z - lz) < r for lx, lz, r in self.lava):
+                return True
+        return False
+
+    # --- Perception ---
+
+    def detections(self) -> List[Dict[str, Any]]:
+        """Project entities to YOLO-style detections on a width x height screen."""
+        w, h = self.width, self.height
+        dets = []
+        for e in self.entities:
+            rel_yaw, rel_pitch, dist, half_w = self._relative(e)
+            if abs(rel_yaw) > self.fov / 2 + half_w or abs(rel_yaw) >= 89.0:
+                continue
+            half_h = math.degrees(math.atan2(e.height / 2, dist))
+            # Perspective projection of the entity's angular extent
+            x1 = w / 2 * (1 + math.tan(math.radians(rel_yaw - half_w)) / self._tan_h)
+            x2 = w / 2 * (1 + math.tan(math.radians(rel_yaw + half_w)) / self._tan_h)
+            y1 = h / 2 * (1 - math.tan(math.radians(max(-89.0, min(89.0, rel_pitch + half_h)))) / self._tan_v)
+            y2 = h / 2 * (1 - math.tan(math.radians(max(-89.0, min(89.0, rel_pitch - half_h)))) / self._tan_v)
+            x1, y1 = max(0, int(x1)), max(0, int(y1))
+            x2, y2 = min(w - 1, int(x2)), min(h - 1, int(y2))
+            if x2 <= x1 or y2 <= y1:
+                continue
+            dets.append({"box": [x1, y1, x2, y2], "conf": 0.9, "cls_id": e.cls_id, "label": e.label})
+        return dets
+
+    def _ground_grid(self):
+        """Per-pixel (forward, lateral) ground offsets for the bottom half of the view (pitch 0)."""
+        if self._ground is None:
+            h, w = self.height, self.width
+            rows = np.arange(h // 2 + 1, h)
+            # Ray slope below the horizon for each row -> ground distance from eye height
+            slope = (rows - h / 2) / (h / 2) * self._tan_v
+            forward = 1.62 / slope
+            cols = (np.arange(w) - w / 2) / (w / 2) * self._tan_h
+            self._ground = (rows, forward[:, None], forward[:, None] * cols[None, :])
+        return self._ground
+
+    def render(self) -> np.ndarray:
+        """BGR frame: sky, grass, lava patches (orange, inside LavaDetector's HSV range), entity boxes."""
+        h, w = self.height, self.width
+        frame = np.empty((h, w, 3), dtype=np.uint8)
+        frame[: h // 2] = (235, 206, 135)   # Sky
+        frame[h // 2:] = (60, 140, 70)      # Grass
+
+        if self.lava:
+            rows, fwd, lat = self._ground_grid()
+            a = math.radians(self.yaw)
+            fx, fz = math.sin(a), math.cos(a)
+            gx = self.px + fwd * fx + lat * fz
+            gz = self.pz + fwd * fz - lat * fx
+            mask = np.zeros(gx.shape, dtype=bool)
+            for x, z, r in self.lava:
+                mask |= (gx - x) ** 2 + (gz - z) ** 2 < r * r
+            band = frame[rows[0]:rows[-1] + 1]
+            band[mask] = (0, 120, 255)      # Glowing orange
+
+        for d in self.detections():
+            x1, y1, x2, y2 = d["box"]
+            frame[y1:y2, x1:x2] = (40, 110, 40) if d["label"] == "zombie" else (200, 200, 200)
+        return frame
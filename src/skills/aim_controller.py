@@ -0,0 +1,160 @@
+import os
+import json
+import time
+from collections import deque
+from typing import Optional, Tuple
+import numpy as np
+
+# (abs path, mtime) -> parsed gains file
+_gains_cache = {}
+
+class PIDAxis:
+    """
+    Single-axis PID with a low-pass filtered derivative and anti-windup
+    (clamped integral + conditional integration while saturated).
+    """
+    def __init__(self, kp: float, ki: float, kd: float, d_tau: float = 0.05,
+                 out_limit: float = 1.0, i_limit: float = 0.3):
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.d_tau = d_tau          # Derivative filter time constant (s)
+        self.out_limit = out_limit
+        self.i_limit = i_limit      # Max contribution of the integral term
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self.d_filtered = 0.0
+        self.prev_error: Optional[float] = None
+
+    def update(self, error: float, dt: float) -> float:
+        if dt <= 0:
+            dt = 1e-3
+
+        # Derivative on error, first-order low-pass (kills YOLO box jitter)
+        if self.prev_error is not None:
+            raw_d = (error - self.prev_error) / dt
+            a = dt / (self.d_tau + dt)
+            self.d_filtered += a * (raw_d - self.d_filtered)
+        self.prev_error = error
+
+        p = self.kp * error
+        d = self.kd * self.d_filtered
+        out = p + self.ki * self.integral + d
+
+        # Conditional integration: don't wind up while pushing into saturation
+        saturated = abs(out) >= self.out_limit and (out > 0) == (error > 0)
+        if not saturated and self.ki > 0:
+            self.integral += error * dt
+            lim = self.i_limit / self.ki
+            self.integral = max(-lim, min(lim, self.integral))
+            out = p + self.ki * self.integral + d
+
+        return max(-self.out_limit, min(self.out_limit, out))
+
+class AimController:
+    """
+    Two-axis PID aimer with latency compensation.
+
+    The box we aim at is from a frame captured `now - frame_time` seconds ago, and the view has
+    kept turning since then with the look commands we already issued. We subtract that predicted
+    crosshair travel (turn_rate * integral of issued output over the frame age) from the measured
+    error before running the PID, which removes most of the overshoot at low frame rates.
+
+    Errors are in screen pixels (target - crosshair). Outputs are stick commands in "screen" sign
+    (positive = move crosshair toward +x / +y on screen); the caller maps them to stick axes.
+    """
+    def __init__(self, kp: float = 0.002, ki: float = 0.0005, kd: float = 0.0002,
+                 turn_rate: Tuple[float, float] = (1500.0, 1500.0),
+                 log_path: Optional[str] = None):
+        """
+        turn_rate: Crosshair speed in screen pixels/s at full stick deflection (x, y).
+        log_path:  If set, every update is logged and saved there (.npz) for tools/tune_aim.py.
+        """
+        self.x = PIDAxis(kp, ki, kd)
+        self.y = PIDAxis(kp, ki, kd)
+        self.turn_rate = turn_rate
+        # (time, out_x, out_y) of issued commands, for latency compensation
+        self._history = deque(maxlen=64)
+        self._last_frame_time: Optional[float] = None
+
+        self.log_path = log_path
+        self._log = [] if log_path else None
+
+    def load_gains(self, path: str) -> bool:
+        """
+        Load gains written by tools/tune_aim.py. Returns False if the file doesn't exist.
+        The file is parsed once per modification (shared by every CombatSkills instance).
+        """
+        if not os.path.exists(path):
+            return False
+        key = (os.path.abspath(path), os.path.getmtime(path))
+        g = _gains_cache.get(key)
+        if g is None:
+            with open(path, "r") as f:
+                g = json.load(f)
+            _gains_cache[key] = g
+            print(f"[Aim] Loaded gains from {path}: kp={g.get('kp')} ki={g.get('ki')} kd={g.get('kd')}")
+        for axis in (self.x, self.y):
+            axis.kp = g.get("kp", axis.kp)
+            axis.ki = g.get("ki", axis.ki)
+            axis.kd = g.get("kd", axis.kd)
+        if "turn_rate" in g:
+            self.turn_rate = tuple(g["turn_rate"])
+        return True
+
+    def reset(self):
+        """Call on target loss/switch so the integral doesn't carry over."""
+        self.x.reset()
+        self.y.reset()
+        self._last_frame_time = None
+
+    def _issued_travel(self, since: float, now: float) -> Tuple[float, float]:
+        """Integral of issued output over [since, now] (stick-seconds), piecewise constant."""
+        tx = ty = 0.0
+        seg_end = now
+        for t, ox, oy in reversed(self._history):
+            start = max(t, since)
+            if start < seg_end:
+                tx += ox * (seg_end - start)
+                ty += oy * (seg_end - start)
+            seg_end = t
+            if t <= since:
+                break
+        return tx, ty
+
+    def update(self, err_x: float, err_y: float, frame_time: Optional[float] = None,
+               now: Optional[float] = None) -> Tuple[float, float]:
+        if now is None:
+            now = time.perf_counter()
+        if frame_time is None:
+            frame_time = now
+
+        # Latency compensation
+        ix, iy = self._issued_travel(frame_time, now)
+        comp_x = err_x - self.turn_rate[0] * ix
+        comp_y = err_y - self.turn_rate[1] * iy
+
+        # PID timestep = time between the measurements (frames), not between calls
+        dt = frame_time - self._last_frame_time if self._last_frame_time is not None else 1.0 / 60.0
+        self._last_frame_time = frame_time
+
+        out_x = self.x.update(comp_x, dt)
+        out_y = self.y.update(comp_y, dt)
+        self._history.append((now, out_x, out_y))
+
+        if self._log is not None:
+            self._log.append((now, frame_time, err_x, err_y, out_x, out_y))
+        return out_x, out_y
+
+    def issue_idle(self, now: Optional[float] = None):
+        """Record that the look stick was released (no target)."""
+        self._history.append((time.perf_counter() if now is None else now, 0.0, 0.0))
+
+    def save_log(self):
+        """Write the aim log (columns: t, frame_time, err_x, err_y, out_x, out_y)."""
+        if not self._log:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+        np.savez_compressed(self.log_path, samples=np.array(self._log, dtype=np.float64),
+                            turn_rate=np.array(self.turn_rate))
+        print(f"[Aim] Saved {len(self._log)} samples to {self.log_path}")
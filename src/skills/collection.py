@@ -7,6 +7,14 @@ class CollectionSkills:
     def __init__(self, controller: InputController):
         self.controller = controller
         self.kp_steer = 0.003
+        # An item near the bottom edge is still ~2.5m away and drops out of view before it is
+        # picked up, so keep walking straight for commit_time after last seeing it there
+        self.bottom_margin = 50
+        self.commit_time = 0.6
+        self._commit_until = 0.0
+        self._moving = False
+        # Time source (the simulator swaps in its own clock)
+        self.clock = time.perf_counter
         self.item_labels = ["backpack", "suitcase", "handbag", "tie", "bottle", "cup", "bowl", "orange", "apple"] 
         # YOLOv8n COCO labels that *might* misidentify as Minecraft items.
         # In reality, without custom training, this is a best-effort sketch.
@@ -24,10 +32,11 @@ class CollectionSkills:
         if target:
             # Steer
             self._move_to_target(target, screen_size)
-        else:
-            # Stop moving if no item
-            # self.controller.set_move(0, 0) # Use with caution, might interrupt other layers
-            pass
+        elif self._moving and self.clock() >= self._commit_until:
+            # Item picked up (or lost): only release the inputs we set ourselves
+            self.controller.set_move(0.0, 0.0)
+            self.controller.set_look(0.0, 0.0)
+            self._moving = False
 
     def _find_closest_item(self, detections: List[Dict[str, Any]], screen_size: Tuple[int, int]) -> Dict[str, Any]:
         w, h = screen_size
@@ -75,11 +84,13 @@ class CollectionSkills:
         steer = max(-1.0, min(1.0, steer))
         
         # Move Forward (Fixed speed)
-        # Stop if very close (bottom of screen)
-        # y2 is bottom of box. if y2 > h - margin, we are close.
-        if y2 > h - 50:
-            self.controller.set_move(0.0, 0.0) # Stop
-            # Maybe look down?
+        # y2 is bottom of box. if y2 > h - margin, the item is about to leave the view:
+        # walk straight over it instead of stopping short.
+        self._moving = True
+        if y2 > h - self.bottom_margin:
+            self._commit_until = self.clock() + self.commit_time
+            self.controller.set_move(0.0, 1.0)
+            self.controller.set_look(0.0, 0.0)
         else:
             self.controller.set_move(0.0, 1.0) # Forward
             self.controller.set_look(steer, 0.0) # Steer
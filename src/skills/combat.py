@@ -1,76 +1,94 @@
+import os
 import time
-import math
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 from src.utils.input_controller import InputController
+from src.skills.aim_controller import AimController
+from src.skills.targeting import ThreatModel
+from src.utils.metrics_store import MetricsStore
 
 class CombatSkills:
-    def __init__(self, controller: InputController):
+    def __init__(self, controller: InputController, metrics: Optional[MetricsStore] = None,
+                 aim_log_path: Optional[str] = None):
+        """aim_log_path: where to save the aim log (default $AIM_LOG_PATH, empty = off)."""
         self.controller = controller
-        # PID Constants for Aiming
-        self.kp_x = 0.002 # Sensitivity X
-        self.kp_y = 0.002 # Sensitivity Y
+        self.metrics = metrics
+        self._engaged_at: Optional[float] = None # When the current fight started
+        self._attacked = False
+        # PID Aiming (latency compensated). Gains from tools/tune_aim.py if present.
+        self.aim = AimController(log_path=aim_log_path or os.getenv("AIM_LOG_PATH") or None)
+        self.aim.load_gains(os.getenv("AIM_GAINS_PATH", "aim_gains.json"))
+        self._aim_target_id: Optional[int] = None # ThreatModel track the PID state belongs to
+        # Time source matching frame_time (the simulator swaps in its own clock)
+        self.clock = time.perf_counter
         self.attack_range_pixels = 50 # If within this center distance, attack
+        self.has_target = False
         
-        # Allowed Targets (Whitelist)
+        # Allowed Targets (Whitelist) with threat weights
         # In a real scenario, use specific mob names.
         # For testing with YOLOv8n (COCO), use "person", "bear", "bird", etc.
-        self.allowed_targets = ["person", "zombie", "skeleton", "creeper", "spider"]
+        self.threat = ThreatModel({
+            "creeper": 3.0,
+            "zombie": 2.0,
+            "skeleton": 2.0,
+            "spider": 2.0,
+            "person": 1.0,
+        })
 
-    def update(self, detections: List[Dict[str, Any]], screen_size: Tuple[int, int]):
+    def update(self, detections: List[Dict[str, Any]], screen_size: Tuple[int, int], frame_time: Optional[float] = None):
         """
         Main loop for combat. Finds best target and executes aim/attack.
         Should be called every frame if Combat Mode is active.
+        frame_time: time.perf_counter() when the frame was captured (for latency compensation).
         """
-        target = self._find_best_target(detections, screen_size)
+        target = self._find_best_target(detections, screen_size, frame_time)
+        self._track_engagement(target is not None)
+        self.has_target = target is not None
         
-        if target:
-            # Aim
-            self._aim_at_target(target, screen_size)
-            
-            # Attack if aimed
-            if self._is_aimed_at(target, screen_size):
-                self.controller.set_attack(True)
+        # Batch look + trigger into one report per frame
+        with self.controller.transaction():
+            if target:
+                if self.threat.target_id != self._aim_target_id:
+                    # Target switch: don't carry A's integral/derivative over to B
+                    self.aim.reset()
+                    self._aim_target_id = self.threat.target_id
+                # Aim
+                self._aim_at_target(target, screen_size, frame_time)
+                
+                # Attack if aimed
+                if self._is_aimed_at(target, screen_size):
+                    self.controller.set_attack(True)
+                    self._attacked = True
+                else:
+                    self.controller.set_attack(False) # Stop attacking if lost aim? Or keep spamming?
+                    # Usually spamming is fine in Bedrock PVE
             else:
-                self.controller.set_attack(False) # Stop attacking if lost aim? Or keep spamming?
-                # Usually spamming is fine in Bedrock PVE
-        else:
-            # No target, relax inputs
-            self.controller.set_look(0.0, 0.0)
-            self.controller.set_attack(False)
+                # No target, relax inputs
+                self.aim.reset()
+                self._aim_target_id = None
+                self.aim.issue_idle(self.clock())
+                self.controller.set_look(0.0, 0.0)
+                self.controller.set_attack(False)
+
+    def _track_engagement(self, has_target: bool):
+        """Time-to-kill: targets gone after we hit them count as kills (approximate)."""
+        now = self.clock()
+        if has_target and self._engaged_at is None:
+            self._engaged_at = now
+            self._attacked = False
+        elif not has_target and self._engaged_at is not None:
+            if self.metrics and self._attacked:
+                self.metrics.event("combat_kill", now - self._engaged_at)
+            self._engaged_at = None
 
-    def _find_best_target(self, detections: List[Dict[str, Any]], screen_size: Tuple[int, int]) -> Dict[str, Any]:
+    def _find_best_target(self, detections: List[Dict[str, Any]], screen_size: Tuple[int, int], frame_time: Optional[float] = None) -> Dict[str, Any]:
         """
-        Select the most threatening or closest target.
-        For now: Select the target closest to the crosshair.
+        Select the most threatening target (class weight, size/distance, approach speed,
+        crosshair distance), preferring the current one.
         """
-        if not detections:
-            return None
-            
-        w, h = screen_size
-        cx, cy = w / 2, h / 2
-        
-        best_target = None
-        min_dist = float('inf')
-        
-        for det in detections:
-            # Filter by label
-            label = det.get("label", "").lower()
-            if label not in self.allowed_targets: 
-                continue
-                
-            x1, y1, x2, y2 = det["box"]
-            tx, ty = (x1 + x2) / 2, (y1 + y2) / 2
-            
-            # Distance to crosshair
-            dist = math.hypot(tx - cx, ty - cy)
-            
-            if dist < min_dist:
-                min_dist = dist
-                best_target = det
-        
-        return best_target
+        now = frame_time if frame_time is not None else self.clock()
+        return self.threat.select(detections, screen_size, now)
 
-    def _aim_at_target(self, target: Dict[str, Any], screen_size: Tuple[int, int]):
+    def _aim_at_target(self, target: Dict[str, Any], screen_size: Tuple[int, int], frame_time: Optional[float] = None):
         """
         Calculate stick inputs to move crosshair to target center.
         """
@@ -83,22 +101,11 @@ class CombatSkills:
         dx = tx - cx
         dy = ty - cy
         
-        # Simple P-Control
-        # Output should be -1.0 to 1.0
-        look_x = dx * self.kp_x
-        look_y = dy * self.kp_y # Inverted? XInput RightStick Y Up is usually positive, but screen Y down is positive.
-        # Screen Y increases downwards.
-        # Stick Y: Up (negative look up? or positive?)
-        # Typically: Stick Y+ -> Look Up (View trace goes up, pixels move down)
-        # Wait, if I want to look at a pixel BELOW current center (dy > 0), I need to pitch DOWN.
-        # Pitch Down usually corresponds to Stick Y- (or Y+ depending on config).
-        # Let's assume standard: Y- is Down, Y+ is Up.
+        # PID (output -1.0 to 1.0, in screen direction)
+        look_x, look_y = self.aim.update(dx, dy, frame_time, self.clock())
+        # Screen Y increases downwards, Stick Y+ looks up.
         # If target is below (dy > 0), we want Y- (Down). So inverse.
-        
-        out_x = max(-1.0, min(1.0, look_x))
-        out_y = max(-1.0, min(1.0, -look_y)) 
-        
-        self.controller.set_look(out_x, out_y)
+        self.controller.set_look(look_x, -look_y)
 
     def _is_aimed_at(self, target: Dict[str, Any], screen_size: Tuple[int, int]) -> bool:
         """Check if crosshair is within target box."""
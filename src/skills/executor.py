@@ -0,0 +1,119 @@
+import time
+import heapq
+import threading
+import itertools
+from collections import deque
+from typing import Callable, Generator, List, Optional
+
+class SkillTask:
+    """Handle for a skill coroutine running on the SkillExecutor."""
+    def __init__(self, gen: Generator, name: str, executor: "SkillExecutor"):
+        self.gen = gen
+        self.name = name
+        self._executor = executor
+        self.wake_at = 0.0
+        self.cancelled = False
+        self.done = False
+        self.error: Optional[Exception] = None
+
+    def cancel(self):
+        """Request cancellation. The skill's finally-blocks run on the next tick."""
+        self.cancelled = True
+        self._executor._cancel_requested = True
+
+    def __repr__(self):
+        state = "done" if self.done else ("cancelled" if self.cancelled else "pending")
+        return f"<SkillTask {self.name} {state}>"
+
+class SkillExecutor:
+    """
+    Cooperative, non-blocking executor for timed skills.
+
+    Skills are generators that `yield` the number of seconds to wait (or None for "next tick")
+    instead of calling time.sleep. The main loop calls tick() once per frame; only tasks whose
+    wake time has passed are resumed, so perception never blocks and any number of timed
+    actions can be in flight at once:
+
+        def click(controller):
+            controller.set_attack(True)
+            try:
+                yield 0.1
+            finally:
+                controller.set_attack(False)
+
+        executor.submit(click(controller), "click")
+    """
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._heap: List[tuple] = []  # (wake_at, seq, task)
+        self._seq = itertools.count()
+        # Submissions from other threads land here and are merged on tick()
+        self._incoming = deque()
+        self._lock = threading.Lock()
+        self._cancel_requested = False
+        self.active_tasks = 0
+
+    def submit(self, gen: Generator, name: str = "skill") -> SkillTask:
+        """Schedule a skill generator. Thread-safe; it first runs on the next tick."""
+        task = SkillTask(gen, name, self)
+        with self._lock:
+            self._incoming.append(task)
+        return task
+
+    def cancel_all(self):
+        with self._lock:
+            for task in self._incoming:
+                task.cancel()
+        for _, _, task in self._heap:
+            task.cancel()
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Resume every task that is due. Returns the number of tasks resumed."""
+        if now is None:
+            now = self.clock()
+
+        if self._incoming:
+            with self._lock:
+                while self._incoming:
+                    task = self._incoming.popleft()
+                    task.wake_at = now
+                    heapq.heappush(self._heap, (now, next(self._seq), task))
+
+        if self._cancel_requested:
+            # Close cancelled tasks now instead of at their (possibly far) wake time
+            self._cancel_requested = False
+            for task in [t for _, _, t in self._heap if t.cancelled]:
+                self._step(task, now)
+            self._heap = [e for e in self._heap if not e[2].done]
+            heapq.heapify(self._heap)
+
+        resumed = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, _, task = heapq.heappop(self._heap)
+            resumed += 1
+            self._step(task, now)
+
+        self.active_tasks = len(self._heap)
+        return resumed
+
+    def _step(self, task: SkillTask, now: float):
+        if task.cancelled:
+            # Raises GeneratorExit inside the skill so its finally-blocks release inputs
+            task.gen.close()
+            task.done = True
+            return
+
+        try:
+            delay = next(task.gen)
+        except StopIteration:
+            task.done = True
+            return
+        except Exception as e:
+            print(f"[Executor] Skill '{task.name}' failed: {e}")
+            task.error = e
+            task.done = True
+            return
+
+        task.wake_at = now + (delay or 0.0)
+        # A zero/None delay still waits for the *next* tick, never spins in this one
+        heapq.heappush(self._heap, (task.wake_at if delay else now + 1e-9, next(self._seq), task))
@@ -1,18 +1,23 @@
 import time
-import cv2
 import numpy as np
-import math
+from typing import Optional
 from src.utils.input_controller import InputController
+from src.skills.executor import SkillExecutor
+from src.skills.fishing_perception import FishingPerception
+from src.utils.metrics_store import MetricsStore
 
 class FishingSkills:
-    def __init__(self, controller: InputController):
+    def __init__(self, controller: InputController, executor: SkillExecutor, metrics: Optional[MetricsStore] = None):
         self.controller = controller
+        self.executor = executor
+        self.metrics = metrics
+        self._bitten = False # Current REELING was triggered by a bite (not a timeout)
+        self._task = None # In-flight timed action (cast click / reel sequence)
         self.state = "IDLE" # IDLE, CASTING, WAITING, REELING
         self.last_state_change = time.time()
-        self.roi_size = 100 # Center 100x100
-        self.prev_gray_roi = None
-        self.motion_threshold = 5.0 # Sensitivity
+        self.perception = FishingPerception() # Tracked bobber + adaptive splash detection
         self.splash_cooldown = 2.0 # Wait 2s before accepting splash (to ignore cast splash)
+        self.timeouts = 0 # Casts reeled in without a bite
         
     def update(self, frame: np.ndarray):
         """
@@ -26,75 +31,90 @@ class FishingSkills:
              pass
 
         elif self.state == "CASTING":
+            if self._busy(): return
             print("[Fishing] Casting Rod")
-            self.controller.gamepad.right_trigger_float(value_float=1.0) # Using API directly or via set_attack logic?
-            # set_attack is duration based in primitive skills usually.
-            # Here we just 'click'
-            self.controller.set_attack(True)
-            time.sleep(0.1) # Quick click
-            self.controller.set_attack(False)
+            # Here we just 'click' (goes through set_attack so the diffed report stays in sync)
+            self._task = self.executor.submit(self._click(), "fishing_cast")
+            if self.metrics:
+                self.metrics.event("fishing_cast")
             
             self.state = "WAITING"
             self.last_state_change = current_time
-            self.prev_gray_roi = None
+            self.perception.reset()
 
         elif self.state == "WAITING":
             # 1. Timeout Check
             if current_time - self.last_state_change > 45.0:
                 print("[Fishing] Timeout - Reeling in")
+                self.timeouts += 1
+                self._bitten = False
+                if self.metrics:
+                    self.metrics.event("fishing_timeout")
                 self.state = "REELING"
                 return
 
-            # 2. Motion Detection (Splash)
-            h, w, _ = frame.shape
-            cx, cy = w // 2, h // 2
-            half = self.roi_size // 2
-            # ROI: Center of screen slightly down? deeply dependent on look angle.
-            # Let's verify center for now.
-            top, bottom = cy - half, cy + half
-            left, right = cx - half, cx + half
-            
-            roi = frame[top:bottom, left:right]
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            # Blur to reduce noise
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
-            
-            if self.prev_gray_roi is None:
-                self.prev_gray_roi = gray
-                return
-                
-            # Calc delta
-            frame_delta = cv2.absdiff(self.prev_gray_roi, gray)
-            thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
-            motion_score = np.sum(thresh) / 255.0 # Number of changed pixels
-            
-            # Update prev
-            self.prev_gray_roi = gray
+            # 2. Bite detection on the tracked bobber
+            bite, reason = self.perception.update(frame)
             
             # Ignore initial splash from casting (first 2 seconds)
             if current_time - self.last_state_change < self.splash_cooldown:
                 return
 
-            # If motion > threshold -> SPLASH
-            if motion_score > self.motion_threshold:
-                print(f"[Fishing] Splash Detected! (Score: {motion_score})")
+            if bite:
+                print(f"[Fishing] Bite Detected! ({reason}, score {self.perception.score:.0f} / threshold {self.perception.threshold:.1f})")
+                self._bitten = True
+                if self.metrics:
+                    self.metrics.event("fishing_bite", current_time - self.last_state_change, reason=reason)
                 self.state = "REELING"
 
         elif self.state == "REELING":
+            if self._busy(): return
             print("[Fishing] Reeling in!")
-            self.controller.set_attack(True)
-            time.sleep(0.1)
+            self._task = self.executor.submit(self._reel_and_recast(), "fishing_reel")
+            if self.metrics:
+                self.metrics.event("fishing_reel", caught=self._bitten)
+
+    def _busy(self) -> bool:
+        return self._task is not None and not self._task.done
+
+    def _click(self):
+        """Quick right-trigger click (runs on the executor)."""
+        self.controller.set_attack(True)
+        try:
+            yield 0.1
+        finally:
             self.controller.set_attack(False)
-            
-            # Wait for reel anim
-            time.sleep(0.5)
-            self.state = "CASTING" # Loop forever?
-            print("[Fishing] Recasting in 1s...")
-            time.sleep(1.0)
-            self.last_state_change = time.time()
+
+    def _reel_and_recast(self):
+        yield from self._click()
+        
+        # Wait for reel anim
+        yield 0.5
+        print("[Fishing] Recasting in 1s...")
+        yield 1.0
+        self.state = "CASTING" # Loop forever?
+        self.last_state_change = time.time()
 
     def start_fishing(self):
         self.state = "CASTING"
 
+    def suspend(self):
+        """
+        Lost the controller to a higher-priority layer: drop the in-flight action and
+        restart the cycle when the lease comes back (reel in first if the line is out).
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.state == "WAITING":
+            self._bitten = False
+            self.state = "REELING"
+        elif self.state != "IDLE":
+            self.state = "CASTING"
+        self.last_state_change = time.time()
+
     def stop_fishing(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
         self.state = "IDLE"
@@ -0,0 +1,144 @@
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+class FishingPerception:
+    """
+    Bite detection around the tracked bobber.
+
+    1. Bobber: red float found by a strided color match, first in a wide search area in the
+       middle of the screen, then in a small window around its last position. Only compact
+       blobs up to `max_bobber_size` px count, so lava or orange UI in the window is ignored.
+    2. Splash: small grayscale ROI on the bobber, downscaled by striding. A fixed-point
+       (x256) running-average background is updated with integer shifts and differenced
+       with integer abs, so per frame there is no blur and no float image math.
+    3. Threshold: the motion score is compared against its own running mean/deviation while
+       waiting, so rain, waves or a busy scene raise the bar automatically.
+    A bite is a splash above threshold, a sudden dip of the bobber, or the bobber vanishing
+    after it had settled.
+    """
+    def __init__(self, roi_size: int = 64, downscale: int = 2, search_radius: int = 80,
+                 alpha_shift: int = 3, pixel_threshold: int = 20, k_sigma: float = 4.0,
+                 min_pixels: float = 4.0, dip_pixels: int = 8, warmup_frames: int = 10,
+                 max_bobber_size: int = 40):
+        self.roi_size = roi_size
+        self.max_bobber_size = max_bobber_size  # Largest bobber blob extent on screen (px)
+        self.downscale = downscale
+        self.search_radius = search_radius  # Tracking window half-size (px)
+        self.alpha_shift = alpha_shift      # Background learning rate = 1 / 2**alpha_shift
+        self.pixel_threshold = pixel_threshold
+        self.k_sigma = k_sigma
+        self.min_pixels = min_pixels
+        self.dip_pixels = dip_pixels
+        self.warmup_frames = warmup_frames
+        self.reset()
+
+    def reset(self):
+        """Call on every cast."""
+        self.bobber: Optional[Tuple[int, int]] = None
+        self._bobber_y_avg: Optional[float] = None
+        self._settled_frames = 0
+        self._lost_frames = 0
+        self._roi_origin: Optional[Tuple[int, int]] = None
+        self._bg: Optional[np.ndarray] = None   # int32, background * 256
+        self._frames = 0
+        self._noise_mean = 0.0
+        self._noise_dev = 1.0
+        self.score = 0.0
+
+    @property
+    def threshold(self) -> float:
+        return self._noise_mean + self.k_sigma * self._noise_dev + self.min_pixels
+
+    def _find_bobber(self, frame: np.ndarray, x0: int, y0: int, x1: int, y1: int, stride: int) -> Optional[Tuple[int, int]]:
+        """
+        Centroid of the bobber-sized red blob (BGR) in the window closest to the last bobber
+        (or the window center), sampled every `stride` px.
+        """
+        patch = frame[y0:y1:stride, x0:x1:stride]
+        if patch.size == 0:
+            return None
+        b = patch[..., 0].astype(np.int16)
+        g = patch[..., 1].astype(np.int16)
+        r = patch[..., 2].astype(np.int16)
+        mask = (r > 140) & (r - g > 70) & (r - b > 70)
+        if np.count_nonzero(mask) < 2:
+            return None
+
+        # Blobs on the small sampled mask: lava pools / UI are far larger than the float
+        n, _, stats, centroids = cv2.connectedComponentsWithStats(mask.view(np.uint8), connectivity=8)
+        size = np.maximum(stats[1:, cv2.CC_STAT_WIDTH], stats[1:, cv2.CC_STAT_HEIGHT]) * stride
+        ok = np.flatnonzero((stats[1:, cv2.CC_STAT_AREA] >= 2) & (size <= self.max_bobber_size)) + 1
+        if len(ok) == 0:
+            return None
+        ref_x, ref_y = self.bobber if self.bobber is not None else ((x0 + x1) // 2, (y0 + y1) // 2)
+        pts = centroids[ok] * stride + (x0, y0)
+        best = int(np.argmin(np.hypot(pts[:, 0] - ref_x, pts[:, 1] - ref_y)))
+        return int(pts[best, 0]), int(pts[best, 1])
+
+    def _locate(self, frame: np.ndarray) -> Tuple[int, int]:
+        h, w = frame.shape[:2]
+        if self.bobber is not None:
+            bx, by = self.bobber
+            r = self.search_radius
+            found = self._find_bobber(frame, max(0, bx - r), max(0, by - r), min(w, bx + r), min(h, by + r), 2)
+        else:
+            # Wide search: central half of the screen, coarse stride
+            found = self._find_bobber(frame, w // 4, h // 4, 3 * w // 4, 7 * h // 8, 4)
+
+        if found is None:
+            self._lost_frames += 1
+            return self.bobber or (w // 2, h // 2) # Legacy fallback: screen center
+        self._lost_frames = 0
+        self.bobber = found
+        return found
+
+    def update(self, frame: np.ndarray) -> Tuple[bool, str]:
+        """Returns (bite, reason). Cheap: a few small integer array ops per frame."""
+        h, w = frame.shape[:2]
+        had_bobber = self.bobber is not None
+        cx, cy = self._locate(frame)
+
+        # Bobber dip / disappearance (only once it has settled on the water)
+        if had_bobber:
+            if self._lost_frames >= 3 and self._settled_frames > self.warmup_frames:
+                return True, "bobber lost"
+            if self._lost_frames == 0:
+                avg = self._bobber_y_avg
+                settled = self._settled_frames > self.warmup_frames
+                self._bobber_y_avg = cy if avg is None else 0.8 * avg + 0.2 * cy
+                if avg is not None and abs(cy - avg) <= 2:
+                    self._settled_frames += 1
+                elif avg is not None and cy - avg > self.dip_pixels and settled:
+                    return True, "bobber dip"
+                else:
+                    self._settled_frames = 0 # Still flying / drifting
+
+        # Splash ROI (re-seed the background when the ROI moves noticeably)
+        half = self.roi_size // 2
+        x0 = min(max(0, cx - half), max(0, w - self.roi_size))
+        y0 = min(max(0, cy - half), max(0, h - self.roi_size))
+        if self._roi_origin is None or abs(x0 - self._roi_origin[0]) > half // 2 or abs(y0 - self._roi_origin[1]) > half // 2:
+            self._roi_origin = (x0, y0)
+            self._bg = None
+        x0, y0 = self._roi_origin
+        roi = frame[y0:y0 + self.roi_size, x0:x0 + self.roi_size]
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)[::self.downscale, ::self.downscale].astype(np.int32)
+
+        if self._bg is None or self._bg.shape != gray.shape:
+            self._bg = gray << 8
+            self._frames = 0
+            return False, ""
+
+        diff = np.abs(gray - (self._bg >> 8))
+        self._bg += ((gray << 8) - self._bg) >> self.alpha_shift
+        self.score = float(np.count_nonzero(diff > self.pixel_threshold))
+        self._frames += 1
+
+        if self._frames > self.warmup_frames and self.score > self.threshold:
+            return True, "splash"
+
+        # Learn the scene noise (EMA of score and absolute deviation)
+        self._noise_dev += 0.05 * (abs(self.score - self._noise_mean) - self._noise_dev)
+        self._noise_mean += 0.05 * (self.score - self._noise_mean)
+        return False, ""
@@ -0,0 +1,181 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Callable, FrozenSet, Iterable, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class PlanStep:
+    """One validated, typed plan step (compiled once by SkillRegistry.compile_plan)."""
+    name: str
+    func: Callable
+    args: Tuple[float, ...]
+    timeout: float          # Hard deadline for this step (seconds)
+    has_duration: bool      # First arg is a duration (can resume with the remainder)
+    resources: FrozenSet[str] # Controller resources the step drives
+    text: str               # Original step text (for logs)
+
+class PlanRuntime:
+    """
+    Runs compiled plans on a private asyncio loop (daemon thread).
+
+    Each step is a skill generator driven by `await asyncio.sleep(...)` inside a task,
+    so it can be cancelled at any yield point. Cancellation closes the generator and the
+    skill's finally-block releases its inputs.
+
+    All public methods are thread-safe and take effect on the next loop iteration
+    (well within one vision tick):
+        submit()  - replace the current plan
+        append()  - add steps to the running plan (streaming planners)
+        preempt() - drop the plan entirely
+        pause()   - stop the current step, keep it (and the rest) for resume()
+        resume()  - continue; duration steps only run for their remaining time
+
+    pause(taken=...) names resources another layer already drives; the cancelled step's
+    finally-block must not release them (skills check may_release()).
+    Pausing is owned by the ActionArbitrator: a paused runtime stays paused across submit().
+    """
+    def __init__(self):
+        self._queue = deque()
+        self._current: Optional[PlanStep] = None
+        self._current_task: Optional[asyncio.Task] = None
+        self._step_started = 0.0
+        self._taken: FrozenSet[str] = frozenset() # Resources the cancelled step must not release
+        self.paused = False
+        self.steps_done = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._wake: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+        self._ready.wait()
+
+    # --- Thread-safe API ---
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None or bool(self._queue)
+
+    @property
+    def resources(self) -> FrozenSet[str]:
+        """Resources of the running step (or the one a resume would start next)."""
+        step = self._current
+        if step is None:
+            try:
+                step = self._queue[0]
+            except IndexError:
+                return frozenset()
+        return step.resources
+
+    @property
+    def current_step(self) -> Optional[str]:
+        return self._current.text if self._current else None
+
+    def submit(self, steps: List[PlanStep]):
+        self._call(self._submit, list(steps))
+
+    def append(self, step: PlanStep):
+        self._call(self._append, step)
+
+    def preempt(self):
+        self._call(self._preempt)
+
+    def pause(self, taken: Iterable[str] = ()):
+        self._call(self._pause, frozenset(taken))
+
+    def resume(self):
+        self._call(self._resume)
+
+    def close(self):
+        self._call(self._preempt)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _call(self, fn, *args):
+        self._loop.call_soon_threadsafe(fn, *args)
+
+    def may_release(self, resource: str) -> bool:
+        """For skill finally-blocks (loop thread): False if another layer took `resource`."""
+        return resource not in self._taken
+
+    # --- Loop thread ---
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._wake = asyncio.Event()
+        self._loop.create_task(self._runner())
+        self._ready.set()
+        self._loop.run_forever()
+
+    def _submit(self, steps: List[PlanStep]):
+        self._preempt()
+        self._queue.extend(steps)
+        self._wake.set()
+
+    def _append(self, step: PlanStep):
+        self._queue.append(step)
+        self._wake.set()
+
+    def _preempt(self):
+        self._queue.clear()
+        if self._current_task and not self._current_task.done():
+            self._current_task.cancel()
+
+    def _pause(self, taken: FrozenSet[str] = frozenset()):
+        if self.paused: return
+        self.paused = True
+        if self._current_task and not self._current_task.done():
+            self._taken = taken
+            step = self._current
+            if step.has_duration:
+                # Put back only what is left of the step
+                remaining = max(0.0, step.args[0] - (time.monotonic() - self._step_started))
+                step = replace(step, args=(remaining,) + step.args[1:])
+            self._queue.appendleft(step)
+            self._current_task.cancel()
+        if self.busy:
+            print("[Plan] Paused")
+
+    def _resume(self):
+        if not self.paused: return
+        self.paused = False
+        if self._queue:
+            print("[Plan] Resumed")
+        self._wake.set()
+
+    async def _runner(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+
+            while self._queue and not self.paused:
+                step = self._queue.popleft()
+                self._current = step
+                self._step_started = time.monotonic()
+                self._current_task = asyncio.ensure_future(self._run_step(step))
+                try:
+                    await self._current_task
+                    self.steps_done += 1
+                except asyncio.CancelledError:
+                    pass # Preempted or paused (pause already re-queued the step)
+                except asyncio.TimeoutError:
+                    print(f"[Plan] Step '{step.text}' exceeded its {step.timeout:.1f}s deadline")
+                except Exception as e:
+                    print(f"Error executing skill '{step.text}': {e}")
+                finally:
+                    self._current = None
+                    self._current_task = None
+                    self._taken = frozenset()
+
+    async def _run_step(self, step: PlanStep):
+        await asyncio.wait_for(self._drive(step), timeout=step.timeout)
+
+    async def _drive(self, step: PlanStep):
+        gen = step.func(*step.args)
+        try:
+            for delay in gen:
+                await asyncio.sleep(delay or 0)
+        finally:
+            # Cancelled mid-step: runs the skill's finally-block (releases inputs)
+            gen.close()
@@ -1,45 +1,69 @@
-import time
+from typing import Callable, Optional
 from src.utils.input_controller import InputController
+from src.core.arbitrator import MOVEMENT, LOOK, TRIGGERS
 
 class PrimitiveSkills:
-    def __init__(self, controller: InputController):
+    """
+    Basic timed actions.
+    Every skill is a generator that yields how long to wait (seconds) instead of sleeping,
+    so it runs on the SkillExecutor without blocking the main loop.
+    Inputs are released in `finally`, so cancelling a skill never leaves a stick held,
+    unless `may_release` says another layer already took that resource (PlanRuntime pause).
+    """
+    def __init__(self, controller: InputController, may_release: Optional[Callable[[str], bool]] = None):
         self.controller = controller
+        self.may_release = may_release or (lambda resource: True)
 
     def move_forward(self, duration: float = 1.0):
         print(f"[Skill] Moving Forward for {duration}s")
         self.controller.set_move(0.0, 1.0)
-        time.sleep(duration)
-        self.controller.set_move(0.0, 0.0)
+        try:
+            yield duration
+        finally:
+            if self.may_release(MOVEMENT):
+                self.controller.set_move(0.0, 0.0)
 
     def move_backward(self, duration: float = 1.0):
         print(f"[Skill] Moving Backward for {duration}s")
         self.controller.set_move(0.0, -1.0)
-        time.sleep(duration)
-        self.controller.set_move(0.0, 0.0)
+        try:
+            yield duration
+        finally:
+            if self.may_release(MOVEMENT):
+                self.controller.set_move(0.0, 0.0)
         
     def jump(self):
         print("[Skill] Jumping")
         self.controller.set_jump(True)
-        time.sleep(0.1)
-        self.controller.set_jump(False)
+        try:
+            yield 0.1
+        finally:
+            if self.may_release(MOVEMENT):
+                self.controller.set_jump(False)
 
     def attack(self, duration: float = 1.0):
         print(f"[Skill] Attacking for {duration}s")
         self.controller.set_attack(True)
-        time.sleep(duration)
-        self.controller.set_attack(False)
+        try:
+            yield duration
+        finally:
+            if self.may_release(TRIGGERS):
+                self.controller.set_attack(False)
 
     def look_around(self):
         print("[Skill] Looking Around")
         # Scan: Right -> Left -> Center
-        self.controller.set_look(0.5, 0.0)
-        time.sleep(0.5)
-        self.controller.set_look(-1.0, 0.0)
-        time.sleep(0.5)
-        self.controller.set_look(0.5, 0.0)
-        time.sleep(0.5)
-        self.controller.set_look(0.0, 0.0)
+        try:
+            self.controller.set_look(0.5, 0.0)
+            yield 0.5
+            self.controller.set_look(-1.0, 0.0)
+            yield 0.5
+            self.controller.set_look(0.5, 0.0)
+            yield 0.5
+        finally:
+            if self.may_release(LOOK):
+                self.controller.set_look(0.0, 0.0)
 
     def wait(self, duration: float = 1.0):
         print(f"[Skill] Waiting for {duration}s")
-        time.sleep(duration)
+        yield duration
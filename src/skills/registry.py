@@ -1,39 +1,107 @@
-from typing import Callable, Dict, List, Any
+import inspect
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Any, Optional
+from src.core.arbitrator import MOVEMENT, LOOK, TRIGGERS, ALL_RESOURCES
 from src.skills.primitives import PrimitiveSkills
+from src.skills.plan_runtime import PlanRuntime, PlanStep
+
+@dataclass(frozen=True)
+class SkillSpec:
+    func: Callable
+    min_args: int
+    max_args: int
+    has_duration: bool
+    timeout: Optional[float]  # Fixed deadline, or None = derived from the duration arg
+    resources: FrozenSet[str] # Controller resources the skill drives (PLAN lease while it runs)
 
 class SkillRegistry:
-    def __init__(self, primitives: PrimitiveSkills):
+    # Slack added to duration-based deadlines, and deadline for steps without one
+    DEADLINE_SLACK = 2.0
+    DEFAULT_TIMEOUT = 10.0
+
+    def __init__(self, primitives: PrimitiveSkills, runtime: PlanRuntime):
         self.primitives = primitives
-        self.skills: Dict[str, Callable] = {}
+        self.runtime = runtime
+        self.skills: Dict[str, SkillSpec] = {}
         self._register_defaults()
 
     def _register_defaults(self):
-        self.register_skill("MOVE_FORWARD", self.primitives.move_forward)
-        self.register_skill("MOVE_BACKWARD", self.primitives.move_backward)
-        self.register_skill("JUMP", self.primitives.jump)
-        self.register_skill("ATTACK", self.primitives.attack)
-        self.register_skill("LOOK_AROUND", self.primitives.look_around)
-        self.register_skill("WAIT", self.primitives.wait)
+        self.register_skill("MOVE_FORWARD", self.primitives.move_forward, resources={MOVEMENT})
+        self.register_skill("MOVE_BACKWARD", self.primitives.move_backward, resources={MOVEMENT})
+        self.register_skill("JUMP", self.primitives.jump, resources={MOVEMENT})
+        self.register_skill("ATTACK", self.primitives.attack, resources={TRIGGERS})
+        self.register_skill("LOOK_AROUND", self.primitives.look_around, resources={LOOK})
+        self.register_skill("WAIT", self.primitives.wait, resources=())
 
-    def register_skill(self, name: str, func: Callable):
-        self.skills[name.upper()] = func
+    def register_skill(self, name: str, func: Callable, timeout: Optional[float] = None,
+                       resources: Iterable[str] = ALL_RESOURCES):
+        """
+        Register a generator skill. Arity (all args are floats) is taken from the signature
+        once here, so plans are validated at compile time instead of on every call.
+        resources: what the skill drives; the plan only pauses when a higher layer needs one of them.
+        """
+        params = list(inspect.signature(func).parameters.values())
+        required = [p for p in params if p.default is inspect.Parameter.empty]
+        self.skills[name.upper()] = SkillSpec(
+            func=func,
+            min_args=len(required),
+            max_args=len(params),
+            has_duration=bool(params) and params[0].name == "duration",
+            timeout=timeout,
+            resources=frozenset(resources),
+        )
 
-    def execute_plan(self, plan: List[str]):
+    def compile_plan(self, plan: List[str]) -> List[PlanStep]:
         """
-        Execute a list of action strings.
+        Parse and validate a list of action strings into typed steps.
         Format: "ACTION_NAME" or "ACTION_NAME arg1"
+        Raises ValueError listing every invalid step.
+        """
+        steps, errors = [], []
+        for text in plan:
+            try:
+                steps.append(self.compile_step(text))
+            except ValueError as e:
+                errors.append(str(e))
+        if errors:
+            raise ValueError("; ".join(errors))
+        return steps
+
+    def compile_step(self, text: str) -> PlanStep:
+        parts = str(text).split()
+        if not parts:
+            raise ValueError("Empty step")
+        cmd = parts[0].upper()
+        spec = self.skills.get(cmd)
+        if spec is None:
+            raise ValueError(f"Unknown skill: {cmd}")
+        if not spec.min_args <= len(parts) - 1 <= spec.max_args:
+            raise ValueError(f"'{text}': expected {spec.min_args}-{spec.max_args} args")
+        try:
+            args = tuple(float(a) for a in parts[1:])
+        except ValueError:
+            raise ValueError(f"'{text}': arguments must be numbers")
+
+        if spec.has_duration and not args:
+            # Resolve the default so a paused step can be re-queued with only its remainder
+            args = (float(inspect.signature(spec.func).parameters["duration"].default),)
+
+        timeout = spec.timeout
+        if timeout is None:
+            timeout = args[0] + self.DEADLINE_SLACK if spec.has_duration else self.DEFAULT_TIMEOUT
+
+        return PlanStep(name=cmd, func=spec.func, args=args, timeout=timeout,
+                        has_duration=spec.has_duration, resources=spec.resources, text=str(text))
+
+    def execute_plan(self, plan: List[str]) -> bool:
+        """
+        Compile the plan and hand it to the runtime (non-blocking, replaces any running plan).
+        Returns False if the plan is invalid.
         """
-        for step in plan:
-            parts = step.split()
-            cmd = parts[0].upper()
-            args = parts[1:]
-            
-            if cmd in self.skills:
-                try:
-                    # Basic argument parsing (all floats for now)
-                    parsed_args = [float(a) for a in args]
-                    self.skills[cmd](*parsed_args)
-                except Exception as e:
-                    print(f"Error executing skill '{step}': {e}")
-            else:
-                print(f"Unknown skill: {cmd}")
+        try:
+            steps = self.compile_plan(plan)
+        except ValueError as e:
+            print(f"[Plan] Rejected: {e}")
+            return False
+        self.runtime.submit(steps)
+        return True
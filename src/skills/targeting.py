@@ -0,0 +1,116 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+class ThreatModel:
+    """
+    Vectorized target selection.
+
+    All candidates are scored at once with NumPy:
+        score = class_weight * (1 + w_area * closeness + w_approach * approach) - w_center * crosshair_dist
+    closeness:      sqrt of box area / screen area (bigger box = closer mob)
+    approach:       relative box-area growth per second vs. the previous frame (mob walking at us)
+    crosshair_dist: distance of the box center to the screen center, normalized to the half-diagonal
+    The current target gets a `hysteresis` bonus so we don't flip between similar targets.
+    `target_id` changes whenever the selected box is not the previous target (IoU-matched).
+
+    Labels are mapped to class ids once; per frame only an int lookup table is used.
+    """
+    def __init__(self, class_weights: Dict[str, float], w_area: float = 2.0, w_approach: float = 0.5,
+                 w_center: float = 1.0, hysteresis: float = 0.3, max_classes: int = 1024):
+        self.class_weights = {k.lower(): v for k, v in class_weights.items()}
+        self.w_area = w_area
+        self.w_approach = w_approach
+        self.w_center = w_center
+        self.hysteresis = hysteresis
+
+        # cls_id -> weight (0 = not a target). Filled lazily the first time an id is seen.
+        self._lut = np.zeros(max_classes, dtype=np.float32)
+        self._known = np.zeros(max_classes, dtype=bool)
+
+        # Previous frame (for approach velocity and hysteresis)
+        self._prev_boxes: Optional[np.ndarray] = None
+        self._prev_time: Optional[float] = None
+        self._target_box: Optional[np.ndarray] = None
+        self.target_id = 0 # Track id of the current target (bumped on every switch)
+
+    def _resolve_classes(self, cls_ids: np.ndarray, detections: List[Dict[str, Any]]):
+        """Fill the lookup table for class ids we haven't seen yet (string compare once per id)."""
+        unknown = ~self._known[cls_ids]
+        if not unknown.any():
+            return
+        for i in np.flatnonzero(unknown):
+            cid = cls_ids[i]
+            if not self._known[cid]:
+                label = detections[i].get("label", "").lower()
+                self._lut[cid] = self.class_weights.get(label, 0.0)
+                self._known[cid] = True
+
+    def reset(self):
+        self._prev_boxes = None
+        self._prev_time = None
+        self._target_box = None
+
+    def select(self, detections: List[Dict[str, Any]], screen_size: Tuple[int, int],
+               now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        if not detections:
+            self.reset()
+            return None
+
+        n = len(detections)
+        boxes = np.array([d["box"] for d in detections], dtype=np.float32).reshape(n, 4)
+        cls_ids = np.fromiter((d.get("cls_id", 0) for d in detections), dtype=np.intp, count=n)
+        cls_ids = np.clip(cls_ids, 0, len(self._lut) - 1)
+        self._resolve_classes(cls_ids, detections)
+
+        weights = self._lut[cls_ids]
+        valid = weights > 0
+        if not valid.any():
+            self.reset()
+            return None
+
+        w, h = screen_size
+        bw = boxes[:, 2] - boxes[:, 0]
+        bh = boxes[:, 3] - boxes[:, 1]
+        area = np.maximum(bw * bh, 1.0)
+        closeness = np.sqrt(area / float(w * h))
+
+        centers = np.stack([(boxes[:, 0] + boxes[:, 2]) * 0.5, (boxes[:, 1] + boxes[:, 3]) * 0.5], axis=1)
+        half_diag = 0.5 * float(np.hypot(w, h))
+        center_dist = np.hypot(centers[:, 0] - w * 0.5, centers[:, 1] - h * 0.5) / half_diag
+
+        # Approach velocity: match each box to the nearest previous box, area growth per second
+        approach = np.zeros(n, dtype=np.float32)
+        if self._prev_boxes is not None and len(self._prev_boxes) and now is not None and self._prev_time is not None:
+            dt = now - self._prev_time
+            if dt > 1e-3:
+                prev = self._prev_boxes
+                prev_c = np.stack([(prev[:, 0] + prev[:, 2]) * 0.5, (prev[:, 1] + prev[:, 3]) * 0.5], axis=1)
+                d = np.linalg.norm(centers[:, None, :] - prev_c[None, :, :], axis=2)  # (N, M)
+                j = d.argmin(axis=1)
+                matched = d[np.arange(n), j] < 0.1 * half_diag
+                prev_area = np.maximum((prev[j, 2] - prev[j, 0]) * (prev[j, 3] - prev[j, 1]), 1.0)
+                growth = (area / prev_area - 1.0) / dt
+                approach = np.where(matched, np.clip(growth, -1.0, 1.0), 0.0)
+
+        score = weights * (1.0 + self.w_area * closeness + self.w_approach * approach) - self.w_center * center_dist
+
+        # Hysteresis: keep the current target unless something is clearly better
+        iou = np.zeros(n, dtype=np.float32)
+        if self._target_box is not None:
+            tb = self._target_box
+            ix = np.clip(np.minimum(boxes[:, 2], tb[2]) - np.maximum(boxes[:, 0], tb[0]), 0, None)
+            iy = np.clip(np.minimum(boxes[:, 3], tb[3]) - np.maximum(boxes[:, 1], tb[1]), 0, None)
+            inter = ix * iy
+            t_area = max((tb[2] - tb[0]) * (tb[3] - tb[1]), 1.0)
+            iou = inter / (area + t_area - inter)
+            score = score + np.where(iou > 0.3, self.hysteresis, 0.0)
+
+        score = np.where(valid, score, -np.inf)
+        best = int(score.argmax())
+        if iou[best] <= 0.3:
+            self.target_id += 1 # New target (or first one after a loss)
+
+        self._prev_boxes = boxes
+        self._prev_time = now
+        self._target_box = boxes[best]
+        return detections[best]
@@ -0,0 +1,235 @@
+import os
+import json
+import time
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from src.utils.session_recorder import list_chunks, read_chunk
+
+def fit_width(img: np.ndarray, max_width: int = 1280) -> np.ndarray:
+    """
+    Smallest integer-stride downscale that fits `max_width` (plain slicing, no interpolation),
+    returned C-contiguous: OpenCV rejects the strided views slicing creates.
+    """
+    w = img.shape[1]
+    if w > max_width:
+        step = -(-w // max_width)
+        img = img[::step, ::step]
+    return np.ascontiguousarray(img)
+
+class ReplayCapture:
+    """
+    Plays back a SessionRecorder session through the ScreenCapture interface
+    (start / capture_frame / last_frame_time / capture_rate / close), so the agent loop,
+    multi-instance mode and tools can run on recorded gameplay instead of a game window.
+
+    realtime=True returns the frame due at the current wall-clock offset (frames repeat or
+    are skipped like a live capture); realtime=False returns every frame once, as fast as
+    it is asked for. Chunks are opened lazily and raw chunks stay memory-mapped.
+    """
+    def __init__(self, session_dir: str, loop: bool = True, realtime: bool = True):
+        self.session_dir = session_dir
+        self.loop = loop
+        self.realtime = realtime
+        self.chunks: List[int] = []
+        self._starts: List[float] = [] # Recording time of each chunk's first frame
+        for chunk in list_chunks(session_dir):
+            with open(os.path.join(session_dir, f"chunk_{chunk:05d}.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["frames"]:
+                self.chunks.append(chunk)
+                self._starts.append(meta["t0"])
+        if not self.chunks:
+            raise FileNotFoundError(f"No recorded frames in {session_dir}")
+        self.running = False
+        self.finished = False
+
+        self._chunk_pos = -1
+        self._data = None
+        self._i = -1
+        self._t0_wall = 0.0
+
+        self.capture_count = 0
+        self.capture_rate = 0.0
+        self.last_capture_time = time.time()
+        self.last_frame_time = 0.0
+        self.last_recorded_time = 0.0 # Recording clock of the latest frame
+
+    def _open(self, pos: int):
+        self._chunk_pos = pos
+        self._data = read_chunk(self.session_dir, self.chunks[pos])
+        self._i = -1
+
+    def _rewind(self):
+        self._open(0)
+        self._t0_wall = time.perf_counter()
+
+    def start(self):
+        if self.running: return
+        self.running = True
+        self._rewind()
+        print(f"[Replay] Playing {self.session_dir} ({len(self.chunks)} chunks)")
+
+    def stop(self):
+        self.running = False
+
+    def find_target_window(self) -> bool:
+        return True # Nothing to track
+
+    def request_retrack(self):
+        pass
+
+    def _next(self) -> bool:
+        """Step to the next recorded frame. False at the end of a non-looping session."""
+        self._i += 1
+        if self._i < len(self._data["t"]):
+            return True
+        if self._chunk_pos + 1 < len(self.chunks):
+            self._open(self._chunk_pos + 1)
+        elif self.loop:
+            self._rewind()
+        else:
+            self.finished = True
+            return False
+        self._i = 0
+        return True
+
+    def _seek(self) -> bool:
+        """Jump to the latest frame due at the current wall-clock offset."""
+        due = self._starts[0] + (time.perf_counter() - self._t0_wall)
+        t = self._data["t"]
+        if self._chunk_pos == len(self.chunks) - 1 and self._i == len(t) - 1 and due > t[-1] + 0.1:
+            if not self.loop:
+                self.finished = True
+                return False
+            self._rewind()
+            due = self._starts[0]
+        while self._chunk_pos + 1 < len(self.chunks) and self._starts[self._chunk_pos + 1] <= due:
+            self._open(self._chunk_pos + 1)
+        t = self._data["t"]
+        self._i = max(self._i, int(np.searchsorted(t, due, side="right")) - 1, 0)
+        return True
+
+    def capture_frame(self) -> Optional[np.ndarray]:
+        if not self.running or self.finished:
+            return None
+        if not (self._seek() if self.realtime else self._next()):
+            return None
+
+        self.last_recorded_time = float(self._data["t"][self._i])
+        self.last_frame_time = time.perf_counter()
+        frame = np.ascontiguousarray(self._data["frame"](self._i))
+
+        # FPS Tracking
+        self.capture_count += 1
+        now = time.time()
+        if now - self.last_capture_time >= 1.0:
+            self.capture_rate = self.capture_count / (now - self.last_capture_time)
+            self.capture_count = 0
+            self.last_capture_time = now
+        return frame
+
+    def close(self):
+        self.stop()
+
+class VideoFileCapture:
+    """A video file (or any cv2.VideoCapture URL) behind the ScreenCapture interface."""
+    def __init__(self, path: str, loop: bool = True, realtime: bool = True):
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.video = cv2.VideoCapture(path)
+        if not self.video.isOpened():
+            raise FileNotFoundError(f"Cannot open video {path}")
+        self.fps = self.video.get(cv2.CAP_PROP_FPS) or 30.0
+        self.running = False
+        self.finished = False
+        self._frame: Optional[np.ndarray] = None
+        self._index = 0
+        self._t0_wall = 0.0
+
+        self.capture_count = 0
+        self.capture_rate = 0.0
+        self.last_capture_time = time.time()
+        self.last_frame_time = 0.0
+
+    def start(self):
+        if self.running: return
+        self.running = True
+        self._t0_wall = time.perf_counter()
+        print(f"[Video] Playing {self.path} ({self.fps:.0f} fps)")
+
+    def stop(self):
+        self.running = False
+
+    def find_target_window(self) -> bool:
+        return True
+
+    def request_retrack(self):
+        pass
+
+    def _read(self) -> bool:
+        ok, frame = self.video.read()
+        if not ok and self.loop:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._index = 0
+            self._t0_wall = time.perf_counter()
+            ok, frame = self.video.read()
+        if not ok:
+            self.finished = True
+            return False
+        self._frame = frame
+        self._index += 1
+        return True
+
+    def capture_frame(self) -> Optional[np.ndarray]:
+        if not self.running or self.finished:
+            return None
+        if self.realtime:
+            due = int((time.perf_counter() - self._t0_wall) * self.fps) + 1
+            if self._frame is None and not self._read():
+                return None
+            while self._index < due:
+                if not self._read():
+                    break
+        elif not self._read():
+            return None
+        self.last_frame_time = time.perf_counter()
+
+        self.capture_count += 1
+        now = time.time()
+        if now - self.last_capture_time >= 1.0:
+            self.capture_rate = self.capture_count / (now - self.last_capture_time)
+            self.capture_count = 0
+            self.last_capture_time = now
+        return self._frame
+
+    def close(self):
+        self.stop()
+        self.video.release()
+
+def open_source(spec: str):
+    """
+    Frame source from a spec string:
+        window:Minecraft       first window whose title contains "Minecraft"
+        window:Minecraft#1     second such window (left to right)
+        session:<dir>          SessionRecorder session (looped, real time)
+        video:<path>           video file / stream URL (looped, real time)
+    A bare value is treated as a window title.
+    """
+    kind, _, value = spec.partition(":")
+    if not value:
+        kind, value = "window", spec
+    kind = kind.strip().lower()
+    if kind == "session":
+        return ReplayCapture(value)
+    if kind == "video":
+        return VideoFileCapture(value)
+    if kind == "window":
+        from src.utils.screen_capture import ScreenCapture # dxcam/pygetwindow (Windows only)
+        title, _, index = value.partition("#")
+        return ScreenCapture(window_title=title, window_index=int(index or 0),
+                             track_interval=float(os.getenv("WINDOW_TRACK_INTERVAL", "0.5")))
+    raise ValueError(f"Unknown frame source '{spec}' (expected window:, session: or video:)")
@@ -0,0 +1,210 @@
+try:
+    import vgamepad as vg
+    _VGAMEPAD_AVAILABLE = True
+except ImportError:
+    _VGAMEPAD_AVAILABLE = False
+
+import os
+import struct
+import time
+import numpy as np
+from typing import Dict, Optional
+
+# A report is the full controller state as a flat tuple:
+# (left_x, left_y, right_x, right_y, left_trigger, right_trigger, buttons_bitmask)
+REPORT_FIELDS = ("left_x", "left_y", "right_x", "right_y", "left_trigger", "right_trigger", "buttons")
+
+# Logical button -> bit in the report bitmask
+BUTTON_BITS = {
+    "JUMP": 0x0001,
+}
+
+class GamepadBackend:
+    """Output sink for InputController reports."""
+    name = "base"
+
+    def send(self, report: tuple, prev: Optional[tuple]):
+        """Push a report. `prev` is the last successfully sent report (None = unknown, send everything)."""
+        raise NotImplementedError
+
+    def reset(self):
+        """Release everything on the device."""
+        self.send((0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0), None)
+
+    def close(self):
+        pass
+
+class NullBackend(GamepadBackend):
+    """Discards reports (headless runs, Linux). Still counts them for rate measurements."""
+    name = "null"
+
+    def __init__(self):
+        self.reports = 0
+        self.last_report = None
+
+    def send(self, report: tuple, prev: Optional[tuple]):
+        self.reports += 1
+        self.last_report = report
+
+class VGamepadBackend(GamepadBackend):
+    """Virtual Xbox 360 controller via ViGEmBus (Windows)."""
+    name = "vgamepad"
+
+    def __init__(self):
+        if not _VGAMEPAD_AVAILABLE:
+            raise RuntimeError("'vgamepad' not installed")
+        self.gamepad = vg.VX360Gamepad()
+        self._button_map = {
+            BUTTON_BITS["JUMP"]: vg.XUSB_BUTTON.XUSB_GAMEPAD_A,
+        }
+
+    def send(self, report: tuple, prev: Optional[tuple]):
+        lx, ly, rx, ry, lt, rt, buttons = report
+
+        # Apply Joystick States
+        if prev is None or (lx, ly) != prev[0:2]:
+            self.gamepad.left_joystick_float(x_value_float=lx, y_value_float=ly)
+        if prev is None or (rx, ry) != prev[2:4]:
+            self.gamepad.right_joystick_float(x_value_float=rx, y_value_float=ry)
+
+        # Apply Trigger States
+        if prev is None or lt != prev[4]:
+            self.gamepad.left_trigger_float(value_float=lt)
+        if prev is None or rt != prev[5]:
+            self.gamepad.right_trigger_float(value_float=rt)
+
+        # Apply Button States
+        # vgamepad is stateful, so press/release only on edges.
+        changed = buttons if prev is None else buttons ^ prev[6]
+        for bit, button in self._button_map.items():
+            if prev is None or changed & bit:
+                if buttons & bit:
+                    self.gamepad.press_button(button=button)
+                else:
+                    self.gamepad.release_button(button=button)
+
+        self.gamepad.update()
+
+    def reset(self):
+        self.gamepad.reset()
+        self.gamepad.update()
+
+def _stick(value: float) -> int:
+    return int(max(-1.0, min(1.0, value)) * 32767)
+
+def _trigger(value: float) -> int:
+    return int(max(0.0, min(1.0, value)) * 255)
+
+class RecordingBackend(GamepadBackend):
+    """
+    Appends every report to a compact binary file (20 bytes/report), optionally
+    forwarding to another backend so a live session can be recorded too.
+
+    File layout:
+        header: magic b"MKGP", uint16 version, float64 wall-clock start time
+        record: uint64 ns since start (monotonic), 4x int16 sticks, 2x uint8 triggers, uint16 buttons
+    """
+    name = "record"
+    MAGIC = b"MKGP"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHd")
+    RECORD = struct.Struct("<Q4h2BH")
+
+    def __init__(self, path: str, inner: Optional[GamepadBackend] = None):
+        self.path = path
+        self.inner = inner
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "wb", buffering=64 * 1024)
+        self._file.write(self.HEADER.pack(self.MAGIC, self.VERSION, time.time()))
+        self._t0 = time.perf_counter_ns()
+        self.reports = 0
+        print(f"[Input] Recording reports to {path}")
+
+    def send(self, report: tuple, prev: Optional[tuple]):
+        if self.inner:
+            self.inner.send(report, prev)
+        lx, ly, rx, ry, lt, rt, buttons = report
+        # Clamp before packing: out-of-range values would overflow the int16/uint8 fields
+        self._file.write(self.RECORD.pack(
+            time.perf_counter_ns() - self._t0,
+            _stick(lx), _stick(ly), _stick(rx), _stick(ry),
+            _trigger(lt), _trigger(rt), buttons
+        ))
+        self.reports += 1
+
+    def reset(self):
+        if self.inner:
+            self.inner.reset()
+        self.send((0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0), None)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if self.inner:
+            self.inner.close()
+
+def read_recording(path: str) -> Dict[str, np.ndarray]:
+    """
+    Load a RecordingBackend file into per-axis time series.
+    Returns {"t": seconds since start, "start_time": wall clock, "left_x": ..., "jump": bool array, ...}
+    """
+    dtype = np.dtype([
+        ("t_ns", "<u8"),
+        ("left_x", "<i2"), ("left_y", "<i2"), ("right_x", "<i2"), ("right_y", "<i2"),
+        ("left_trigger", "u1"), ("right_trigger", "u1"),
+        ("buttons", "<u2"),
+    ])
+    with open(path, "rb") as f:
+        magic, version, start_time = RecordingBackend.HEADER.unpack(f.read(RecordingBackend.HEADER.size))
+    if magic != RecordingBackend.MAGIC:
+        raise ValueError(f"Not a gamepad recording: {path}")
+
+    raw = np.fromfile(path, dtype=dtype, offset=RecordingBackend.HEADER.size)
+    series = {
+        "start_time": np.float64(start_time),
+        "t": raw["t_ns"].astype(np.float64) / 1e9,
+        "buttons": raw["buttons"],
+    }
+    for axis in ("left_x", "left_y", "right_x", "right_y"):
+        series[axis] = raw[axis].astype(np.float32) / 32767.0
+    for trig in ("left_trigger", "right_trigger"):
+        series[trig] = raw[trig].astype(np.float32) / 255.0
+    for name, bit in BUTTON_BITS.items():
+        series[name.lower()] = (raw["buttons"] & bit) != 0
+    return series
+
+def default_record_path() -> str:
+    """$GAMEPAD_RECORD_PATH, or a timestamped file under recordings/."""
+    return os.getenv("GAMEPAD_RECORD_PATH") or f"recordings/input_{int(time.time())}.mkgp"
+
+def create_backend(name: Optional[str] = None, record_path: Optional[str] = None) -> GamepadBackend:
+    """
+    Build a backend by name ("vgamepad", "null", "record").
+    Defaults to $GAMEPAD_BACKEND, then vgamepad, falling back to null if unavailable.
+    "record" writes to `record_path` (default $GAMEPAD_RECORD_PATH) and forwards to vgamepad when present.
+    """
+    name = (name or os.getenv("GAMEPAD_BACKEND", "vgamepad")).lower()
+
+    if name == "record":
+        path = record_path or default_record_path()
+        inner = None
+        if _VGAMEPAD_AVAILABLE:
+            try:
+                inner = VGamepadBackend()
+            except Exception as e:
+                print(f"[Input] vgamepad unavailable, recording only: {e}")
+        return RecordingBackend(path, inner=inner)
+
+    if name == "vgamepad":
+        if not _VGAMEPAD_AVAILABLE:
+            print("Warning: 'vgamepad' not found. Virtual Controller disabled (null backend).")
+            return NullBackend()
+        try:
+            backend = VGamepadBackend()
+            print("Virtual Controller Initialized.")
+            return backend
+        except Exception as e:
+            print(f"Failed to initialize Virtual Controller: {e}")
+            return NullBackend()
+
+    return NullBackend()
@@ -1,19 +1,15 @@
-try:
-    import vgamepad as vg
-    _VGAMEPAD_AVAILABLE = True
-except ImportError:
-    _VGAMEPAD_AVAILABLE = False
-    print("Warning: 'vgamepad' not found. Virtual Controller disabled.")
-
 import time
 import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+from src.utils.gamepad_backends import GamepadBackend, BUTTON_BITS, create_backend
 
 class InputController:
-    def __init__(self):
+    def __init__(self, backend: Optional[GamepadBackend] = None):
         """
         Initialize Virtual Xbox 360 Controller (Non-blocking).
+        backend: Output sink. None = pick from $GAMEPAD_BACKEND (vgamepad, null, record).
         """
-        self.gamepad = None
         self._input_state = {
             "left_x": 0.0,
             "left_y": 0.0,
@@ -22,89 +18,145 @@ class InputController:
             "buttons": set(),
             "triggers": {"left": 0.0, "right": 0.0}
         }
+        # Last report actually pushed to the device (for diffing)
+        self._sent_report = None
+        # Transaction nesting depth. While > 0, setters only stage changes.
+        self._txn_depth = 0
+        self.reports_sent = 0
+        # Serializes access between the vision loop and the input scheduler thread
+        self._lock = threading.RLock()
+        # Optional fixed-rate stick scheduler (see attach_scheduler)
+        self.scheduler = None
+        # Called with (report, perf_counter time) after each report is sent (must be cheap)
+        self.report_listeners: List[Callable[[tuple, float], None]] = []
         
-        if _VGAMEPAD_AVAILABLE:
+        self.backend = backend if backend is not None else create_backend()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Frame-scoped batch of input changes.
+        All set_* calls inside the block are staged and sent as one diffed report on exit:
+
+            with controller.transaction():
+                controller.set_look(x, y)
+                controller.set_attack(True)
+
+        Transactions nest; only the outermost one commits.
+        """
+        with self._lock:
+            self._txn_depth += 1
             try:
-                self.gamepad = vg.VX360Gamepad()
-                print("Virtual Controller Initialized.")
-            except Exception as e:
-                print(f"Failed to initialize Virtual Controller: {e}")
+                yield self
+            finally:
+                self._txn_depth -= 1
+                if self._txn_depth == 0:
+                    self.update()
+
+    def attach_scheduler(self, scheduler):
+        """
+        Route set_move/set_look through a fixed-rate InputScheduler.
+        Sticks then become intents; the scheduler thread owns the actual output.
+        """
+        self.scheduler = scheduler
+
+    def add_report_listener(self, listener: Callable[[tuple, float], None]):
+        """Observe every report that reaches the device (e.g. SessionRecorder.record_input)."""
+        self.report_listeners.append(listener)
+
+    def _apply_sticks(self, move: tuple, look: tuple):
+        """Write raw stick output (used by the scheduler thread)."""
+        with self._lock:
+            self._input_state["left_x"], self._input_state["left_y"] = move
+            self._input_state["right_x"], self._input_state["right_y"] = look
+            self._changed()
+
+    def _current_report(self) -> tuple:
+        st = self._input_state
+        return (
+            st["left_x"], st["left_y"],
+            st["right_x"], st["right_y"],
+            st["triggers"]["left"], st["triggers"]["right"],
+            sum(BUTTON_BITS[b] for b in st["buttons"]),
+        )
+
+    def _changed(self):
+        """Stage a change: send now, or defer to the enclosing transaction."""
+        if self._txn_depth == 0:
+            self.update()
 
     def update(self):
-        """Apply the current state to the virtual device."""
-        if not self.gamepad: return
+        """Apply the current state to the output backend (only the parts that changed)."""
+        report = self._current_report()
+        prev = self._sent_report
+        if report == prev:
+            return # Nothing changed, skip the driver call entirely
 
         try:
-            # Apply Joystick States
-            self.gamepad.left_joystick_float(
-                x_value_float=self._input_state["left_x"], 
-                y_value_float=self._input_state["left_y"]
-            )
-            self.gamepad.right_joystick_float(
-                x_value_float=self._input_state["right_x"], 
-                y_value_float=self._input_state["right_y"]
-            )
-            
-            # Apply Trigger States
-            self.gamepad.left_trigger_float(value_float=self._input_state["triggers"]["left"])
-            self.gamepad.right_trigger_float(value_float=self._input_state["triggers"]["right"])
-            
-            # Apply Button States
-            # Note: vgamepad buttons need to be pressed/released explicitly or reset every frame?
-            # vgamepad is stateful. We should release all buttons not in the set, and press all in the set.
-            # However, simpler approach: Reset allows clearing, but might be flicker-y.
-            # Better: We just rely on the API. To properly handle buttons without clearing everything:
-            # For this MVP, we only support a few buttons so let's just press them if active.
-            # Creating a fresh report is complex with vgamepad properly.
-            
-            # Simplified approach: We assume transient button presses are handled by caller,
-            # OR we just map specific buttons we care about.
-            
-            # Let's handle Jump (A) and Attack (RT - already triggers)
-            if "JUMP" in self._input_state["buttons"]:
-                self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-            else:
-                self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-
-            self.gamepad.update()
-            
+            self.backend.send(report, prev)
+            self._sent_report = report
+            self.reports_sent += 1
+            if self.report_listeners:
+                now = time.perf_counter()
+                for listener in self.report_listeners:
+                    listener(report, now)
         except Exception as e:
+            # Force a full resend next time
+            self._sent_report = None
             print(f"Error updating gamepad: {e}")
 
     def set_move(self, x: float, y: float):
         """Set movement vector (-1.0 to 1.0)."""
-        self._input_state["left_x"] = float(x)
-        self._input_state["left_y"] = float(y)
-        self.update() # Immediate update for responsiveness
+        if self.scheduler:
+            self.scheduler.set_target("move", x, y)
+            return
+        with self._lock:
+            self._input_state["left_x"] = float(x)
+            self._input_state["left_y"] = float(y)
+            self._changed() # Immediate update unless batched
 
     def set_look(self, x: float, y: float):
         """Set look vector (-1.0 to 1.0)."""
-        self._input_state["right_x"] = float(x)
-        self._input_state["right_y"] = float(y)
-        self.update()
+        if self.scheduler:
+            self.scheduler.set_target("look", x, y)
+            return
+        with self._lock:
+            self._input_state["right_x"] = float(x)
+            self._input_state["right_y"] = float(y)
+            self._changed()
 
     def set_jump(self, active: bool):
-        if active:
-            self._input_state["buttons"].add("JUMP")
-        else:
-            self._input_state["buttons"].discard("JUMP")
-        self.update()
+        with self._lock:
+            if active:
+                self._input_state["buttons"].add("JUMP")
+            else:
+                self._input_state["buttons"].discard("JUMP")
+            self._changed()
 
     def set_attack(self, active: bool):
-        self._input_state["triggers"]["right"] = 1.0 if active else 0.0
-        self.update()
+        with self._lock:
+            self._input_state["triggers"]["right"] = 1.0 if active else 0.0
+            self._changed()
 
     def emergency_stop(self):
         """Reset all inputs."""
-        self._input_state = {
-            "left_x": 0.0, "left_y": 0.0,
-            "right_x": 0.0, "right_y": 0.0,
-            "buttons": set(),
-            "triggers": {"left": 0.0, "right": 0.0}
-        }
-        if self.gamepad:
-            self.gamepad.reset()
-            self.gamepad.update()
+        if self.scheduler:
+            self.scheduler.reset()
+        with self._lock:
+            st = self._input_state
+            st["left_x"] = st["left_y"] = 0.0
+            st["right_x"] = st["right_y"] = 0.0
+            st["buttons"].clear()
+            st["triggers"]["left"] = st["triggers"]["right"] = 0.0
+            # Full resend (prev=None releases every button) through the normal path,
+            # so report listeners (recorder, input report) see the stop too
+            self._sent_report = None
+            self.update()
+
+    def close(self):
+        """Release inputs and close the backend (flushes recordings)."""
+        self.emergency_stop()
+        self.backend.close()
 
 if __name__ == "__main__":
     controller = InputController()
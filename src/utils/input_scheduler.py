@@ -0,0 +1,124 @@
+import math
+import time
+import threading
+from typing import Dict, Optional
+
+class InputScheduler:
+    """
+    Fixed-rate output thread for the analog sticks.
+
+    Skills only set *intents* (target stick values) through InputController.set_move/set_look.
+    This thread runs at `rate_hz`, moves the real stick output toward the target with
+    exponential smoothing plus a slew-rate limit, and auto-zeroes intents that were not
+    refreshed in time. Output stays smooth whatever the perception frame rate is.
+    """
+    STICKS = ("move", "look")
+
+    def __init__(self, controller, rate_hz: float = 250.0,
+                 smoothing_ms: float = 25.0, max_slew: float = 12.0,
+                 stale_ms: Optional[Dict[str, float]] = None):
+        """
+        rate_hz:      Output rate (250-500Hz recommended).
+        smoothing_ms: Time constant of the exponential smoothing (0 = off).
+        max_slew:     Max stick change per second (full scale = 1.0).
+        stale_ms:     Per-stick timeout. If an intent is not refreshed within this time
+                      it is reset to 0. None/0 = hold forever (e.g. timed plan movement).
+        """
+        self.controller = controller
+        self.rate_hz = rate_hz
+        self.smoothing_ms = smoothing_ms
+        self.max_slew = max_slew
+        # Look is driven every vision frame, so a stalled vision loop must not keep turning.
+        # Move is held by timed skills (MOVE_FORWARD 5) and released explicitly.
+        self.stale_ms = {"look": 150.0, "move": 0.0}
+        if stale_ms:
+            self.stale_ms.update(stale_ms)
+
+        self._lock = threading.Lock()
+        # stick -> [target_x, target_y, refresh_time]
+        self._targets = {s: [0.0, 0.0, 0.0] for s in self.STICKS}
+        # stick -> [out_x, out_y]
+        self._output = {s: [0.0, 0.0] for s in self.STICKS}
+
+        self.running = False
+        self.thread = None
+        self.tick_count = 0
+        self.late_ticks = 0
+
+    def set_target(self, stick: str, x: float, y: float):
+        """Set (or refresh) the target value of a stick. Thread-safe, never blocks on I/O."""
+        with self._lock:
+            t = self._targets[stick]
+            t[0], t[1], t[2] = float(x), float(y), time.perf_counter()
+
+    def reset(self):
+        """Zero all intents and outputs immediately (emergency stop)."""
+        with self._lock:
+            for s in self.STICKS:
+                self._targets[s][:] = [0.0, 0.0, 0.0]
+                self._output[s][:] = [0.0, 0.0]
+
+    def start(self):
+        if self.running: return
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        print(f"[Input] Scheduler started at {self.rate_hz:.0f}Hz")
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _loop(self):
+        period = 1.0 / self.rate_hz
+        next_tick = time.perf_counter()
+        last = next_tick
+        while self.running:
+            now = time.perf_counter()
+            self.step(now - last, now)
+            last = now
+
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (GC pause, etc.) - don't try to catch up with a burst
+                self.late_ticks += 1
+                next_tick = time.perf_counter()
+
+    def step(self, dt: float, now: float):
+        """Advance the smoothed outputs by dt seconds and push them to the controller."""
+        if self.smoothing_ms > 0:
+            alpha = 1.0 - math.exp(-dt * 1000.0 / self.smoothing_ms)
+        else:
+            alpha = 1.0
+        max_delta = self.max_slew * dt
+
+        with self._lock:
+            for s in self.STICKS:
+                target = self._targets[s]
+                out = self._output[s]
+                stale = self.stale_ms.get(s) or 0.0
+                if stale > 0 and (now - target[2]) * 1000.0 > stale:
+                    target[0] = target[1] = 0.0
+
+                for i in (0, 1):
+                    diff = target[i] - out[i]
+                    if abs(diff) < 1e-3:
+                        out[i] = target[i]
+                        continue
+                    delta = diff * alpha
+                    if delta > max_delta: delta = max_delta
+                    elif delta < -max_delta: delta = -max_delta
+                    out[i] = round(out[i] + delta, 4)
+
+            move = tuple(self._output["move"])
+            look = tuple(self._output["look"])
+
+        # One diffed report per tick (no-op if nothing moved)
+        with self.controller.transaction():
+            self.controller._apply_sticks(move, look)
+        self.tick_count += 1
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import uuid
+import queue
+import sqlite3
+import threading
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, started REAL NOT NULL, ended REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL, session TEXT NOT NULL, name TEXT NOT NULL, value REAL, tags TEXT
+);
+CREATE TABLE IF NOT EXISTS timings (
+    ts REAL NOT NULL, session TEXT NOT NULL, stage TEXT NOT NULL,
+    n INTEGER NOT NULL, mean_ms REAL NOT NULL, p95_ms REAL NOT NULL, max_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_name ON events (session, name);
+"""
+
+class MetricsStore:
+    """
+    Append-only session metrics in SQLite, written by a background thread.
+
+    event()  - skill outcomes (fishing_cast, fishing_bite, fishing_reel, combat_kill, retreat, ...)
+               with an optional value (e.g. time-to-kill seconds) and tags
+    timing() - per-stage latency samples; aggregated per flush into n/mean/p95/max rows
+
+    Both calls only append to memory (never touch the disk on the caller's thread).
+    If the writer falls behind, events beyond `max_pending` are dropped and counted.
+    Query with tools/metrics_report.py.
+    """
+    def __init__(self, path: str = "metrics.sqlite", flush_interval: float = 1.0, max_pending: int = 50000):
+        self.path = path
+        self.flush_interval = flush_interval
+        # Unique even for runs started in the same second / several processes on one file
+        self.session = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.started = time.time()
+        self.dropped = 0
+        self._events: "queue.Queue[tuple]" = queue.Queue(maxsize=max_pending)
+        self._timings: Dict[str, List[float]] = defaultdict(list)
+        self._timings_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._error: Optional[Exception] = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        if self._error:
+            raise self._error
+        print(f"[Metrics] Session {self.session} -> {self.path}")
+
+    def event(self, name: str, value: Optional[float] = None, **tags):
+        try:
+            self._events.put_nowait((time.time(), name, value, json.dumps(tags) if tags else None))
+        except queue.Full:
+            self.dropped += 1
+
+    def timing(self, stage: str, ms: float):
+        with self._timings_lock:
+            self._timings[stage].append(ms)
+
+    def close(self):
+        self._stop.set()
+        self.thread.join(timeout=5.0)
+
+    # --- Writer thread ---
+
+    def _run(self):
+        try:
+            db = sqlite3.connect(self.path)
+            db.executescript(SCHEMA)
+            db.execute("INSERT INTO sessions VALUES (?, ?, ?)", (self.session, self.started, self.started))
+            db.commit()
+        except sqlite3.Error as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            while not self._stop.wait(self.flush_interval):
+                self._flush(db)
+            self._flush(db)
+        finally:
+            db.close()
+
+    def _flush(self, db: sqlite3.Connection):
+        now = time.time()
+        rows = []
+        while True:
+            try:
+                ts, name, value, tags = self._events.get_nowait()
+            except queue.Empty:
+                break
+            rows.append((ts, self.session, name, value, tags))
+
+        with self._timings_lock:
+            timings, self._timings = self._timings, defaultdict(list)
+        timing_rows = []
+        for stage, samples in timings.items():
+            a = np.asarray(samples, dtype=np.float64)
+            timing_rows.append((now, self.session, stage, len(a), float(a.mean()),
+                                float(np.percentile(a, 95)), float(a.max())))
+
+        try:
+            if rows:
+                db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?)", rows)
+            if timing_rows:
+                db.executemany("INSERT INTO timings VALUES (?, ?, ?, ?, ?, ?, ?)", timing_rows)
+            db.execute("UPDATE sessions SET ended = ? WHERE id = ?", (now, self.session))
+            db.commit()
+        except sqlite3.Error as e:
+            print(f"[Metrics] Write failed: {e}")
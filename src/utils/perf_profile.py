@@ -0,0 +1,83 @@
+import os
+import re
+import json
+import platform
+from typing import Any, Dict, Optional
+
+# Tunable knobs and their built-in values (what the code uses without a profile)
+DEFAULTS: Dict[str, Any] = {
+    "skip_frames": 1,       # VisionProcessor: run YOLO every N-th frame
+    "conf_threshold": 0.15, # VisionProcessor: YOLO confidence
+    "target_fps": 120,      # ScreenCapture: DXCam capture rate
+    "max_width": 1280,      # ScreenCapture: stride-downscale cap
+    "ocr_interval": 30,     # CoordinateReader: OCR every N-th frame
+    "fishing_roi": 64,      # FishingPerception: splash ROI size (px)
+}
+
+def hardware_class() -> str:
+    """
+    Coarse hardware key for profiles, e.g. "nvidia-geforce-rtx-4090-16c" or "cpu-8c".
+    GPU name from torch when CUDA is available (it's already loaded for YOLO), plus the CPU
+    thread count. Override with $PERF_HARDWARE_CLASS.
+    """
+    override = os.getenv("PERF_HARDWARE_CLASS")
+    if override:
+        return override
+    gpu = "cpu"
+    try:
+        import torch
+        if torch.cuda.is_available():
+            gpu = torch.cuda.get_device_name(0)
+        elif getattr(torch.backends, "mps", None) is not None and torch.backends.mps.is_available():
+            gpu = f"mps-{platform.machine()}"
+    except Exception:
+        pass
+    name = f"{gpu}-{os.cpu_count() or 1}c"
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+def load_profiles(path: str) -> Dict[str, Dict[str, Any]]:
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[Perf] Could not read {path}: {e}")
+        return {}
+
+def load_profile(path: str, name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Profile for `name` (default: this machine's hardware class), or None."""
+    name = name or hardware_class()
+    profile = load_profiles(path).get(name)
+    if profile is None:
+        print(f"[Perf] No profile for '{name}' in {path} (using defaults; run tools/autotune.py)")
+        return None
+    print(f"[Perf] Loaded profile '{name}': " + ", ".join(f"{k}={profile[k]}" for k in DEFAULTS if k in profile))
+    return profile
+
+def save_profile(path: str, name: str, profile: Dict[str, Any]):
+    """Insert/replace one hardware class; other classes in the file are kept."""
+    profiles = load_profiles(path)
+    profiles[name] = profile
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def apply_profile(profile: Optional[Dict[str, Any]], capture=None, vision=None, coords=None, fishing=None):
+    """
+    Push profile values into live components (any may be None; unknown keys are ignored).
+    Capture knobs must be applied before capture.start() for target_fps to take effect.
+    """
+    if not profile:
+        return
+    if capture is not None and hasattr(capture, "max_width"): # Replays/videos have no capture knobs
+        capture.target_fps = int(profile.get("target_fps", capture.target_fps))
+        capture.max_width = int(profile.get("max_width", capture.max_width))
+    if vision is not None:
+        vision.skip_frames = max(1, int(profile.get("skip_frames", vision.skip_frames)))
+        vision.conf_threshold = float(profile.get("conf_threshold", vision.conf_threshold))
+    if coords is not None:
+        coords.ocr_interval = max(1, int(profile.get("ocr_interval", coords.ocr_interval)))
+    if fishing is not None:
+        fishing.perception.roi_size = int(profile.get("fishing_roi", fishing.perception.roi_size))
@@ -6,11 +6,21 @@ import mss
 import pygetwindow as gw
 import threading
 from typing import Optional, Tuple, Dict
+from src.utils.frame_sources import fit_width
+
+# dxcam hands out a single camera per output, so captures of windows on the same monitor
+# share it: it is started by the first user and stopped by the last.
+_camera_users: Dict[int, int] = {}
+_camera_lock = threading.Lock()
 
 class ScreenCapture:
-    def __init__(self):
+    def __init__(self, window_title: str = "Minecraft", window_index: int = 0, track_interval: float = 0.5):
         """
         Initialize ScreenCapture with Multi-Monitor Support.
+        window_title: substring of the window title to track.
+        window_index: which match to track when several windows share the title
+                      (ordered left to right, then top to bottom).
+        track_interval: seconds between background window geometry polls (0 = only on request).
         """
         # 1. Get Monitor Layout using MSS (reliable source of truth for bounds)
         self.mss_ctx = mss.mss()
@@ -19,23 +29,42 @@ class ScreenCapture:
         self.current_monitor_idx = -1 # MSS Index (1-based)
         self.camera = None
         self.running = False
+        self._camera_started = False
         
-        self.target_window_title = "Minecraft" 
+        self.target_window_title = window_title
+        self.window_index = window_index
         
         # Default area
         self.region = (0, 0, 1920, 1080)
         self.monitor_width = 1920
         self.monitor_height = 1080
+        # Perf knobs (set from the perf profile before start())
+        self.target_fps = 120 # DXCam capture rate
+        self.max_width = 1280 # Frames wider than this are stride-downscaled
         
         # Stats
         self.capture_count = 0
         self.capture_rate = 0.0
         self.last_capture_time = time.time()
+        # perf_counter() timestamp of the latest returned frame (for latency compensation)
+        self.last_frame_time = 0.0
         
         # Thread defaults
+        # Guards camera/region/monitor size as one unit: held only for swaps and the
+        # snapshot in capture_frame, never while enumerating windows or creating cameras
         self.lock = threading.Lock()
         self.current_frame = None
         self.thread = None
+
+        # Background window tracking
+        self.track_interval = track_interval
+        self.search_interval = 2.0 # Min seconds between full window enumerations while lost
+        self._window = None # Tracked pygetwindow window (cheap geometry reads)
+        self._geometry = None # Last applied (left, top, width, height)
+        self._last_search = 0.0
+        self._retrack = threading.Event()
+        self._tracker_stop = threading.Event()
+        self.retracks = 0
         
         # Initial Window Search (will init camera)
         if not self.find_target_window():
@@ -43,160 +72,242 @@ class ScreenCapture:
              print("[Screen] Window not found, defaulting to Primary Monitor.")
              self._init_camera(1)
 
-    def _init_camera(self, mss_idx: int):
-        """Initialize DXCam for a specific monitor (MSS Index 1..N)."""
+        self.tracker = threading.Thread(target=self._track_loop, daemon=True)
+        self.tracker.start()
+
+    def _init_camera(self, mss_idx: int, region: Optional[Tuple[int, int, int, int]] = None):
+        """
+        Initialize DXCam for a specific monitor (MSS Index 1..N).
+        The new camera is created and started before it is swapped in (together with the
+        crop `region` on that monitor), so capture_frame keeps serving the old monitor until
+        the switch is complete.
+        """
         if self.current_monitor_idx == mss_idx and self.camera is not None:
             return
             
         print(f"[Screen] Switching Capture to Monitor {mss_idx}...")
         
-        # Stop existing
-        if self.camera is not None:
-            if self.running:
-                try: self.camera.stop() 
-                except: pass
-            del self.camera
-            self.camera = None
-            
         # Create new (DXCam uses 0-based index, MSS uses 1-based for specific monitors)
         dxcam_idx = mss_idx - 1
         try:
-            self.camera = dxcam.create(device_idx=0, output_idx=dxcam_idx, output_color="BGR")
-            self.current_monitor_idx = mss_idx
-            
-            # Update Dimensions
-            self.monitor_width = self.camera.width
-            self.monitor_height = self.camera.height
-            
+            camera = dxcam.create(device_idx=0, output_idx=dxcam_idx, output_color="BGR")
             # Restart capture if it was running
             if self.running:
-                self.camera.start(target_fps=120, video_mode=True)
-                
-            print(f"[Screen] DXCam started on Output {dxcam_idx}")
+                self._start_camera(camera, mss_idx)
         except Exception as e:
             print(f"[Screen] Init Error: {e}")
             # Fallback to 0 if failed
             if dxcam_idx != 0:
                 print("[Screen] Retrying on Primary...")
-                self._init_camera(1)
+                self._init_camera(1, region)
+            return
+
+        # Swap, then stop the old one
+        with self.lock:
+            old_camera, old_idx, old_started = self.camera, self.current_monitor_idx, self._camera_started
+            self.camera = camera
+            self.current_monitor_idx = mss_idx
+            self._camera_started = self.running
+            if region is not None:
+                self.region = region
+            # Update Dimensions
+            self.monitor_width = camera.width
+            self.monitor_height = camera.height
+        if old_camera is not None and old_started:
+            try: self._stop_camera(old_camera, old_idx)
+            except: pass
+        print(f"[Screen] DXCam started on Output {dxcam_idx}")
+
+    def _start_camera(self, camera, mss_idx: int):
+        with _camera_lock:
+            users = _camera_users.get(mss_idx, 0)
+            if not camera.is_capturing:
+                camera.start(target_fps=self.target_fps, video_mode=True)
+            _camera_users[mss_idx] = users + 1
+
+    def _stop_camera(self, camera, mss_idx: int):
+        with _camera_lock:
+            users = _camera_users.pop(mss_idx, 1) - 1
+            if users > 0:
+                _camera_users[mss_idx] = users
+            elif camera.is_capturing:
+                camera.stop()
 
     def start(self):
         """Start the DXCam background capture."""
         if self.running: return
         self.running = True
         if self.camera:
-            self.camera.start(target_fps=120, video_mode=True)
+            self._start_camera(self.camera, self.current_monitor_idx)
+            self._camera_started = True
         print("[Screen] Capture started.")
 
     def stop(self):
         """Stop the DXCam capture."""
         self.running = False
-        if self.camera and self.camera.is_capturing:
-            self.camera.stop()
-            
-    def find_target_window(self):
-        """Locate window, switch monitor if needed, update relative crop."""
-        try:
-            windows = gw.getWindowsWithTitle(self.target_window_title)
-            if not windows:
+        if self.camera and self._camera_started:
+            self._stop_camera(self.camera, self.current_monitor_idx)
+            self._camera_started = False
+
+    def _find_window(self, verbose: bool = True):
+        """Full enumeration (slow: walks every top-level window)."""
+        windows = gw.getWindowsWithTitle(self.target_window_title)
+        if not windows:
+            if verbose:
                 print(f"[Screen] ERROR: Window '{self.target_window_title}' NOT FOUND!")
                 print("[Screen] Visible Windows:")
                 all_wins = gw.getAllTitles()
                 for t in all_wins:
                     if t.strip(): print(f" - {t}")
-                return False
+            return None
+        if len(windows) <= self.window_index:
+            if verbose:
+                print(f"[Screen] ERROR: Only {len(windows)} '{self.target_window_title}' window(s), need #{self.window_index}")
+            return None
+        # Stable order for multi-instance setups (z-order changes with focus)
+        windows.sort(key=lambda w: (w.left, w.top))
+        return windows[self.window_index]
 
-            if windows:
-                win = windows[0]
-                if win.isActive or not win.isMinimized:
-                    # Window Global Coords
-                    wx, wy, ww, wh = win.left, win.top, win.width, win.height
-                    cx = wx + ww // 2
-                    cy = wy + wh // 2
-                    
-                    # Find which monitor contains the center
-                    target_idx = -1
-                    for i, mon in enumerate(self.monitors):
-                        if i == 0: continue # Skip 'All'
-                        mx, my = mon["left"], mon["top"]
-                        mw, mh = mon["width"], mon["height"]
-                        
-                        if (mx <= cx < mx + mw) and (my <= cy < my + mh):
-                            target_idx = i
-                            break
-                    
-                    if target_idx == -1:
-                        target_idx = 1 # Default to primary if weird
-                        
-                    # Re-init camera if monitor changed
-                    if target_idx != self.current_monitor_idx:
-                        self._init_camera(target_idx)
-                        
-                    # Calculate Relative Coords for Crop
-                    # DXCam captures the specific monitor's frame (0,0 is monitor top-left)
-                    mon_info = self.monitors[target_idx]
-                    
-                    rel_left = max(0, int(wx - mon_info["left"]))
-                    rel_top = max(0, int(wy - mon_info["top"]))
-                    
-                    # Clamp right/bottom to monitor size
-                    mon_w, mon_h = mon_info["width"], mon_info["height"]
-                    
-                    rel_right = min(mon_w, rel_left + int(ww))
-                    rel_bottom = min(mon_h, rel_top + int(wh))
-                    
-                    print(f"[Screen] Win: {wx},{wy} | Mon{target_idx}: {mon_info['left']},{mon_info['top']} | Crop: {rel_left},{rel_top} -> {rel_right},{rel_bottom}")
-                    
-                    if rel_right > rel_left and rel_bottom > rel_top:
-                        self.region = (rel_left, rel_top, rel_right, rel_bottom)
-                        return True
+    def _apply_geometry(self, wx: int, wy: int, ww: int, wh: int, verbose: bool = True) -> bool:
+        """Switch monitor if needed and swap in the crop for a window at these global coords."""
+        cx = wx + ww // 2
+        cy = wy + wh // 2
+        
+        # Find which monitor contains the center
+        target_idx = -1
+        for i, mon in enumerate(self.monitors):
+            if i == 0: continue # Skip 'All'
+            mx, my = mon["left"], mon["top"]
+            mw, mh = mon["width"], mon["height"]
+            
+            if (mx <= cx < mx + mw) and (my <= cy < my + mh):
+                target_idx = i
+                break
+        
+        if target_idx == -1:
+            target_idx = 1 # Default to primary if weird
+            
+        # Calculate Relative Coords for Crop
+        # DXCam captures the specific monitor's frame (0,0 is monitor top-left)
+        mon_info = self.monitors[target_idx]
+        
+        rel_left = max(0, int(wx - mon_info["left"]))
+        rel_top = max(0, int(wy - mon_info["top"]))
+        
+        # Clamp right/bottom to monitor size
+        mon_w, mon_h = mon_info["width"], mon_info["height"]
+        
+        rel_right = min(mon_w, rel_left + int(ww))
+        rel_bottom = min(mon_h, rel_top + int(wh))
+        
+        if verbose:
+            print(f"[Screen] Win: {wx},{wy} | Mon{target_idx}: {mon_info['left']},{mon_info['top']} | Crop: {rel_left},{rel_top} -> {rel_right},{rel_bottom}")
+        
+        if rel_right > rel_left and rel_bottom > rel_top:
+            region = (rel_left, rel_top, rel_right, rel_bottom)
+            # Re-init camera only if the monitor changed; otherwise just swap the crop
+            if target_idx != self.current_monitor_idx:
+                self._init_camera(target_idx, region)
+            else:
+                with self.lock:
+                    self.region = region
+            return True
+        return False
+            
+    def find_target_window(self, verbose: bool = True) -> bool:
+        """Locate window, switch monitor if needed, update relative crop (blocking)."""
+        try:
+            win = self._find_window(verbose)
+            self._last_search = time.time()
+            if win is None:
+                return False
+            if win.isActive or not win.isMinimized:
+                self._window = win
+                geometry = (win.left, win.top, win.width, win.height)
+                if self._apply_geometry(*geometry, verbose=verbose):
+                    self._geometry = geometry
+                    return True
         except Exception as e:
             print(f"[Screen] Track Err: {e}")
         return False
 
+    def request_retrack(self):
+        """Ask the tracker thread for a full re-search now (never blocks the caller)."""
+        self._retrack.set()
+
+    def _track_loop(self):
+        """
+        Follows window moves/resizes in the background. Each poll is one geometry read
+        of the known window handle; full enumeration only when the window is lost (at most
+        every search_interval) or on request_retrack().
+        """
+        while not self._tracker_stop.is_set():
+            self._retrack.wait(self.track_interval if self.track_interval > 0 else None)
+            if self._tracker_stop.is_set():
+                break
+            forced = self._retrack.is_set()
+            self._retrack.clear()
+            try:
+                self._poll(forced)
+            except Exception as e:
+                print(f"[Screen] Tracker Err: {e}")
+
+    def _poll(self, forced: bool):
+        win = self._window
+        if win is not None and not forced:
+            try:
+                if win.isMinimized:
+                    return # Keep the last crop; minimized windows report bogus coordinates
+                box = win.box # Single GetWindowRect call
+                geometry = (box.left, box.top, box.width, box.height)
+            except Exception:
+                print(f"[Screen] Lost window '{self.target_window_title}', searching...")
+                self._window = None
+                return
+            if geometry != self._geometry:
+                if self._apply_geometry(*geometry):
+                    self._geometry = geometry
+                    self.retracks += 1
+            return
+
+        if forced or time.time() - self._last_search >= self.search_interval:
+            if self.find_target_window(verbose=forced):
+                self.retracks += 1
+
     def capture_frame(self) -> Optional[np.ndarray]:
         """
         Returns the latest captured frame from DXCam.
         """
         if not self.running:
             return None
+
+        # Consistent camera + crop snapshot (the tracker thread swaps them)
+        with self.lock:
+            camera, region = self.camera, self.region
+            monitor_width, monitor_height = self.monitor_width, self.monitor_height
+        if camera is None:
+            return None
             
         # Get frame (Non-blocking usually in video_mode)
-        frame = self.camera.get_latest_frame()
+        frame = camera.get_latest_frame()
         
         if frame is None:
             return None
+        self.last_frame_time = time.perf_counter()
             
         # Crop to Window using Numpy Slicing
-        left, top, right, bottom = self.region
+        left, top, right, bottom = region
         
         # Optimization: Only slice if not full screen (avoid copy if possible?)
         # Numpy slicing creates specific view, copy happens on resize anyway.
-        if (left == 0 and top == 0 and right == self.monitor_width and bottom == self.monitor_height):
+        if (left == 0 and top == 0 and right == monitor_width and bottom == monitor_height):
             img = frame
         else:
             img = frame[top:bottom, left:right]
             
         # Super-Fast Downscaling for High Res
-        h, w = img.shape[:2]
-        
-        if w > 2500:
-            # 4K -> ~1280 (Divide by 3) - Instant, no math
-            img = img[::3, ::3]
-        elif w > 1280:
-            # 1440p/1080p -> Downscale (Divide by 2)
-            img = img[::2, ::2]
-        
-        # CRITICAL: OpenCV requires C-contiguous arrays for drawing/processing
-        # Slicing [::3] creates a view with strides, which causes "Layout incompatible" errors.
-        img = np.ascontiguousarray(img)
-        
-        # Final sanity check resize if needed (rarely hit if slicing works)
-        # Just to ensure we don't feed huge images to YOLO
-        if img.shape[1] > 1280:
-             scale = 1280 / img.shape[1]
-             new_h = int(img.shape[0] * scale)
-             img = cv2.resize(img, (1280, new_h), interpolation=cv2.INTER_NEAREST)
+        # 4K -> 1280 (every 3rd pixel), 1080p -> 960 (every 2nd), ... - instant, no math
+        img = fit_width(img, self.max_width)
              
         # FPS Tracking
         self.capture_count += 1
@@ -210,6 +321,9 @@ class ScreenCapture:
 
     def close(self):
         """Release resources."""
+        self._tracker_stop.set()
+        self._retrack.set()
+        self.tracker.join(timeout=1.0)
         self.stop()
         # DXCam cleanup is handled by GC mostly, but stop() is important.
 
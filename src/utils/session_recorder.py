@@ -0,0 +1,242 @@
+import os
+import json
+import time
+import queue
+import struct
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+import cv2
+import numpy as np
+
+# Per chunk (NNNNN = chunk number):
+#   chunk_NNNNN.frames        frame payloads back to back (raw HxWx3 uint8, or JPEG if enabled)
+#   chunk_NNNNN.index         per frame: float64 t, uint64 byte offset, uint32 byte size
+#   chunk_NNNNN.inputs        per controller report: float64 t, 4x int16 sticks, 2x uint8 triggers, uint16 buttons
+#   chunk_NNNNN.events.jsonl  vision results / arbitration decisions, one JSON object per line
+#   chunk_NNNNN.json          frame shape, encoding, counts and time range (written when the chunk closes)
+# All timestamps are time.perf_counter() seconds (same clock as ScreenCapture.last_frame_time).
+INDEX = struct.Struct("<dQI")
+INPUT = struct.Struct("<d4h2BH")
+INPUT_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("left_x", "<i2"), ("left_y", "<i2"), ("right_x", "<i2"), ("right_y", "<i2"),
+    ("left_trigger", "u1"), ("right_trigger", "u1"),
+    ("buttons", "<u2"),
+])
+INDEX_DTYPE = np.dtype([("t", "<f8"), ("offset", "<u8"), ("size", "<u4")])
+
+class SessionRecorder:
+    """
+    Records downscaled frames, every controller report, vision outputs and arbitration
+    decisions against one clock, for replay, dataset export and offline tuning.
+
+    The main loop only does a nearest-neighbour downscale and a queue put; JPEG
+    encoding and all file I/O happen on the writer thread. Frames go through a bounded
+    queue and are dropped (counted) when the writer falls behind; inputs and events are
+    small and kept unless `max_pending_events` are waiting (oldest dropped, counted). Each
+    event is filed into the chunk whose time range contains its timestamp.
+    Raw chunks can be opened with np.memmap (see read_chunk).
+    """
+    def __init__(self, out_dir: str, width: int = 320, max_fps: float = 30.0, chunk_seconds: float = 60.0,
+                 jpeg_quality: Optional[int] = None, max_pending_frames: int = 32,
+                 max_pending_events: int = 100000):
+        self.out_dir = out_dir
+        self.width = width
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.chunk_seconds = chunk_seconds
+        self.jpeg_quality = jpeg_quality
+        os.makedirs(out_dir, exist_ok=True)
+
+        self._frames: "queue.Queue[tuple]" = queue.Queue(maxsize=max_pending_frames)
+        # (kind, t, payload); deque.append is thread-safe, maxlen drops the oldest
+        self._events: deque = deque(maxlen=max_pending_events)
+        self._next_frame_t = -1e9 # Throttle grid: advances by min_interval per accepted frame
+        self.frames_recorded = 0
+        self.frames_dropped = 0
+        self.events_dropped = 0
+
+        self._chunk = -1
+        self._chunk_t0 = 0.0
+        self._files: Dict[str, Any] = {}
+        self._meta: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"[Recorder] Recording session to {out_dir}")
+
+    # --- Producer API (main loop / input thread) ---
+
+    def record_frame(self, frame: np.ndarray, t: Optional[float] = None):
+        t = time.perf_counter() if t is None else t
+        # Anchored to a grid (not to the last accepted frame), so frames arriving slightly
+        # early at exactly max_fps are kept; a long gap re-anchors at t
+        if t < self._next_frame_t - 0.25 * self.min_interval:
+            return
+        self._next_frame_t = max(self._next_frame_t, t - self.min_interval) + self.min_interval
+        h, w = frame.shape[:2]
+        step = max(1, w // self.width)
+        # Nearest-neighbour resize: ~5x cheaper than a strided numpy copy, and it is a copy
+        # (the capture buffer is reused). Alpha is dropped on the writer thread.
+        small = cv2.resize(frame, (w // step, h // step), interpolation=cv2.INTER_NEAREST)
+        try:
+            self._frames.put_nowait((t, small))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def _push_event(self, event: tuple):
+        if len(self._events) == self._events.maxlen:
+            self.events_dropped += 1 # Writer hasn't started a chunk yet / fell behind
+        self._events.append(event)
+
+    def record_input(self, report: tuple, t: Optional[float] = None):
+        """InputController report listener."""
+        self._push_event(("input", time.perf_counter() if t is None else t, report))
+
+    def record_vision(self, result: Dict[str, Any], t: Optional[float] = None):
+        self._push_event(("vision", time.perf_counter() if t is None else t, {
+            "lava": bool(result.get("lava_detected", False)),
+            "danger": round(float(result.get("danger_level", 0.0)), 4),
+            "detections": [[d["label"], round(float(d["conf"]), 3), *map(int, d["box"])]
+                           for d in result.get("detections", [])],
+        }))
+
+    def record_decision(self, decision, layer: str, t: Optional[float] = None):
+        """ArbitrationResult; only changes are worth storing."""
+        if decision.started or decision.revoked:
+            self._push_event(("decision", time.perf_counter() if t is None else t, {
+                "layer": layer, "granted": sorted(decision.granted),
+                "started": sorted(decision.started), "revoked": sorted(decision.revoked),
+            }))
+
+    def close(self):
+        self._stop.set()
+        self.thread.join(timeout=5.0)
+        print(f"[Recorder] {self.frames_recorded} frames recorded, {self.frames_dropped} dropped"
+              + (f", {self.events_dropped} events dropped" if self.events_dropped else ""))
+
+    # --- Writer thread ---
+
+    def _run(self):
+        try:
+            while not self._stop.is_set() or not self._frames.empty():
+                try:
+                    t, frame = self._frames.get(timeout=0.1)
+                except queue.Empty:
+                    # Only what fits the open chunk; later events wait for the next one
+                    self._drain_events(self._chunk_t0 + self.chunk_seconds)
+                    continue
+                self._write_frame(t, frame)
+            self._drain_events()
+        finally:
+            self._close_chunk()
+
+    def _open_chunk(self, t: float, shape: tuple):
+        self._close_chunk()
+        self._chunk += 1
+        self._chunk_t0 = t
+        base = os.path.join(self.out_dir, f"chunk_{self._chunk:05d}")
+        self._files = {
+            "frames": open(base + ".frames", "wb"),
+            "index": open(base + ".index", "wb"),
+            "inputs": open(base + ".inputs", "wb"),
+            "events": open(base + ".events.jsonl", "w", encoding="utf-8"),
+        }
+        self._meta = {
+            "chunk": self._chunk, "shape": list(shape),
+            "encoding": "jpeg" if self.jpeg_quality else "raw",
+            "frames": 0, "inputs": 0, "events": 0, "t0": t, "t1": t,
+        }
+
+    def _close_chunk(self):
+        if not self._files:
+            return
+        for f in self._files.values():
+            f.close()
+        path = os.path.join(self.out_dir, f"chunk_{self._meta['chunk']:05d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self._meta, f)
+        self._files = {}
+
+    def _write_frame(self, t: float, frame: np.ndarray):
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = np.ascontiguousarray(frame[..., :3])
+        if (not self._files or t - self._chunk_t0 >= self.chunk_seconds
+                or list(frame.shape) != self._meta["shape"]):
+            self._drain_events(t) # Events before this frame belong to the chunk being closed
+            self._open_chunk(t, frame.shape)
+        self._drain_events(t)
+        if self.jpeg_quality:
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                return
+            data = buf.tobytes()
+        else:
+            data = frame.tobytes()
+        f = self._files["frames"]
+        offset = f.tell()
+        f.write(data)
+        self._files["index"].write(INDEX.pack(t, offset, len(data)))
+        self._meta["frames"] += 1
+        self._meta["t1"] = t
+        self.frames_recorded += 1
+
+    def _drain_events(self, until: Optional[float] = None):
+        """Write queued events with t < until (all if None) into the open chunk."""
+        if not self._files:
+            return # Inputs/events before the first frame wait for the first chunk
+        while self._events:
+            if until is not None and self._events[0][1] >= until:
+                break
+            kind, t, payload = self._events.popleft()
+            if kind == "input":
+                lx, ly, rx, ry, lt, rt, buttons = payload
+                self._files["inputs"].write(INPUT.pack(
+                    t, int(lx * 32767), int(ly * 32767), int(rx * 32767), int(ry * 32767),
+                    int(lt * 255), int(rt * 255), buttons
+                ))
+                self._meta["inputs"] += 1
+            else:
+                self._files["events"].write(json.dumps({"kind": kind, "t": t, **payload}, separators=(",", ":")) + "\n")
+                self._meta["events"] += 1
+
+def list_chunks(session_dir: str) -> List[int]:
+    return sorted(int(name[6:11]) for name in os.listdir(session_dir)
+                  if name.startswith("chunk_") and name.endswith(".json"))
+
+def read_chunk(session_dir: str, chunk: int) -> Dict[str, Any]:
+    """
+    Open one recorded chunk.
+    Returns {"meta", "t" (frame times), "frames" (memmap N x H x W x 3 for raw chunks, else None),
+    "inputs" (structured array), "events" (list of dicts)} plus a frame(i) accessor that also
+    decodes JPEG chunks.
+    """
+    base = os.path.join(session_dir, f"chunk_{chunk:05d}")
+    with open(base + ".json", encoding="utf-8") as f:
+        meta = json.load(f)
+    index = np.fromfile(base + ".index", dtype=INDEX_DTYPE)
+    inputs = np.fromfile(base + ".inputs", dtype=INPUT_DTYPE)
+    with open(base + ".events.jsonl", encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+
+    frames = None
+    if meta["encoding"] == "raw" and len(index):
+        frames = np.memmap(base + ".frames", dtype=np.uint8, mode="r", shape=(len(index), *meta["shape"]))
+
+    def frame(i: int) -> np.ndarray:
+        if frames is not None:
+            return frames[i]
+        with open(base + ".frames", "rb") as f:
+            f.seek(int(index["offset"][i]))
+            buf = np.frombuffer(f.read(int(index["size"][i])), dtype=np.uint8)
+        return cv2.imdecode(buf, cv2.IMREAD_COLOR)
+
+    return {"meta": meta, "t": index["t"], "frames": frames, "inputs": inputs, "events": events, "frame": frame}
+
+def iter_frames(session_dir: str) -> Iterator[tuple]:
+    """Yield (t, frame) over all chunks of a session, in order."""
+    for chunk in list_chunks(session_dir):
+        data = read_chunk(session_dir, chunk)
+        for i, t in enumerate(data["t"]):
+            yield float(t), data["frame"](i)
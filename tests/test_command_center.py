@@ -0,0 +1,67 @@
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+# No live LLM server in tests: without httpx the LLM client is simply unavailable
+sys.modules.setdefault("httpx", types.ModuleType("httpx"))
+
+from src.core.state_manager import StateManager
+from src.interface.command_center import CommandCenter
+from src.planning.plan_cache import state_fingerprint
+from src.skills.plan_runtime import PlanRuntime
+from src.utils.gamepad_backends import NullBackend
+from src.utils.input_controller import InputController
+
+
+class GatedStreamClient:
+    """Streams the first chunk at once, the rest only after `gate` is set."""
+    def __init__(self, first: str, rest: str):
+        self.first, self.rest = first, rest
+        self.gate = threading.Event()
+
+    def stream(self, model, messages, **params):
+        yield self.first
+        self.gate.wait(timeout=5.0)
+        yield self.rest
+
+    def close(self):
+        pass
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("timed out")
+        time.sleep(0.01)
+
+
+def test_cache_hit_cancels_streaming_plan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runtime = PlanRuntime()
+    cc = CommandCenter(StateManager(), InputController(NullBackend()), runtime)
+    appended = []
+    monkeypatch.setattr(runtime, "append", lambda step: appended.append(step.text))
+    monkeypatch.setattr(runtime, "submit", lambda steps: appended.extend(s.text for s in steps))
+    client = GatedStreamClient('["WAIT 1", ', '"JUMP", "WAIT 2"]')
+    cc.llm.client = client
+    try:
+        cc._handle_goal("explore cave")
+        wait_for(lambda: appended == ["WAIT 1"])
+
+        fingerprint = state_fingerprint(cc.state_manager.get_state())
+        cc.plan_cache.put("go fishing", fingerprint, ["WAIT 3"])
+        cc._handle_goal("go fishing")
+        client.gate.set()
+        cc.planner._thread.join(timeout=2.0)
+
+        assert appended == ["WAIT 1", "WAIT 3"]
+        assert not cc.plan_cache.contains("explore cave", fingerprint)
+    finally:
+        client.gate.set()
+        cc.llm.client = None
+        cc.close()
+        runtime.close()
@@ -0,0 +1,51 @@
+import numpy as np
+
+from src.skills.executor import SkillExecutor
+from src.skills.fishing import FishingSkills
+from src.utils.gamepad_backends import NullBackend
+from src.utils.input_controller import InputController
+
+
+def make_skills():
+    clock = [0.0]
+    executor = SkillExecutor(clock=lambda: clock[0])
+    controller = InputController(NullBackend())
+    return FishingSkills(controller, executor), executor, controller, clock
+
+
+def test_suspend_while_waiting_reels_in_on_grant():
+    skills, executor, controller, clock = make_skills()
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    skills.start_fishing()
+    skills.update(frame)
+    executor.tick()
+    cast = skills._task
+    assert skills.state == "WAITING"
+    assert controller._input_state["triggers"]["right"] == 1.0
+
+    skills.suspend()
+    executor.tick()
+    assert cast.cancelled and cast.done
+    assert controller._input_state["triggers"]["right"] == 0.0
+    assert skills.state == "REELING"
+
+    skills.update(frame)
+    assert skills._task.name == "fishing_reel"
+
+
+def test_suspend_mid_reel_recasts_on_grant():
+    skills, executor, _, _ = make_skills()
+    skills.state = "REELING"
+    skills.update(None)
+    reel = skills._task
+
+    skills.suspend()
+    assert reel.cancelled
+    assert skills.state == "CASTING"
+
+
+def test_suspend_when_stopped_stays_idle():
+    skills, _, _, _ = make_skills()
+    skills.suspend()
+    assert skills.state == "IDLE"
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.reflex.hud_reader import HudReader
+
+W, H, SCALE = 1280, 720, 2
+RED = (40, 40, 220)          # BGR heart fill
+MEAT = (50, 110, 200)        # BGR drumstick fill
+
+
+def draw_bar(frame, health, hunger, container=30):
+    """Paints both bars: black-outlined containers, filled halves per point."""
+    r = HudReader(gui_scale=SCALE)
+    left = (W - r.HOTBAR_WIDTH * SCALE) // 2
+    right = left + r.HOTBAR_WIDTH * SCALE
+    top = H - r.ICON_ROW_OFFSET * SCALE
+    size = r.ICON_SIZE * SCALE
+    for i in range(r.ICON_COUNT):
+        for bar, x, points, color in (
+            (0, left + i * r.ICON_STEP * SCALE, health, RED),
+            (1, right - (r.ICON_SIZE + i * r.ICON_STEP) * SCALE, hunger, MEAT),
+        ):
+            # Icons overlap by one GUI pixel; the next icon paints over it, like the game
+            frame[top:top + size, x:x + size] = 0
+            frame[top + SCALE:top + size - SCALE, x + SCALE:x + size - SCALE] = container
+            half = size // 2
+            for h, x0 in enumerate((x + SCALE, x + half)):
+                if i * 2 + h < points:
+                    frame[top + SCALE:top + size - SCALE, x0:x0 + half - SCALE] = color
+    return frame
+
+
+@pytest.mark.parametrize("background,container", [(200, 50), (20, 30)])
+@pytest.mark.parametrize("health", [20, 10, 3, 0])
+def test_reads_health_on_any_background(background, container, health):
+    frame = np.full((H, W, 3), background, dtype=np.uint8)
+    draw_bar(frame, health, 14, container)
+    reading = HudReader(gui_scale=SCALE).read(frame)
+    assert reading == {"health": float(health), "hunger": 14.0}
+
+
+@pytest.mark.parametrize("value", [0, 20, 200])
+def test_flat_frame_has_no_hud(value):
+    frame = np.full((H, W, 3), value, dtype=np.uint8)
+    assert HudReader(gui_scale=SCALE).read(frame) is None
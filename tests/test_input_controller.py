@@ -0,0 +1,45 @@
+from src.utils.gamepad_backends import NullBackend
+from src.utils.input_controller import InputController
+
+NEUTRAL = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0)
+
+
+def test_emergency_stop_reaches_listeners():
+    backend = NullBackend()
+    controller = InputController(backend)
+    seen = []
+    controller.add_report_listener(lambda report, t: seen.append(report))
+
+    with controller.transaction():
+        controller.set_move(0.0, 1.0)
+        controller.set_jump(True)
+        controller.set_attack(True)
+    controller.emergency_stop()
+
+    assert seen[-1] == NEUTRAL
+    assert backend.last_report == NEUTRAL
+
+
+def test_emergency_stop_resends_when_already_neutral():
+    backend = NullBackend()
+    controller = InputController(backend)
+    seen = []
+    controller.add_report_listener(lambda report, t: seen.append(report))
+
+    controller.emergency_stop()
+    controller.emergency_stop()
+
+    assert seen == [NEUTRAL, NEUTRAL]
+
+
+def test_recording_clamps_out_of_range_values(tmp_path):
+    from src.utils.gamepad_backends import RecordingBackend
+
+    path = tmp_path / "inputs.bin"
+    backend = RecordingBackend(str(path))
+    backend.send((1.5, -2.0, 0.5, -0.5, 1.2, -0.3, 1), None)
+    backend.close()
+
+    data = path.read_bytes()[RecordingBackend.HEADER.size:]
+    record = RecordingBackend.RECORD.unpack(data)
+    assert record[1:] == (32767, -32767, 16383, -16383, 255, 0, 1)
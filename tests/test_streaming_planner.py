@@ -0,0 +1,39 @@
+import sys
+import types
+
+import pytest
+
+# The planner only needs httpx for live requests; the parser runs without it
+sys.modules.setdefault("httpx", types.ModuleType("httpx"))
+
+from src.planning.streaming_planner import IncrementalPlanParser
+
+
+def parse(text, chunk=1):
+    parser = IncrementalPlanParser()
+    steps = []
+    for i in range(0, len(text), chunk):
+        steps += parser.feed(text[i:i + chunk])
+    return steps, parser.done
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 1000])
+@pytest.mark.parametrize("text,expected", [
+    ('["MOVE_FORWARD 2", "JUMP"]', ["MOVE_FORWARD 2", "JUMP"]),
+    ('```json\n["A", "B"]\n```', ["A", "B"]),
+    ('{"plan": ["MOVE_FORWARD 2","JUMP"]}', ["MOVE_FORWARD 2", "JUMP"]),
+    ('Plan (see {notes}): ["A","B"]', ["A", "B"]),
+    ('[["A"],"B"]', ["A", "B"]),
+    ('["A", {"note": "skip [me]"}, "B"]', ["A", "B"]),
+    ('["SAY \\"hi\\" ]", "C"]', ['SAY "hi" ]', "C"]),
+])
+def test_parses_plan_array(text, expected, chunk):
+    steps, done = parse(text, chunk)
+    assert steps == expected
+    assert done
+
+
+def test_unclosed_plan_is_not_done():
+    steps, done = parse('["A", "B')
+    assert steps == ["A"]
+    assert not done
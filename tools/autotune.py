@@ -0,0 +1,335 @@
+"""
+Benchmark-driven tuning of the perception knobs, written as a per-hardware profile.
+
+    python tools/autotune.py recordings/20250101-120000 [--target-fps 60] [--cpu-budget 150]
+    python tools/autotune.py --live [--target-fps 60] [--cpu-budget 150]
+        [--segments 6] [--segment-length 24] [--model yolo11x.pt] [--out perf_profiles.json] [--dry-run]
+
+1. Collect short runs of consecutive frames: evenly spaced through a SessionRecorder session,
+   or grabbed live from the game window at --target-fps. Record with RECORD_WIDTH=1280 (or the
+   native width) and RECORD_FPS close to the loop rate: width limits which downscales can be
+   compared, and skip_frames staleness is measured at the recording's frame rate. A recording
+   narrower than the live width cap (DEFAULTS["max_width"]) yields no max_width in the profile.
+2. For every integer downscale stride (the max_width cap) run YOLO once per frame at the lowest
+   candidate confidence and time it, plus the per-frame work that scales with resolution
+   (downscale, lava check, HUD, screen state). Wall and process CPU time are both measured.
+3. Score every (max_width, conf_threshold, skip_frames) combination offline from those runs.
+   Skipped frames reuse the last detections, as they do live. Accuracy is F1 against the
+   full-resolution, every-frame run (same label, IoU >= 0.5; objects above --gt-conf count
+   as ground truth).
+4. Pick the most accurate combination whose mean frame time fits 1000/--target-fps ms and whose
+   CPU use fits --cpu-budget (% of one core at the target rate). Ties go to more frequent,
+   higher-resolution detection (then the stricter confidence). The remaining frame budget sets the OCR interval and the
+   fishing ROI size; target_fps (capture) becomes the lowest standard rate >= the loop target.
+5. Save under this machine's hardware class in --out; main.py loads it at startup
+   (PERF_PROFILE_PATH / PERF_PROFILE).
+"""
+
+import sys
+import os
+import time
+import argparse
+import itertools
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.frame_sources import fit_width
+from src.utils.session_recorder import list_chunks, read_chunk
+from src.utils.perf_profile import DEFAULTS, hardware_class, save_profile
+from src.reflex.hud_reader import HudReader
+from src.reflex.screen_state import ScreenStateClassifier
+from src.skills.fishing_perception import FishingPerception
+
+CONF_CANDIDATES = (0.1, 0.15, 0.25, 0.35, 0.5)
+SKIP_CANDIDATES = (1, 2, 3, 4)
+STRIDES = (1, 2, 3, 4)
+OCR_INTERVALS = (5, 10, 15, 30, 60, 120)
+FISHING_ROIS = (48, 64, 96, 128)
+CAPTURE_RATES = (30, 60, 90, 120, 144, 165, 240)
+WARMUP_FRAMES = 3 # Per stride: first inference at a new input size is slow (CUDA init, cudnn autotune)
+
+# --- Frame sources ---
+
+def recorded_segments(session_dir: str, segments: int, length: int):
+    """Evenly spaced runs of `length` consecutive recorded frames."""
+    index = [(c, i) for c in list_chunks(session_dir) for i in range(len(read_chunk(session_dir, c)["t"]))]
+    if not index:
+        raise SystemExit(f"No frames in {session_dir}")
+    length = min(length, len(index))
+    starts = np.linspace(0, len(index) - length, num=min(segments, len(index) // length or 1)).astype(int)
+    chunks: Dict[int, dict] = {}
+    for start in starts:
+        seg = []
+        for c, i in index[start:start + length]:
+            if c not in chunks:
+                chunks.clear() # Keep at most one chunk mapped at a time
+                chunks[c] = read_chunk(session_dir, c)
+            seg.append(np.ascontiguousarray(chunks[c]["frame"](i)))
+        yield seg
+
+def live_segments(segments: int, length: int, fps: float):
+    """Runs of consecutive live frames captured at the loop target rate."""
+    from src.utils.screen_capture import ScreenCapture # dxcam (Windows only)
+    cap = ScreenCapture(track_interval=0)
+    cap.start()
+    try:
+        for s in range(segments):
+            print(f"[Tune] Capturing live segment {s + 1}/{segments}...")
+            seg = []
+            next_t = time.perf_counter()
+            while len(seg) < length:
+                frame = cap.capture_frame()
+                if frame is not None:
+                    seg.append(frame[..., :3].copy())
+                next_t += 1.0 / fps
+                time.sleep(max(0.0, next_t - time.perf_counter()))
+            yield seg
+            time.sleep(2.0) # Let the scene change between segments
+    finally:
+        cap.close()
+
+# --- Measurement ---
+
+def _timed(fn, *args):
+    w0, c0 = time.perf_counter(), time.process_time()
+    out = fn(*args)
+    return out, (time.perf_counter() - w0) * 1000, (time.process_time() - c0) * 1000
+
+class Stats:
+    def __init__(self):
+        self.wall: List[float] = []
+        self.cpu: List[float] = []
+
+    def add(self, wall: float, cpu: float):
+        self.wall.append(wall)
+        self.cpu.append(cpu)
+
+    @property
+    def wall_ms(self) -> float:
+        return float(np.mean(self.wall)) if self.wall else 0.0
+
+    @property
+    def cpu_ms(self) -> float:
+        return float(np.mean(self.cpu)) if self.cpu else 0.0
+
+    @property
+    def p95_ms(self) -> float:
+        return float(np.percentile(self.wall, 95)) if self.wall else 0.0
+
+def measure(segments, vision, yolo, min_conf: float, ocr_reader):
+    """
+    Runs every stride over every frame. Returns
+    (dets[stride][segment index][frame] in full-frame coords, base Stats per stride, YOLO Stats per stride,
+     OCR Stats, fishing Stats per ROI size, native frame width).
+    """
+    dets = {s: {} for s in STRIDES} # Keyed by segment index: narrow segments skip large strides
+    base = {s: Stats() for s in STRIDES}
+    infer = {s: Stats() for s in STRIDES}
+    ocr = Stats()
+    fishing = {roi: Stats() for roi in FISHING_ROIS}
+    perceptions = {roi: FishingPerception(roi_size=roi) for roi in FISHING_ROIS}
+    huds = {s: HudReader() for s in STRIDES}
+    screens = {s: ScreenStateClassifier() for s in STRIDES}
+    seen = {s: 0 for s in STRIDES}
+    native_width = 0
+
+    for seg_no, seg in enumerate(segments):
+        native_width = max(native_width, seg[0].shape[1])
+        for s in STRIDES:
+            if seg[0].shape[1] // s < 320:
+                continue
+            max_width = -(-seg[0].shape[1] // s)
+            seg_dets = []
+            for frame in seg:
+                def base_work(f=frame):
+                    img = fit_width(f, max_width)
+                    vision.lava.detect(img)
+                    huds[s].read(img)
+                    screens[s].update(img)
+                    return img
+                img, w_ms, c_ms = _timed(base_work)
+                raw, yw_ms, yc_ms = _timed(yolo.detect, img, min_conf)
+                seen[s] += 1
+                if seen[s] > WARMUP_FRAMES:
+                    base[s].add(w_ms, c_ms)
+                    infer[s].add(yw_ms, yc_ms)
+                scale = frame.shape[1] / img.shape[1]
+                seg_dets.append([(d["label"], d["conf"], [v * scale for v in d["box"]])
+                                 for d in raw if d["cls_id"] in vision.allowed_classes])
+            dets[s][seg_no] = seg_dets
+
+        for frame in seg:
+            for roi, perception in perceptions.items():
+                _, w_ms, c_ms = _timed(perception.update, frame)
+                fishing[roi].add(w_ms, c_ms)
+            if ocr_reader is not None:
+                _, w_ms, c_ms = _timed(ocr_reader.read_now, frame)
+                ocr.add(w_ms, c_ms)
+        print(f"[Tune] Segment {seg_no + 1}: {len(seg)} frames @ {seg[0].shape[1]}x{seg[0].shape[0]}")
+    return dets, base, infer, ocr, fishing, native_width
+
+# --- Scoring ---
+
+def _iou(a, b) -> float:
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def _matches(cands, refs, iou: float = 0.5) -> int:
+    """Greedy one-to-one matches (same label, IoU >= iou)."""
+    used = set()
+    n = 0
+    for label, _, box in sorted(cands, key=lambda d: -d[1]):
+        best, best_j = iou, None
+        for j, (rlabel, _, rbox) in enumerate(refs):
+            if j not in used and rlabel == label:
+                v = _iou(box, rbox)
+                if v >= best:
+                    best, best_j = v, j
+        if best_j is not None:
+            used.add(best_j)
+            n += 1
+    return n
+
+def score(dets, stride: int, conf: float, skip: int, gt_conf: float) -> Tuple[float, int]:
+    """F1 of (stride, conf, skip) against stride 1 / every frame. Returns (f1, ground-truth objects)."""
+    tp_p = n_pred = tp_r = n_gt = 0
+    # Only segments both strides ran on (a stride skips segments too narrow for it)
+    for seg_no in sorted(dets[1].keys() & dets[stride].keys()):
+        seg = dets[stride][seg_no]
+        for j, ref in enumerate(dets[1][seg_no]):
+            used = [d for d in seg[j - j % skip] if d[1] >= conf] # Stale between detector passes
+            gt = [d for d in ref if d[1] >= gt_conf]
+            n_pred += len(used)
+            n_gt += len(gt)
+            tp_p += _matches(used, ref)
+            tp_r += _matches(used, gt)
+    precision = tp_p / n_pred if n_pred else 1.0
+    recall = tp_r / n_gt if n_gt else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return f1, n_gt
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune perception knobs for this machine")
+    parser.add_argument("session", nargs="?", help="SessionRecorder directory (omit with --live)")
+    parser.add_argument("--live", action="store_true", help="Capture from the game window instead")
+    parser.add_argument("--target-fps", type=float, default=60.0, help="Loop rate to sustain")
+    parser.add_argument("--cpu-budget", type=float, default=150.0, help="CPU budget, %% of one core")
+    parser.add_argument("--segments", type=int, default=6)
+    parser.add_argument("--segment-length", type=int, default=24)
+    parser.add_argument("--gt-conf", type=float, default=0.4, help="Reference confidence counted as ground truth")
+    parser.add_argument("--model", default="yolo11x.pt")
+    parser.add_argument("--out", default=os.getenv("PERF_PROFILE_PATH", "perf_profiles.json"))
+    parser.add_argument("--name", help="Profile name (default: hardware class)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the result without saving")
+    args = parser.parse_args()
+    if not args.live and not args.session:
+        parser.error("give a recorded session directory or --live")
+
+    from src.reflex.yolo_detector import YoloDetector
+    from src.reflex.vision_processor import VisionProcessor
+    yolo = YoloDetector(args.model)
+    vision = VisionProcessor(yolo) # Lava detector + class filter, same as the live loop
+
+    ocr_reader = None
+    try:
+        from src.mapping.coordinate_reader import CoordinateReader
+        ocr_reader = CoordinateReader()
+        ocr_reader.read_now(np.zeros((720, 1280, 3), np.uint8))
+        import pytesseract
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        print(f"[Tune] OCR not measurable ({e}); keeping ocr_interval={DEFAULTS['ocr_interval']}")
+        ocr_reader = None
+
+    segments = (live_segments(args.segments, args.segment_length, args.target_fps) if args.live
+                else recorded_segments(args.session, args.segments, args.segment_length))
+    t0 = time.perf_counter()
+    dets, base, infer, ocr, fishing, native_width = measure(segments, vision, yolo, min(CONF_CANDIDATES), ocr_reader)
+    print(f"[Tune] Measured in {time.perf_counter() - t0:.1f}s")
+    # max_width is only meaningful if it was compared against frames at least as wide as live ones
+    tune_width = native_width >= DEFAULTS["max_width"]
+    if not tune_width:
+        print(f"[Tune] WARNING: frames are only {native_width}px wide (live cap {DEFAULTS['max_width']}px): "
+              f"max_width is left out of the profile and timings are optimistic; "
+              f"record with RECORD_WIDTH={DEFAULTS['max_width']} or more")
+
+    period_ms = 1000.0 / args.target_fps
+    strides = [s for s in STRIDES if dets[s]]
+    if not strides:
+        raise SystemExit("[Tune] No usable frames (need at least 320px wide)")
+    rows = []
+    for s, conf, skip in itertools.product(strides, CONF_CANDIDATES, SKIP_CANDIDATES):
+        f1, n_gt = score(dets, s, conf, skip, args.gt_conf)
+        frame_ms = base[s].wall_ms + infer[s].wall_ms / skip
+        cpu_pct = (base[s].cpu_ms + infer[s].cpu_ms / skip) / period_ms * 100
+        rows.append({"stride": s, "max_width": -(-native_width // s), "conf": conf, "skip": skip, "f1": f1,
+                     "frame_ms": frame_ms, "worst_ms": base[s].p95_ms + infer[s].p95_ms, "cpu_pct": cpu_pct,
+                     "feasible": frame_ms <= period_ms and cpu_pct <= args.cpu_budget})
+    if n_gt < 20:
+        print(f"[Tune] WARNING: only {n_gt} reference objects; accuracy differences are not meaningful")
+
+    # Most accurate feasible; ties (within 0.005 F1) -> detect more often, at higher resolution
+    def rank(r):
+        return (round(r["f1"] / 0.005), -r["skip"], -r["stride"], r["conf"])
+    feasible = [r for r in rows if r["feasible"]]
+    if feasible:
+        best = max(feasible, key=rank)
+    else:
+        best = min(rows, key=lambda r: r["frame_ms"])
+        print(f"[Tune] No combination fits {period_ms:.1f}ms / {args.cpu_budget:.0f}% CPU; using the fastest one")
+
+    print(f"\nstride  width  conf  skip     F1  frame ms  p95 ms   CPU %   (budget {period_ms:.1f}ms, {args.cpu_budget:.0f}%)")
+    for r in sorted(rows, key=rank, reverse=True)[:12]:
+        mark = "*" if r is best else ("" if r["feasible"] else "x")
+        print(f"{r['stride']:6d} {r['max_width']:6d} {r['conf']:5.2f} {r['skip']:5d} {r['f1']:6.3f} "
+              f"{r['frame_ms']:9.2f} {r['worst_ms']:7.2f} {r['cpu_pct']:7.1f} {mark}")
+
+    # Spend the remaining frame time on OCR frequency and the fishing ROI
+    spare_ms = max(0.0, period_ms - best["frame_ms"])
+    ocr_interval = DEFAULTS["ocr_interval"]
+    if ocr.wall:
+        fitting = [n for n in OCR_INTERVALS if ocr.wall_ms / n <= spare_ms / 2]
+        ocr_interval = fitting[0] if fitting else OCR_INTERVALS[-1]
+        spare_ms -= ocr.wall_ms / ocr_interval
+    # Fishing replaces detection-driven work, but its ROI still shares the frame: largest one that fits
+    fishing_roi = max([roi for roi in FISHING_ROIS if fishing[roi].wall_ms <= max(spare_ms, 0.5)],
+                      default=min(FISHING_ROIS))
+    target_fps = next((r for r in CAPTURE_RATES if r >= args.target_fps), CAPTURE_RATES[-1])
+
+    name = args.name or hardware_class()
+    profile = {
+        "skip_frames": best["skip"],
+        "conf_threshold": best["conf"],
+        "target_fps": target_fps,
+        "ocr_interval": ocr_interval,
+        "fishing_roi": fishing_roi,
+        "_meta": {
+            "source": "live" if args.live else os.path.abspath(args.session),
+            "native_width": native_width,
+            "loop_fps": args.target_fps,
+            "cpu_budget_pct": args.cpu_budget,
+            "f1": round(best["f1"], 4),
+            "frame_ms": round(best["frame_ms"], 2),
+            "cpu_pct": round(best["cpu_pct"], 1),
+            "ocr_ms": round(ocr.wall_ms, 2) if ocr.wall else None,
+            "fishing_ms": round(fishing[fishing_roi].wall_ms, 3),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+    }
+    if tune_width:
+        profile["max_width"] = best["max_width"]
+    print(f"\n[Tune] Profile '{name}': " + ", ".join(f"{k}={profile[k]}" for k in DEFAULTS if k in profile))
+    if args.dry_run:
+        return
+    save_profile(args.out, name, profile)
+    print(f"[Tune] Saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Recorded gameplay -> YOLO detection dataset.
+
+    python tools/export_dataset.py recordings/20250101-120000 [more sessions...] --out datasets/mc
+        [--interval 0.5] [--dedupe 6] [--shard-size 1000] [--workers 8] [--model yolo11x.pt] [--val 0.1]
+
+1. Sample frames from SessionRecorder sessions (at most one per --interval seconds).
+2. Perceptual-hash them in parallel (one task per chunk) and drop near-duplicates
+   (Hamming distance <= --dedupe against every frame already kept).
+3. Write shards in parallel: JPEG images + YOLO label files pre-labeled with the current
+   COCO detector mapped onto Minecraft classes (each worker loads the model once).
+   Pre-labels are a starting point for annotation, not ground truth; mobs without a COCO
+   counterpart (zombie, creeper, ...) have to be labeled by hand.
+
+Output:
+    <out>/train/shard_000/{images,labels}/...  <out>/val/shard_000/...
+    <out>/data.yaml    (ultralytics dataset config)
+    <out>/manifest.jsonl (source session/chunk/frame/time/hash per image)
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.session_recorder import list_chunks, read_chunk
+from src.utils.frame_hash import dhash, hamming_many
+
+# Target classes of the Minecraft-native model
+MC_CLASSES = ["player", "zombie", "skeleton", "creeper", "spider", "cow", "sheep", "pig", "chicken",
+              "horse", "wolf", "item"]
+
+# COCO label -> Minecraft class for pre-labeling (None = drop)
+COCO_TO_MC = {
+    "person": "player",
+    "cow": "cow",
+    "sheep": "sheep",
+    "horse": "horse",
+    "dog": "wolf",
+    "bird": "chicken",
+    "backpack": "item", "suitcase": "item", "handbag": "item", "bottle": "item",
+    "cup": "item", "bowl": "item", "orange": "item", "apple": "item",
+}
+
+# --- Stage 1: sample + hash (one task per chunk) ---
+
+def hash_chunk(task: Tuple[int, str, int, float]) -> List[Tuple[int, int, int, float, int]]:
+    session_idx, session_dir, chunk, interval = task
+    data = read_chunk(session_dir, chunk)
+    out = []
+    last_t = -1e9
+    for i, t in enumerate(data["t"]):
+        if t - last_t < interval:
+            continue
+        last_t = t
+        out.append((session_idx, chunk, i, float(t), dhash(data["frame"](i))))
+    return out
+
+def dedupe(samples: List[Tuple[int, int, int, float, int]], max_distance: int) -> List[Tuple[int, int, int, float, int]]:
+    """Greedy: keep a frame only if it is farther than max_distance from everything kept."""
+    kept = []
+    hashes = np.empty(len(samples), dtype=np.uint64)
+    for s in samples:
+        h = s[4]
+        if kept and hamming_many(h, hashes[:len(kept)]).min() <= max_distance:
+            continue
+        hashes[len(kept)] = np.uint64(h)
+        kept.append(s)
+    return kept
+
+# --- Stage 2: write shards (one task per shard) ---
+
+_detector = None
+
+def _init_worker(model_path: Optional[str]):
+    """Load the pre-labeling model once per worker process."""
+    global _detector
+    if model_path:
+        from src.reflex.yolo_detector import YoloDetector
+        _detector = YoloDetector(model_path)
+
+def _yolo_lines(detections: List[Dict], width: int, height: int) -> List[str]:
+    lines = []
+    for d in detections:
+        mc = COCO_TO_MC.get(d["label"])
+        if mc is None:
+            continue
+        x1, y1, x2, y2 = d["box"]
+        x1, x2 = max(0, x1), min(width, x2)
+        y1, y2 = max(0, y1), min(height, y2)
+        if x2 <= x1 or y2 <= y1:
+            continue
+        cx, cy = (x1 + x2) / 2 / width, (y1 + y2) / 2 / height
+        bw, bh = (x2 - x1) / width, (y2 - y1) / height
+        lines.append(f"{MC_CLASSES.index(mc)} {cx:.6f} {cy:.6f} {bw:.6f} {bh:.6f}")
+    return lines
+
+def write_shard(task: Tuple[str, List[Tuple[int, int, int, float, int]], List[str], float, int]) -> List[Dict]:
+    shard_dir, samples, sessions, conf, jpeg_quality = task
+    os.makedirs(os.path.join(shard_dir, "images"), exist_ok=True)
+    os.makedirs(os.path.join(shard_dir, "labels"), exist_ok=True)
+    chunks: Dict[Tuple[int, int], Dict] = {}
+    manifest = []
+    for session_idx, chunk, i, t, h in samples:
+        key = (session_idx, chunk)
+        if key not in chunks:
+            chunks[key] = read_chunk(sessions[session_idx], chunk)
+        frame = np.ascontiguousarray(chunks[key]["frame"](i))
+        name = f"s{session_idx:02d}_c{chunk:05d}_f{i:05d}"
+
+        cv2.imwrite(os.path.join(shard_dir, "images", name + ".jpg"), frame,
+                    [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+        lines = []
+        if _detector is not None:
+            height, width = frame.shape[:2]
+            lines = _yolo_lines(_detector.detect(frame, conf_threshold=conf), width, height)
+        with open(os.path.join(shard_dir, "labels", name + ".txt"), "w") as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+        manifest.append({"image": os.path.join(shard_dir, "images", name + ".jpg"),
+                         "session": sessions[session_idx], "chunk": chunk, "frame": i,
+                         "t": t, "dhash": f"{h:016x}", "labels": len(lines)})
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Export recorded sessions as a YOLO dataset")
+    parser.add_argument("sessions", nargs="+", help="SessionRecorder output directories")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--interval", type=float, default=0.5, help="Min seconds between sampled frames")
+    parser.add_argument("--dedupe", type=int, default=6, help="Max dHash Hamming distance counted as duplicate")
+    parser.add_argument("--shard-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--model", default="yolo11x.pt", help="Pre-label model ('' = images only)")
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--val", type=float, default=0.1, help="Fraction of frames for validation")
+    parser.add_argument("--jpeg-quality", type=int, default=95)
+    args = parser.parse_args()
+
+    sessions = [os.path.abspath(s) for s in args.sessions]
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        tasks = [(si, s, c, args.interval) for si, s in enumerate(sessions) for c in list_chunks(s)]
+        samples = [x for chunk_samples in pool.map(hash_chunk, tasks) for x in chunk_samples]
+    samples.sort(key=lambda s: (s[0], s[3]))
+    t1 = time.perf_counter()
+    kept = dedupe(samples, args.dedupe)
+    print(f"[Export] {len(tasks)} chunks -> {len(samples)} sampled -> {len(kept)} unique "
+          f"(hash {t1 - t0:.1f}s, dedupe {time.perf_counter() - t1:.2f}s)")
+    if not kept:
+        return
+
+    # Deterministic split: every k-th unique frame goes to validation
+    k = max(2, round(1.0 / args.val)) if args.val > 0 else 0
+    splits = {"train": [s for n, s in enumerate(kept) if not k or n % k],
+              "val": [s for n, s in enumerate(kept) if k and n % k == 0]}
+
+    shard_tasks = []
+    for split, items in splits.items():
+        for n in range(0, len(items), args.shard_size):
+            shard_dir = os.path.join(args.out, split, f"shard_{n // args.shard_size:03d}")
+            shard_tasks.append((shard_dir, items[n:n + args.shard_size], sessions, args.conf, args.jpeg_quality))
+
+    t2 = time.perf_counter()
+    os.makedirs(args.out, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=min(args.workers, len(shard_tasks)),
+                             initializer=_init_worker, initargs=(args.model or None,)) as pool:
+        with open(os.path.join(args.out, "manifest.jsonl"), "w") as f:
+            for manifest in pool.map(write_shard, shard_tasks):
+                for row in manifest:
+                    f.write(json.dumps(row) + "\n")
+
+    def shard_list(split):
+        return sorted({os.path.relpath(t[0], args.out) + "/images" for t in shard_tasks if f"{os.sep}{split}{os.sep}" in t[0]})
+
+    with open(os.path.join(args.out, "data.yaml"), "w") as f:
+        f.write(f"path: {os.path.abspath(args.out)}\n")
+        f.write("train:\n" + "".join(f"  - {p}\n" for p in shard_list("train")))
+        f.write("val:\n" + "".join(f"  - {p}\n" for p in shard_list("val")))
+        f.write("names:\n" + "".join(f"  {i}: {name}\n" for i, name in enumerate(MC_CLASSES)))
+    print(f"[Export] {len(splits['train'])} train / {len(splits['val'])} val images in {len(shard_tasks)} shards "
+          f"-> {args.out} ({time.perf_counter() - t2:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import sys
+import os
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.gamepad_backends import read_recording
+
+def summarize(path: str):
+    """Print control rate, inter-report jitter and per-axis activity of a gamepad recording."""
+    rec = read_recording(path)
+    t = rec["t"]
+    n = len(t)
+    print(f"=== Input Recording: {path} ===")
+    print(f"Reports: {n}")
+    if n < 2:
+        print("Not enough reports to analyze.")
+        return
+
+    duration = t[-1] - t[0]
+    dt = np.diff(t) * 1000.0
+    print(f"Duration: {duration:.2f}s | Rate: {(n - 1) / duration:.1f} reports/s")
+    print(f"Interval (ms): mean {dt.mean():.2f} | p50 {np.percentile(dt, 50):.2f} | "
+          f"p99 {np.percentile(dt, 99):.2f} | max {dt.max():.2f} | jitter(std) {dt.std():.2f}")
+
+    print("\nAxis            min     max    mean   active%")
+    for axis in ("left_x", "left_y", "right_x", "right_y", "left_trigger", "right_trigger"):
+        v = rec[axis]
+        active = np.count_nonzero(np.abs(v) > 0.01) / n * 100.0
+        print(f"{axis:<13} {v.min():7.3f} {v.max():7.3f} {v.mean():7.3f} {active:8.1f}")
+
+    jump = rec["jump"]
+    presses = np.count_nonzero(jump[1:] & ~jump[:-1]) + int(jump[0])
+    print(f"\nJump presses: {presses}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python tools/input_report.py <recording.mkgp>")
+        sys.exit(1)
+    summarize(sys.argv[1])
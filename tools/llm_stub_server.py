@@ -0,0 +1,170 @@
+"""
+Local stand-in for an OpenAI-compatible LLM server (no model, stdlib only).
+
+    python tools/llm_stub_server.py [--port 1234] [--first-token-ms 800] [--token-ms 40]
+                                    [--mode normal|slow|hang|stall|error] [--jitter-ms 0]
+    set LLM_API_BASE=http://localhost:1234/v1
+
+Serves POST /v1/chat/completions (blocking and `stream: true` SSE) with a fixed plan,
+emitted a few characters per chunk with configurable delays, so planner latency
+(time-to-first-step vs. full completion) can be measured without a GPU.
+
+Failure modes for exercising client deadlines:
+    slow   every delay x10
+    hang   accept the request and never answer
+    stall  stream the first half of the completion, then stop sending
+    error  reply 500
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PLAN = ["LOOK_AROUND", "MOVE_FORWARD 2", "JUMP", "ATTACK 1", "WAIT 1"]
+
+class StubConfig:
+    plan = DEFAULT_PLAN
+    first_token_ms = 800.0   # Simulated prompt processing
+    token_ms = 40.0          # Per chunk
+    chars_per_chunk = 4
+    mode = "normal"          # normal | slow | hang | stall | error
+    jitter_ms = 0.0
+    requests = 0
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+def _delay(ms: float):
+    scale = 10.0 if StubConfig.mode == "slow" else 1.0
+    time.sleep(max(0.0, ms + random.uniform(0.0, StubConfig.jitter_ms)) * scale / 1000.0)
+
+def _hang():
+    while True:
+        time.sleep(3600)
+
+def completion_text() -> str:
+    return "```json\n" + json.dumps(StubConfig.plan) + "\n```"
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass # Quiet
+
+    def _json(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._json(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        req = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": "not found"})
+            return
+
+        with StubConfig.lock:
+            StubConfig.requests += 1
+            StubConfig.active += 1
+            StubConfig.max_active = max(StubConfig.max_active, StubConfig.active)
+        try:
+            self._complete(req)
+        finally:
+            with StubConfig.lock:
+                StubConfig.active -= 1
+
+    def _complete(self, req: dict):
+        if StubConfig.mode == "error":
+            self._json(500, {"error": {"message": "stub error", "type": "server_error"}})
+            return
+        if StubConfig.mode == "hang":
+            _hang()
+
+        model = req.get("model", "stub")
+        text = completion_text()
+        _delay(StubConfig.first_token_ms)
+
+        if not req.get("stream"):
+            _delay(StubConfig.token_ms * (len(text) / StubConfig.chars_per_chunk))
+            self._json(200, {
+                "id": "stub-1", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send_event(payload: str):
+            data = f"data: {payload}\n\n".encode()
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        try:
+            n = StubConfig.chars_per_chunk
+            for i in range(0, len(text), n):
+                if StubConfig.mode == "stall" and i >= len(text) // 2:
+                    _hang()
+                send_event(json.dumps({
+                    "id": "stub-1", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "delta": {"content": text[i:i + n]}, "finish_reason": None}],
+                }))
+                _delay(StubConfig.token_ms)
+            send_event(json.dumps({
+                "id": "stub-1", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            }))
+            send_event("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass # Client stopped reading (plan complete / cancelled)
+
+def serve(port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in OpenAI-compatible LLM server")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--first-token-ms", type=float, default=StubConfig.first_token_ms)
+    parser.add_argument("--token-ms", type=float, default=StubConfig.token_ms)
+    parser.add_argument("--mode", choices=["normal", "slow", "hang", "stall", "error"], default="normal")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra delay per wait")
+    parser.add_argument("--plan", type=str, default=None, help='JSON list, e.g. \'["JUMP", "WAIT 1"]\'')
+    args = parser.parse_args()
+
+    StubConfig.first_token_ms = args.first_token_ms
+    StubConfig.token_ms = args.token_ms
+    StubConfig.mode = args.mode
+    StubConfig.jitter_ms = args.jitter_ms
+    if args.plan:
+        StubConfig.plan = json.loads(args.plan)
+
+    server = serve(args.port)
+    print(f"[Stub LLM] Serving on http://127.0.0.1:{args.port}/v1 "
+          f"(first token {args.first_token_ms:.0f}ms, {args.token_ms:.0f}ms/chunk, mode={args.mode})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
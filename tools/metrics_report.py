@@ -0,0 +1,88 @@
+import sys
+import os
+import json
+import sqlite3
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _rate(count: int, seconds: float, per: float) -> float:
+    return count / seconds * per if seconds > 0 else 0.0
+
+def session_report(db: sqlite3.Connection, session: str, started: float, ended: float):
+    """Throughput (fish/hour, kills/minute, ...) and stage latencies of one session."""
+    duration = max(ended - started, 1e-9)
+    counts = dict(db.execute(
+        "SELECT name, COUNT(*) FROM events WHERE session = ? GROUP BY name", (session,)
+    ).fetchall())
+
+    caught = 0
+    for (tags,) in db.execute("SELECT tags FROM events WHERE session = ? AND name = 'fishing_reel'", (session,)):
+        if tags and json.loads(tags).get("caught"):
+            caught += 1
+    ttk = [v for (v,) in db.execute(
+        "SELECT value FROM events WHERE session = ? AND name = 'combat_kill' AND value IS NOT NULL", (session,)
+    )]
+    bite_wait = [v for (v,) in db.execute(
+        "SELECT value FROM events WHERE session = ? AND name = 'fishing_bite' AND value IS NOT NULL", (session,)
+    )]
+
+    print(f"=== Session {session} | {duration / 60:.1f} min ===")
+    casts = counts.get("fishing_cast", 0)
+    if casts:
+        print(f"Fishing: {casts} casts | {counts.get('fishing_bite', 0)} bites | {caught} caught | "
+              f"{counts.get('fishing_timeout', 0)} timeouts")
+        print(f"  {_rate(caught, duration, 3600):.1f} fish/hour | catch rate {caught / casts:.0%}"
+              + (f" | mean wait for bite {sum(bite_wait) / len(bite_wait):.1f}s" if bite_wait else ""))
+    kills = counts.get("combat_kill", 0)
+    if kills:
+        print(f"Combat: {kills} kills | {_rate(kills, duration, 60):.2f} kills/min | "
+              f"mean time-to-kill {sum(ttk) / len(ttk):.2f}s")
+    if counts.get("retreat"):
+        print(f"Reflex: {counts['retreat']} retreats | {_rate(counts['retreat'], duration, 3600):.1f}/hour")
+    other = {k: v for k, v in counts.items()
+             if k not in ("fishing_cast", "fishing_bite", "fishing_timeout", "fishing_reel", "combat_kill", "retreat")}
+    if other:
+        print("Other events: " + ", ".join(f"{k}={v}" for k, v in sorted(other.items())))
+
+    rows = db.execute(
+        "SELECT stage, SUM(n), SUM(mean_ms * n) / SUM(n), MAX(p95_ms), MAX(max_ms) "
+        "FROM timings WHERE session = ? GROUP BY stage ORDER BY stage", (session,)
+    ).fetchall()
+    if rows:
+        print("\nStage        samples    mean ms  worst p95    max ms")
+        for stage, n, mean, p95, mx in rows:
+            print(f"{stage:<10} {n:9d} {mean:10.2f} {p95:10.2f} {mx:9.2f}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency report from the metrics store")
+    parser.add_argument("path", nargs="?", default="metrics.sqlite")
+    parser.add_argument("--session", help="Session id (default: latest)")
+    parser.add_argument("--all", action="store_true", help="Report every session")
+    parser.add_argument("--list", action="store_true", help="List sessions")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"No metrics at {args.path}")
+        sys.exit(1)
+    db = sqlite3.connect(args.path)
+    sessions = db.execute("SELECT id, started, ended FROM sessions ORDER BY started").fetchall()
+    if not sessions:
+        print("No sessions recorded.")
+        return
+
+    if args.list:
+        for sid, started, ended in sessions:
+            print(f"{sid}  {(ended - started) / 60:7.1f} min")
+        return
+    if args.session:
+        sessions = [s for s in sessions if s[0] == args.session]
+    elif not args.all:
+        sessions = sessions[-1:]
+    for sid, started, ended in sessions:
+        session_report(db, sid, started, ended)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark skills in the synthetic world simulator (no Minecraft, CPU only).
+
+    python tools/sim_bench.py [combat|reflex|collect|all] [--episodes 20]
+
+Sweeps input latency, perception rate and turn rate, and reports time-to-kill, aim convergence,
+reflex reaction time and item pickup time, plus simulator throughput.
+"""
+
+import sys
+import os
+import time
+import itertools
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.simulation.world_sim import SimWorld
+from src.utils.input_controller import InputController
+from src.skills.combat import CombatSkills
+from src.skills.collection import CollectionSkills
+from src.reflex.behaviors import ReflexBehaviors
+from src.reflex.hazards import LavaDetector
+
+PHYSICS_DT = 1.0 / 120.0
+TIMEOUT = 10.0
+
+def run_frames(world: SimWorld, fps: float, on_frame, until, timeout: float = TIMEOUT):
+    """Step physics at PHYSICS_DT, call on_frame(frame_time) at `fps` until until() or timeout."""
+    frame_dt = 1.0 / fps
+    next_frame = 0.0
+    steps = 0
+    while world.time < timeout:
+        world.step(PHYSICS_DT)
+        steps += 1
+        if world.time >= next_frame:
+            next_frame += frame_dt
+            on_frame(world.time)
+            if until():
+                return world.time, steps
+    return None, steps
+
+def bench_combat(latency, fps, turn_rate, episodes, rng):
+    ttk, aim_times, steps_total = [], [], 0
+    for _ in range(episodes):
+        world = SimWorld(input_latency=latency, turn_rate=(turn_rate, turn_rate * 0.66))
+        controller = InputController(backend=world.backend)
+        combat = CombatSkills(controller)
+        combat.clock = world.clock
+        world.spawn_relative(rng.uniform(-30, 30), rng.uniform(2.0, 2.8), label="zombie", cls_id=0)
+        aimed = []
+        pending = []
+
+        def on_frame(t):
+            # Perception delay: the skill gets the previous frame's detections (stamped with
+            # that frame's capture time) while this frame is still being processed
+            if pending:
+                dets, captured = pending.pop()
+                combat.update(dets, (world.width, world.height), frame_time=captured)
+            pending.append((world.detections(), t))
+            if not aimed and world.entity_under_crosshair() is not None:
+                aimed.append(t)
+
+        done, steps = run_frames(world, fps, on_frame, lambda: world.kills > 0)
+        steps_total += steps
+        ttk.append(done if done is not None else np.nan)
+        aim_times.append(aimed[0] if aimed else np.nan)
+    return ttk, aim_times, steps_total
+
+def bench_reflex(latency, fps, episodes, rng):
+    """Walk forward; a lava patch appears right ahead. Reaction = until backward input reaches the game."""
+    reaction, burned = [], 0
+    detector = LavaDetector()
+    for _ in range(episodes):
+        world = SimWorld(width=320, height=180, input_latency=latency)
+        controller = InputController(backend=world.backend)
+        reflex = ReflexBehaviors(controller)
+        state = {"spawn": rng.uniform(0.3, 0.8), "spawned": False, "react": None}
+
+        def on_frame(t):
+            if not state["spawned"] and t >= state["spawn"]:
+                world.add_lava(forward=rng.uniform(1.8, 2.6), lateral=rng.uniform(-0.5, 0.5), radius=1.0)
+                state["spawn"] = world.time
+                state["spawned"] = True
+            lava, _, _ = detector.detect(world.render())
+            if lava:
+                reflex.retreat_from_danger()
+            else:
+                controller.set_move(0.0, 1.0) # Keep walking
+            if state["spawned"] and state["react"] is None and world.report[1] < 0:
+                state["react"] = t
+
+        run_frames(world, fps, on_frame, lambda: state["react"] is not None and world.time - state["react"] > 1.0, timeout=5.0)
+        if state["react"] is not None:
+            reaction.append(state["react"] - state["spawn"])
+        if world.in_lava_time > 0:
+            burned += 1
+    return reaction, burned
+
+def bench_collect(latency, fps, episodes, rng):
+    times, stop_dist = [], []
+    for _ in range(episodes):
+        world = SimWorld(input_latency=latency)
+        controller = InputController(backend=world.backend)
+        collect = CollectionSkills(controller)
+        collect.clock = world.clock
+        item = world.spawn_relative(rng.uniform(-25, 25), rng.uniform(4.0, 8.0), label="apple", cls_id=47,
+                                    height=0.3, width=0.3, pickup=True)
+
+        def on_frame(t):
+            collect.update(world.detections(), (world.width, world.height))
+
+        done, _ = run_frames(world, fps, on_frame, lambda: world.collected > 0)
+        times.append(done if done is not None else np.nan)
+        stop_dist.append(0.0 if done is not None else float(np.hypot(item.x - world.px, item.z - world.pz)))
+    return times, stop_dist
+
+def fmt(values):
+    v = np.array(values, dtype=np.float64)
+    ok = v[~np.isnan(v)]
+    if len(ok) == 0:
+        return "   fail            "
+    return f"{ok.mean() * 1000:6.0f}ms p90 {np.percentile(ok, 90) * 1000:6.0f}ms ({len(ok)}/{len(v)})"
+
+def main():
+    which = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith("--") else "all"
+    episodes = 20
+    if "--episodes" in sys.argv:
+        episodes = int(sys.argv[sys.argv.index("--episodes") + 1])
+    rng = np.random.default_rng(0)
+    latencies = [0.0, 0.05, 0.1]
+    rates = [15, 30, 60]
+
+    if which in ("combat", "all"):
+        print("=== Combat: time-to-kill / aim convergence ===")
+        print("latency  fps  turn   time-to-kill                   time-to-aim")
+        for latency, fps, turn in itertools.product(latencies, rates, [120.0, 240.0]):
+            t0 = time.perf_counter()
+            ttk, aim, steps = bench_combat(latency, fps, turn, episodes, rng)
+            sps = steps / max(1e-9, time.perf_counter() - t0)
+            print(f"{latency * 1000:5.0f}ms {fps:4d} {turn:5.0f}  {fmt(ttk)}  {fmt(aim)}  [{sps:,.0f} steps/s incl. skill code]")
+
+    if which in ("reflex", "all"):
+        print("\n=== Reflex: lava reaction ===")
+        print("latency  fps  reaction                        fell in")
+        for latency, fps in itertools.product(latencies, rates):
+            reaction, burned = bench_reflex(latency, fps, episodes, rng)
+            print(f"{latency * 1000:5.0f}ms {fps:4d}  {fmt(reaction)}  {burned}/{episodes}")
+
+    if which in ("collect", "all"):
+        print("\n=== Collection: time-to-pickup ===")
+        print("latency  fps  time-to-pickup                  stopped short (mean m)")
+        for latency, fps in itertools.product(latencies, rates):
+            times, stop_dist = bench_collect(latency, fps, episodes, rng)
+            print(f"{latency * 1000:5.0f}ms {fps:4d}  {fmt(times)}  {np.mean(stop_dist):.2f}")
+
+if __name__ == "__main__":
+    main()
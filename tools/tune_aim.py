@@ -0,0 +1,149 @@
+"""
+Fit aim PID gains from recorded aim sessions.
+
+1. Record: run the bot in combat mode with AIM_LOG_PATH=logs/aim_01.npz
+2. Tune:   python tools/tune_aim.py logs/aim_*.npz [--out aim_gains.json]
+
+The tool fits a simple plant per axis from the logs
+    err[k+1] - err[k] = -turn_rate * out[k - delay] * dt
+(turn rate in px/s at full stick, plus the input->screen delay), then grid-searches PID gains
+in closed-loop simulation against that plant, minimizing time-to-on-target.
+"""
+
+import sys
+import os
+import json
+import itertools
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.skills.aim_controller import AimController
+
+ON_TARGET_PX = 12.0     # |error| below this counts as on target
+HOLD_TIME = 0.15        # ...for at least this long
+SIM_TIME = 2.0          # Give up after this long
+
+def load_logs(paths):
+    samples = []
+    for p in paths:
+        data = np.load(p)
+        s = data["samples"]
+        if len(s) > 2:
+            samples.append(s)
+        print(f"Loaded {len(s)} samples from {p}")
+    return samples
+
+def fit_plant(samples, axis: int):
+    """
+    Returns (turn_rate, delay_s) for one axis (0 = x, 1 = y) by least squares over candidate delays.
+    Columns: t, frame_time, err_x, err_y, out_x, out_y
+    """
+    best = (1500.0, 0.0, float("inf"))
+    for delay_steps in range(0, 6):
+        xs, ys, dts = [], [], []
+        for s in samples:
+            ft = s[:, 1]
+            err = s[:, 2 + axis]
+            out = s[:, 4 + axis]
+            dt = np.diff(ft)
+            d_err = np.diff(err)
+            if delay_steps:
+                out = np.concatenate([np.zeros(delay_steps), out[:-delay_steps]])
+            valid = (dt > 0) & (dt < 0.5)
+            xs.append((out[:-1] * dt)[valid])
+            ys.append(d_err[valid])
+            dts.append(dt[valid])
+        x = np.concatenate(xs)
+        y = np.concatenate(ys)
+        if len(x) < 10 or not np.any(x):
+            continue
+        # y = -rate * x
+        rate = -float(np.dot(x, y) / np.dot(x, x))
+        resid = float(np.mean((y + rate * x) ** 2))
+        if rate > 0 and resid < best[2]:
+            best = (rate, delay_steps * float(np.median(np.concatenate(dts))), resid)
+    return best[0], best[1]
+
+def simulate(gains, turn_rate, delay, frame_dt, starts):
+    """Mean time-to-on-target over a set of initial errors (penalized if never settles)."""
+    total = 0.0
+    for e0 in starts:
+        aim = AimController(kp=gains[0], ki=gains[1], kd=gains[2], turn_rate=turn_rate)
+        err = np.array(e0, dtype=np.float64)
+        # Pending outputs (apply_time, out) to model input->screen delay
+        pending = []
+        applied = np.zeros(2)
+        t = 0.0
+        on_since = None
+        settled = SIM_TIME * 2  # Penalty
+        while t < SIM_TIME:
+            # Measurement is one frame old (frame captured at t - frame_dt)
+            ox, oy = aim.update(err[0], err[1], frame_time=t - frame_dt, now=t)
+            pending.append((t + delay, np.array([ox, oy])))
+            # Integrate plant over one frame
+            t_next = t + frame_dt
+            while pending and pending[0][0] <= t_next:
+                applied = pending.pop(0)[1]
+            err -= np.array(turn_rate) * applied * frame_dt
+            t = t_next
+
+            if np.hypot(err[0], err[1]) < ON_TARGET_PX:
+                on_since = t if on_since is None else on_since
+                if t - on_since >= HOLD_TIME:
+                    settled = on_since
+                    break
+            else:
+                on_since = None
+        total += settled
+    return total / len(starts)
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    out_path = "aim_gains.json"
+    if "--out" in sys.argv:
+        out_path = sys.argv[sys.argv.index("--out") + 1]
+        args = [a for a in args if a != out_path]
+    if not args:
+        print("Usage: python tools/tune_aim.py <aim_log.npz>... [--out aim_gains.json]")
+        sys.exit(1)
+
+    samples = load_logs(args)
+    if not samples:
+        print("No usable samples.")
+        sys.exit(1)
+
+    rate_x, delay_x = fit_plant(samples, 0)
+    rate_y, delay_y = fit_plant(samples, 1)
+    delay = max(delay_x, delay_y)
+    frame_dt = float(np.median(np.concatenate([np.diff(s[:, 1]) for s in samples])))
+    frame_dt = min(max(frame_dt, 1.0 / 240), 0.25)
+    print(f"Plant: turn_rate=({rate_x:.0f}, {rate_y:.0f}) px/s | delay={delay * 1000:.0f}ms | frame_dt={frame_dt * 1000:.1f}ms")
+
+    # Initial errors: sampled from the logs where a new target was acquired (large errors)
+    errs = np.concatenate([s[:, 2:4] for s in samples])
+    big = errs[np.hypot(errs[:, 0], errs[:, 1]) > 3 * ON_TARGET_PX]
+    if len(big) == 0:
+        big = np.array([[200.0, 50.0], [-150.0, -80.0], [400.0, 0.0]])
+    rng = np.random.default_rng(0)
+    starts = big[rng.choice(len(big), size=min(12, len(big)), replace=False)]
+
+    kps = [0.0005, 0.001, 0.0015, 0.002, 0.003, 0.004]
+    kis = [0.0, 0.0002, 0.0005, 0.001]
+    kds = [0.0, 0.0001, 0.0002, 0.0004]
+    best, best_score = None, float("inf")
+    for gains in itertools.product(kps, kis, kds):
+        score = simulate(gains, (rate_x, rate_y), delay, frame_dt, starts)
+        if score < best_score:
+            best, best_score = gains, score
+
+    result = {"kp": best[0], "ki": best[1], "kd": best[2], "turn_rate": [rate_x, rate_y],
+              "delay_s": delay, "time_to_target_s": best_score}
+    with open(out_path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Best gains: kp={best[0]} ki={best[1]} kd={best[2]} | mean time-to-target {best_score * 1000:.0f}ms")
+    print(f"Saved to {out_path} (loaded by CombatSkills via AIM_GAINS_PATH)")
+
+if __name__ == "__main__":
+    main()